@@ -5,10 +5,11 @@ import hashlib
 import ecdsa
 import base58
 import random
-import requests # Added
 import argparse # Added
 from typing import Optional, List, Dict, Tuple
 
+from pasta.client import NO_RETRY, ClientError, NodeClient
+
 # NETWORK_PATH = "C:\\PastaNetwork" # No longer needed
 
 # def ensure_network_dirs(): # Removed
@@ -28,55 +29,53 @@ from typing import Optional, List, Dict, Tuple
 #     with open(filepath, 'w') as f:
 #         json.dump(data, f, indent=2)
 
+# One pooled, keep-alive client per node (timeouts + retries, see pasta.client)
+_clients: Dict[str, NodeClient] = {}
+
+def node_client(node_address: str) -> NodeClient:
+    if node_address not in _clients:
+        _clients[node_address] = NodeClient(node_address)
+    return _clients[node_address]
+
+def _print_node_error(e: ClientError) -> None:
+    if e.status is not None:
+        message = e.body.get('message') if isinstance(e.body, dict) else e.body
+        print(f"Node error ({e.status}): {message}")
+
 def get_node_blockchain(node_address: str) -> List[Dict]:
     """Fetches the current blockchain from the node."""
     try:
-        response = requests.get(f"{node_address}/blockchain")
-        response.raise_for_status() # Raise exception for bad status codes
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return node_client(node_address).blockchain()
+    except ClientError as e:
         print(f"Error fetching blockchain from {node_address}: {e}")
         return []
 
 def get_node_mempool(node_address: str) -> List[Dict]:
     """Fetches the current mempool from the node."""
     try:
-        response = requests.get(f"{node_address}/mempool")
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return node_client(node_address).mempool()
+    except ClientError as e:
         print(f"Error fetching mempool from {node_address}: {e}")
         return []
 
 def post_transaction_to_node(node_address: str, transaction: Dict) -> bool:
-    """Posts a new transaction to the node (State-A)."""
-
-
-    """Posts a new transaction to the node's mempool."""
+    """Posts a new transaction to the node's mempool (State-A)."""
     try:
-        response = requests.post(f"{node_address}/create_transaction", json=transaction)
-        response.raise_for_status()
-        print(f"Node response ({response.status_code}): {response.json().get('message')}")
-        return response.status_code == 201 # Check if created
-    except requests.exceptions.RequestException as e:
+        response = node_client(node_address).create_transaction(transaction)
+        print(f"Node response (201): {response.get('message')}")
+        return True
+    except ClientError as e:
         print(f"Error posting transaction to {node_address}: {e}")
-        if e.response is not None:
-            try:
-                print(f"Node error ({e.response.status_code}): {e.response.json().get('message')}")
-            except json.JSONDecodeError:
-                print(f"Node error ({e.response.status_code}): {e.response.text}")
+        _print_node_error(e)
         return False
 
-def get_balance(address: str, blockchain: List[Dict]) -> float:
-    """Calculate balance for an address from blockchain"""
-    balance = 0
-    for block in blockchain:
-        # Assuming genesis block doesn't affect balances in this calculation
-        if block["receiver"] == address:
-            balance += block["amount"]
-        if block["sender"] == address and block["sender"] != "genesis":
-            balance -= block["amount"]
-    return balance
+def get_balance(node_address: str, address: str) -> Optional[float]:
+    """Fetches the confirmed balance of an address from the node's ledger."""
+    try:
+        return node_client(node_address).balance(address)["balance"]
+    except ClientError as e:
+        print(f"Error fetching balance from {node_address}: {e}")
+        return None
 
 # Removed functions that relied on direct file access and complex block creation:
 # find_chain_ends, find_available_end, find_bifurcation_point, create_transaction_block
@@ -175,26 +174,24 @@ def mint_burn_test():
 def advance_b_request(node_address: str, my_index: int, target_index: int) -> bool:
     """Request the node to advance a transaction to State B."""
     try:
-        payload = {"my_index": my_index, "target_index": target_index}
-        response = requests.post(f"{node_address}/advance_b", json=payload)
-        response.raise_for_status()
-        print(f"Advance B response ({response.status_code}): {response.json().get('message')}")
-        return response.status_code == 200
-    except requests.exceptions.RequestException as e:
+        response = node_client(node_address).advance_b(my_index, target_index)
+        print(f"Advance B response (200): {response.get('message')}")
+        return True
+    except ClientError as e:
         print(f"Error advancing to B on {node_address}: {e}")
+        _print_node_error(e)
         return False
 
 
 def advance_c_request(node_address: str, target_index: int, validator: str) -> bool:
     """Request the node to advance a transaction to State C and move it into the blockchain."""
     try:
-        payload = {"target_index": target_index, "validator": validator}
-        response = requests.post(f"{node_address}/advance_c", json=payload)
-        response.raise_for_status()
-        print(f"Advance C response ({response.status_code}): {response.json().get('message')}")
-        return response.status_code == 200
-    except requests.exceptions.RequestException as e:
+        response = node_client(node_address).advance_c(target_index, validator)
+        print(f"Advance C response (200): {response.get('message')}")
+        return True
+    except ClientError as e:
         print(f"Error advancing to C on {node_address}: {e}")
+        _print_node_error(e)
         return False
 
 
@@ -207,7 +204,7 @@ def main_menu(node_address: str):
         print("2. Create and Send transaction (State A)")
         print("3. View Node Mempool")
         print("4. View Node Blockchain")
-        print("5. Check Balance (from Node Blockchain)")
+        print("5. Check Balance (from Node Ledger)")
         print("6. Test Mint/Burn (Local Concept)")
         print("7. Advance Transaction to State B (Validate Another Block)")
         print("8. Advance Transaction to State C (Get Validated)")
@@ -270,13 +267,12 @@ def main_menu(node_address: str):
 
         elif choice == "5":
             address = input("Enter the public key (address) to check balance for: ")
-            print(f"\nFetching blockchain from {node_address} to calculate balance...")
-            blockchain = get_node_blockchain(node_address)
-            if blockchain is not None:
-                balance = get_balance(address, blockchain)
-                print(f"\nCalculated balance for {address[:8]}...: {balance} PASTA")
+            print(f"\nFetching balance from {node_address}...")
+            balance = get_balance(node_address, address)
+            if balance is not None:
+                print(f"\nBalance for {address[:8]}...: {balance} PASTA")
             else:
-                print("Could not calculate balance as blockchain fetch failed.")
+                print("Could not fetch balance from the node.")
 
         elif choice == "6":
             print("\nTesting Mint/Burn functionality...")
@@ -405,9 +401,9 @@ if __name__ == "__main__":
     print(f"Attempting to connect to PastaNode at: {args.node}")
     # Quick check if node is reachable (optional)
     try:
-        requests.get(f"{args.node}/blockchain", timeout=2) # Check if blockchain endpoint responds
+        NodeClient(args.node, timeout=2, retry=NO_RETRY).stats() # Check if the node responds
         print(f"Successfully connected to node at {args.node}.")
-    except requests.exceptions.RequestException as e:
+    except ClientError as e:
         print(f"Warning: Could not connect to node at {args.node}. CLI might not function correctly. Error: {e}")
         # Decide if we should exit or let the user try anyway
         # exit(1)
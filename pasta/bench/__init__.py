@@ -0,0 +1,12 @@
+"""Micro- and load-benchmarks for Pastacoin.
+
+Every module in this package is runnable on its own, e.g.::
+
+    python -m pasta.bench.pow --workers 1 2 4
+
+``python -m pasta.bench`` is the end-to-end load generator
+(:mod:`pasta.bench.load`), which can also write its results as JSON and
+compare them with an earlier run.
+
+Benchmarks only print numbers; they never assert on them.
+"""
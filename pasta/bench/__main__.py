@@ -0,0 +1,4 @@
+"""``python -m pasta.bench`` runs the end-to-end load generator (:mod:`pasta.bench.load`)."""
+from pasta.bench.load import main
+
+main()
@@ -0,0 +1,50 @@
+"""REST listing latency vs. chain length (in-process Flask test client).
+
+Compares the legacy full ``/blockchain`` dump with a 100-block page, a tail
+query and the NDJSON stream::
+
+    python -m pasta.bench.api --blocks 1000 10000 100000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from pasta import Node
+from pasta.bench.store import synthetic_blocks
+
+
+def _ms(client, url: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        resp = client.get(url)
+        resp.get_data()  # drain streamed bodies too
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def bench(n: int, repeat: int) -> None:
+    node = Node()
+    for block in synthetic_blocks(n):
+        node.blockchain.append(block)
+    client = node.create_flask_app().test_client()
+    tip = len(node.blockchain) - 1
+    full = _ms(client, "/blockchain", max(1, repeat // 10))
+    page = _ms(client, f"/blockchain?from_height={tip // 2}&limit=100", repeat)
+    tail = _ms(client, f"/blockchain?since_height={tip - 10}", repeat)
+    stream = _ms(client, "/blockchain?stream=1", max(1, repeat // 10))
+    print(f"{n:>10,} {full:>10.1f} {page:>10.2f} {tail:>10.2f} {stream:>10.1f}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="/blockchain latency vs chain length")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'blocks':>10} {'full ms':>10} {'page ms':>10} {'tail ms':>10} {'ndjson ms':>10}")
+    for n in args.blocks:
+        bench(n, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Submitted transactions per second by batch size.
+
+Creates ``--txs`` transactions on a fresh node per ``--sizes`` entry, in
+batches of that size, through :meth:`Node.create_transactions` in process
+and through ``POST /transactions/batch`` on a local threaded server (one
+keep-alive session).  A ``single`` row posts the same transactions one by
+one to ``/create_transaction`` for reference::
+
+    python -m pasta.bench.batch --txs 20000 --sizes 1 100 10000
+
+Transactions are unsigned unless ``--signed`` (then signature checks
+dominate: see ``pasta.bench.admission``).
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from typing import Dict, List
+
+import requests
+
+from pasta import Node
+from pasta.core.crypto import Signer, generate_keypair, transaction_message
+
+
+def payloads(txs: int, signed: bool) -> List[Dict]:
+    signer = Signer(generate_keypair()["private_key"]) if signed else None
+    out = []
+    for i in range(txs):
+        tx = {"sender": signer.public_key if signer else f"S{i % 100}", "receiver": f"R{i % 1000}", "amount": float(i % 20)}
+        if signer is not None:
+            tx["timestamp"] = time.time() + i * 1e-6
+            tx["signature"] = signer.sign(transaction_message(tx["sender"], tx["receiver"], tx["amount"], tx["timestamp"]))
+        out.append(tx)
+    return out
+
+
+def in_process(txs: List[Dict], size: int, signed: bool) -> float:
+    node = Node(require_signatures=signed)
+    start = time.perf_counter()
+    for i in range(0, len(txs), size):
+        results = node.create_transactions(txs[i : i + size])
+        assert all(r["status"] == 201 for r in results), results[0]
+    elapsed = time.perf_counter() - start
+    node.close()
+    return len(txs) / elapsed
+
+
+def over_rest(txs: List[Dict], size: int, signed: bool) -> float:
+    from werkzeug.serving import make_server
+
+    node = Node(require_signatures=signed)
+    server = make_server("127.0.0.1", 0, node.create_flask_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    session = requests.Session()
+    start = time.perf_counter()
+    try:
+        if size == 0:  # one request per transaction on the single-item route
+            for tx in txs:
+                assert session.post(f"{url}/create_transaction", json=tx).status_code == 201
+        else:
+            for i in range(0, len(txs), size):
+                body = session.post(f"{url}/transactions/batch", json=txs[i : i + size]).json()
+                assert body["rejected"] == 0, body["results"][0]
+        return len(txs) / (time.perf_counter() - start)
+    finally:
+        server.shutdown()
+        node.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="bulk transaction submission throughput")
+    parser.add_argument("--txs", type=int, default=20_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 10_000])
+    parser.add_argument("--signed", action="store_true")
+    args = parser.parse_args(argv)
+
+    txs = payloads(args.txs, args.signed)
+    print(f"{args.txs:,} {'signed' if args.signed else 'unsigned'} transactions")
+    print(f"{'batch':>7} {'in-process tx/s':>16} {'REST tx/s':>10}")
+    print(f"{'single':>7} {'':>16} {over_rest(txs, 0, args.signed):>10,.0f}")
+    for size in args.sizes:
+        print(f"{size:>7,} {in_process(txs, size, args.signed):>16,.0f} {over_rest(txs, size, args.signed):>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
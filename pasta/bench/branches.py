@@ -0,0 +1,95 @@
+"""Confirmed blocks/second against the number of chain branches.
+
+For each branch count ``k`` a node with ``split_threshold = txs / k`` and
+``max_branches = k`` takes ``--txs`` transactions, which spreads them over
+``k`` branches at increasing levels.  One thread per branch then confirms
+that branch's entries back to back (``advance_c``; every confirmation
+extends its branch tip under the branch lock), and finally the drained
+branches are aggregated back, deepest first::
+
+    python -m pasta.bench.branches --txs 200 --branches 1 2 4 8
+
+Higher levels mine at a lower difficulty, so throughput grows with the
+branch count even on one core; with more cores the per-branch threads also
+commit in parallel (use ``--pow-workers`` to give each PoW a process pool).
+"""
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from pasta import Node
+from pasta.validation import engine as ve
+
+
+def run(txs: int, branches: int) -> Dict:
+    node = Node(split_threshold=max(1, txs // branches), max_branches=branches)
+    for i in range(txs):
+        node.create_transaction(f"S{i}", f"R{i}", 1.0)  # distinct accounts: no ledger conflicts
+
+    queues: Dict[int, List[str]] = defaultdict(list)
+    with node._lock:
+        for tx_id in node.mempool.ids():
+            queues[node.branches.branch_for_tx(tx_id).branch_id].append(tx_id)
+    conflicts = [0]
+
+    def _confirm(ids: List[str]) -> None:
+        for tx_id in ids:
+            while node.advance_c(tx_id, "VALIDATOR") is None:
+                conflicts[0] += 1
+
+    threads = [threading.Thread(target=_confirm, args=(ids,)) for ids in queues.values()]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    merged = 0
+    while True:
+        with node._lock:
+            ready = [b.branch_id for b in node.branches.drained()]
+        if not ready:
+            break
+        merged += sum(node.aggregate(branch_id, "VALIDATOR") is not None for branch_id in ready)
+    merge_seconds = time.perf_counter() - start
+
+    levels = sorted({b["level"] for b in node.get_branches()})
+    blocks = sum(len(ids) for ids in queues.values())
+    node.close()
+    return {
+        "branches": len(queues),
+        "levels": levels,
+        "blocks": blocks,
+        "seconds": elapsed,
+        "conflicts": conflicts[0],
+        "merged": merged,
+        "merge_seconds": merge_seconds,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="blocks/second against branch count")
+    parser.add_argument("--txs", type=int, default=200, help="transactions to confirm per run")
+    parser.add_argument("--branches", type=int, nargs="+", default=[1, 2, 4, 8], help="max open branches")
+    parser.add_argument("--pow-workers", type=int, default=1, help="processes per PoW (0 = one per core)")
+    args = parser.parse_args(argv)
+
+    ve.set_pow_workers(args.pow_workers)
+    print(f"{'branches':>8} {'levels':>12} {'blocks':>7} {'seconds':>8} {'blocks/s':>9} {'conflicts':>9} {'merged':>7} {'merge s':>8}")
+    for k in args.branches:
+        res = run(args.txs, k)
+        levels = ",".join(map(str, res["levels"]))
+        print(
+            f"{res['branches']:>8} {levels:>12} {res['blocks']:>7} {res['seconds']:>8.2f} "
+            f"{res['blocks'] / res['seconds']:>9.1f} {res['conflicts']:>9} {res['merged']:>7} {res['merge_seconds']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
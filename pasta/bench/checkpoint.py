@@ -0,0 +1,121 @@
+"""Memory and bootstrap time with and without checkpoint pruning.
+
+Builds a long synthetic chain (``--blocks`` confirmed transfers between
+``--accounts`` addresses, appended without PoW) on an in-memory node whose
+indexes are kept current, once keeping every block and once with a balance
+checkpoint + prune every ``--interval`` blocks.  Each run happens in its
+own process so the resident set size is comparable.  Then a persistent
+chain of the same length is re-opened twice: replaying the ledger from
+genesis, and bootstrapping a fresh node from the latest checkpoint::
+
+    python -m pasta.bench.checkpoint --blocks 1000000 --interval 100000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from typing import Dict
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node.checkpoint import CHECKPOINT_FILE
+
+
+def rss_mib() -> float:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def fill(node: Node, blocks: int, accounts: int, interval: int = 0) -> None:
+    """Append *blocks* synthetic transfers, checkpointing every *interval* blocks."""
+    node.get_block("")  # bring the index up to date so it is maintained on append
+    for i in range(blocks):
+        with node._lock:
+            tip = node.branches.get(0).tip_hash
+            block = TransactionBlock(
+                sender_address=f"ACCOUNT{i % accounts}",
+                receiver_address=f"ACCOUNT{(i * 7 + 1) % accounts}",
+                amount=1.0,
+                timestamp=1_700_000_000 + i,
+                predecessor_id=tip,
+                predecessor_hash=tip,
+                mint_amount=1.0,
+                block_hash=hashlib.sha256(b"%d" % i).hexdigest(),
+                nonce=i,
+                state="B",
+            )
+            node._append_block(block)
+        if interval and (i + 1) % interval == 0:
+            node.checkpoint("VALIDATOR")
+
+
+def _memory_run(blocks: int, accounts: int, interval: int, out) -> None:
+    node = Node(prune_history=bool(interval))
+    start = time.perf_counter()
+    fill(node, blocks, accounts, interval)
+    out.put({"seconds": time.perf_counter() - start, "rss": rss_mib(), "retained": len(node.blockchain) - node.blockchain.base})
+
+
+def memory(blocks: int, accounts: int, interval: int) -> Dict:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_memory_run, args=(blocks, accounts, interval, out))
+    proc.start()
+    res = out.get()
+    proc.join()
+    return res
+
+
+def bootstrap(blocks: int, accounts: int, interval: int) -> Dict:
+    data_dir = tempfile.mkdtemp(prefix="pasta-checkpoint-")
+    try:
+        node = Node(data_dir=data_dir)
+        fill(node, blocks, accounts)
+        node.checkpoint("VALIDATOR")
+        state = node.last_checkpoint
+        node.close()
+        os.remove(os.path.join(data_dir, CHECKPOINT_FILE))  # force a replay from genesis
+
+        start = time.perf_counter()
+        node = Node(data_dir=data_dir)
+        node.get_balance("ACCOUNT0")  # ledger catch-up over every block
+        replay = time.perf_counter() - start
+        node.close()
+
+        start = time.perf_counter()
+        node = Node(bootstrap=state)
+        node.get_balance("ACCOUNT0")
+        boot = time.perf_counter() - start
+        node.close()
+        return {"replay": replay, "bootstrap": boot}
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="checkpoint pruning memory + bootstrap time")
+    parser.add_argument("--blocks", type=int, default=200_000)
+    parser.add_argument("--accounts", type=int, default=10_000)
+    parser.add_argument("--interval", type=int, default=20_000, help="blocks between checkpoints")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':>8} {'blocks':>10} {'build s':>8} {'RSS MiB':>8} {'retained':>9}")
+    for label, interval in (("full", 0), ("pruned", args.interval)):
+        res = memory(args.blocks, args.accounts, interval)
+        print(f"{label:>8} {args.blocks:>10,} {res['seconds']:>8.1f} {res['rss']:>8.1f} {res['retained']:>9,}")
+    res = bootstrap(args.blocks, args.accounts, args.interval)
+    print(f"replay from genesis: {res['replay']:.2f}s   bootstrap from checkpoint: {res['bootstrap']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
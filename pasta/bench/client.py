@@ -0,0 +1,151 @@
+"""Client SDK latency and throughput against local nodes.
+
+Starts ``--nodes`` node processes (Flask dev server, see
+:mod:`pasta.bench.serving`), or uses ``--url``, and issues ``--requests``
+balance lookups per mode:
+
+* ``requests.get`` – one bare call per request, as the CLI used to
+* ``NodeClient`` – sequential calls on the pooled session
+* ``pipeline xN`` – ``NodeClient.pipeline`` with a pool of ``--concurrency``
+* ``async xN`` – ``AsyncNodeClient`` with ``--concurrency`` requests in flight
+* ``fan-out`` – ``fan_out`` to every node per call (``--nodes`` > 1)
+
+::
+
+    python -m pasta.bench.client --requests 2000 --concurrency 8 --nodes 3
+
+Werkzeug's dev server closes the connection after every response, so
+against it the pooled clients gain from concurrency rather than reuse;
+point ``--url`` at a keep-alive server (``server.py --production``) to
+see connection reuse as well.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import requests
+
+from pasta.bench.serving import _free_port, _wait_ready, pct
+from pasta.client import AsyncNodeClient, NodeClient, fan_out
+
+
+def _row(name: str, latencies: List[float], seconds: float) -> None:
+    print(
+        f"{name:>14} {len(latencies):>8,} {len(latencies) / seconds:>8,.0f} "
+        f"{pct(latencies, 0.5) * 1e3:>7.2f} {pct(latencies, 0.99) * 1e3:>7.2f}"
+    )
+
+
+def _timed(fn: Callable, latencies: List[float]) -> Callable:
+    def call(*args):
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    return call
+
+
+def run(urls: List[str], n: int, concurrency: int) -> None:
+    rng = random.Random(1)
+    addresses = [f"R{rng.randrange(1000)}" for _ in range(n)]
+    url = urls[0]
+    print(f"{n:,} balance lookups, concurrency {concurrency}, {len(urls)} node(s)")
+    print(f"{'mode':>14} {'requests':>8} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7}")
+
+    lat: List[float] = []
+    get = _timed(lambda a: requests.get(f"{url}/balance/{a}", timeout=10).json(), lat)
+    start = time.perf_counter()
+    for a in addresses:
+        get(a)
+    _row("requests.get", lat, time.perf_counter() - start)
+
+    with NodeClient(url, pool_size=concurrency) as client:
+        lat = []
+        balance = _timed(client.balance, lat)
+        start = time.perf_counter()
+        for a in addresses:
+            balance(a)
+        _row("NodeClient", lat, time.perf_counter() - start)
+
+        lat = []
+        client.timed_balance = _timed(client.balance, lat)
+        start = time.perf_counter()
+        client.pipeline([("timed_balance", a) for a in addresses])
+        _row(f"pipeline x{concurrency}", lat, time.perf_counter() - start)
+
+    async def _async() -> None:
+        lat: List[float] = []
+        async with AsyncNodeClient(url, concurrency=concurrency) as client:
+            pending = iter(addresses)
+
+            async def worker() -> None:  # time requests, not the wait for a slot
+                for a in pending:
+                    t = time.perf_counter()
+                    await client.balance(a)
+                    lat.append(time.perf_counter() - t)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            _row(f"async x{concurrency}", lat, time.perf_counter() - start)
+
+    asyncio.run(_async())
+
+    if len(urls) > 1:
+        clients = [NodeClient(u) for u in urls]
+        lat = []
+        call = _timed(lambda a: fan_out(clients, "balance", a), lat)
+        start = time.perf_counter()
+        for a in addresses[: n // len(urls)]:
+            call(a)
+        _row(f"fan-out x{len(urls)}", lat, time.perf_counter() - start)
+        for c in clients:
+            c.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="client SDK latency + throughput")
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--nodes", type=int, default=1, help="local node processes to start")
+    parser.add_argument("--blocks", type=int, default=1_000)
+    parser.add_argument("--url", nargs="+", help="use running nodes instead")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        run(args.url, args.requests, args.concurrency)
+        return
+
+    from pasta.bench.sync import build_source
+
+    tmp = tempfile.mkdtemp(prefix="pasta-client-")
+    procs: Dict[int, subprocess.Popen] = {}
+    try:
+        for i in range(args.nodes):
+            data_dir = os.path.join(tmp, f"node{i}")
+            build_source(data_dir, args.blocks)
+            port = _free_port()
+            cmd = [sys.executable, "-m", "pasta.bench.serving", "--serve", "dev", "--data", data_dir, "--port", str(port)]
+            procs[port] = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for port in procs:
+            _wait_ready(port)
+        run([f"http://127.0.0.1:{port}" for port in procs], args.requests, args.concurrency)
+    finally:
+        for proc in procs.values():
+            proc.terminate()
+            proc.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Block hashing: legacy ``repr`` serialisation vs. canonical binary encoding.
+
+    python -m pasta.bench.encoding --blocks 20000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import time
+from dataclasses import asdict
+from typing import Callable, List
+
+from pasta.core.encoding import hashed_payload
+from pasta.core.models import TransactionBlock
+from pasta.validation import engine as ve
+
+
+def legacy_payload(block: TransactionBlock) -> bytes:
+    """The pre-encoding serialisation: ``str(sorted(asdict(block)))``."""
+    data = asdict(block)
+    data.pop("block_hash", None)
+    data.pop("nonce", None)
+    return str(sorted(data.items())).encode()
+
+
+def _sample(n: int) -> List[TransactionBlock]:
+    genesis = TransactionBlock.create_genesis()
+    return [ve.build_state_a("S" * 88, "R" * 88, i * 0.1, genesis) for i in range(n)]
+
+
+def _rate(fn: Callable[[TransactionBlock], object], blocks: List[TransactionBlock]) -> float:
+    start = time.perf_counter()
+    for block in blocks:
+        fn(block)
+    return len(blocks) / (time.perf_counter() - start)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="repr vs canonical block hashing")
+    parser.add_argument("--blocks", type=int, default=20_000)
+    args = parser.parse_args(argv)
+
+    blocks = _sample(args.blocks)
+    legacy = _rate(lambda b: hashlib.sha256(legacy_payload(b)).hexdigest(), blocks)
+    canonical = _rate(lambda b: hashlib.sha256(hashed_payload(b)).hexdigest(), blocks)
+    for b in blocks:
+        b.compute_hash()  # populate cache
+    cached = _rate(TransactionBlock.compute_hash, blocks)
+
+    print(f"{'path':>10} {'hashes/s':>12} {'bytes/block':>12}")
+    print(f"{'repr':>10} {legacy:>12,.0f} {len(legacy_payload(blocks[0])):>12}")
+    print(f"{'canonical':>10} {canonical:>12,.0f} {len(blocks[0].to_bytes()):>12}")
+    print(f"{'cached':>10} {cached:>12,.0f} {'-':>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Propagation latency and bandwidth of the gossip layer.
+
+Starts ``--nodes`` nodes with a shared genesis in one process, each with a
+:class:`Gossip` service on localhost, wired as a ring plus ``--degree``
+random links per node.  ``--txs`` transactions are then created at random
+nodes at ``--rate`` per second, and ``--blocks`` of them are confirmed at
+their origin.  Reports, per item kind, how long each remote node took to
+accept it (and how long until the last one had it) and the bytes sent per
+item across the whole network::
+
+    python -m pasta.bench.gossip --nodes 50 --txs 200 --rate 100 --blocks 5
+
+All nodes share one event loop and one core here, so latencies include
+queueing behind the other 49 nodes' work.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node import events as ev
+from pasta.node.gossip import Gossip
+
+
+def pct(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else float("nan")
+
+
+def _traffic(services: List[Gossip]) -> Tuple[int, int]:
+    return sum(g.counters["bytes_sent"] for g in services), sum(g.counters["messages_sent"] for g in services)
+
+
+async def simulate(nodes: int, degree: int, fanout: int, txs: int, rate: float, blocks: int, seed: int = 1) -> Dict:
+    rng = random.Random(seed)
+    genesis = vars(TransactionBlock.create_genesis())
+    network = [Node(genesis=genesis) for _ in range(nodes)]
+    services = [Gossip(node, fanout=fanout, max_peers=4 * degree + 4) for node in network]
+    arrivals: Dict[str, Dict[int, float]] = defaultdict(dict)  # item -> node -> perf_counter
+
+    for i, node in enumerate(network):
+        def _record(event, i=i):
+            if event.kind == ev.TX_CREATED:
+                arrivals["tx:" + event.data["tx_id"]][i] = time.perf_counter()
+            elif event.kind == ev.BLOCK_APPENDED:
+                arrivals["block:" + event.data["block"]["block_hash"]][i] = time.perf_counter()
+
+        node.events.subscribe(_record)
+    for g in services:
+        await g.start()
+    links = {(i, (i + 1) % nodes) for i in range(nodes)}
+    for i in range(nodes):
+        links.update((i, j) for j in rng.sample(range(nodes), degree) if j != i)
+    for i, j in links:
+        await services[i].connect("127.0.0.1", services[j].port)
+
+    async def _settle(items: List[str], timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        while any(len(arrivals[k]) < nodes for k in items) and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+    # Transactions
+    before = _traffic(services)
+    origins: Dict[str, int] = {}
+    for n in range(txs):
+        i = rng.randrange(nodes)
+        network[i].create_transaction(f"S{n}", f"R{n}", 1.0)
+        origins[network[i].get_mempool_tx(-1)["tx_id"]] = i
+        await asyncio.sleep(1.0 / rate)
+    tx_items = ["tx:" + tx_id for tx_id in origins]
+    await _settle(tx_items)
+    tx_traffic = [a - b for a, b in zip(_traffic(services), before)]
+
+    # Blocks, one at a time so every node has the predecessor
+    before = _traffic(services)
+    loop = asyncio.get_running_loop()
+    block_items = []
+    for tx_id in list(origins)[:blocks]:
+        block = await loop.run_in_executor(None, network[origins[tx_id]].advance_c, tx_id, "VALIDATOR")
+        block_items.append("block:" + block["block_hash"])
+        await _settle(block_items[-1:])
+    block_traffic = [a - b for a, b in zip(_traffic(services), before)]
+
+    def _summary(items: List[str], traffic: List[int]) -> Dict:
+        hops, full = [], []
+        for item in items:
+            times = arrivals[item]
+            origin = min(times.values())
+            hops.extend(t - origin for t in times.values() if t != origin)
+            full.append(max(times.values()) - origin)
+        return {
+            "items": len(items),
+            "coverage": sum(len(arrivals[k]) for k in items) / max(1, len(items) * nodes),
+            "p50": pct(hops, 0.5),
+            "p95": pct(hops, 0.95),
+            "p99": pct(hops, 0.99),
+            "all_nodes_p50": pct(full, 0.5),
+            "all_nodes_max": max(full) if full else float("nan"),
+            "bytes_per_item": traffic[0] / max(1, len(items)),
+            "messages_per_item": traffic[1] / max(1, len(items)),
+        }
+
+    result = {"links": len(links), "tx": _summary(tx_items, tx_traffic), "block": _summary(block_items, block_traffic)}
+    result["duplicates"] = sum(g.counters["duplicates"] for g in services)
+    for g in services:
+        await g.close()
+    for node in network:
+        node.close()
+    return result
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="gossip propagation latency + bandwidth")
+    parser.add_argument("--nodes", type=int, default=50)
+    parser.add_argument("--degree", type=int, default=4, help="random outbound links per node (plus a ring)")
+    parser.add_argument("--fanout", type=int, default=8, help="peers each item is announced to")
+    parser.add_argument("--txs", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=100.0, help="transactions created per second")
+    parser.add_argument("--blocks", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    res = asyncio.run(simulate(args.nodes, args.degree, args.fanout, args.txs, args.rate, args.blocks))
+    print(f"{args.nodes} nodes, {res['links']} links, fanout {args.fanout}, {res['duplicates']} duplicate announcements")
+    print(f"{'kind':>6} {'items':>6} {'cover':>6} {'p50 ms':>7} {'p95 ms':>7} {'p99 ms':>7} {'all p50':>8} {'all max':>8} {'B/item':>8} {'msg/item':>9}")
+    for kind in ("tx", "block"):
+        r = res[kind]
+        print(
+            f"{kind:>6} {r['items']:>6} {r['coverage']:>6.0%} {r['p50'] * 1e3:>7.1f} {r['p95'] * 1e3:>7.1f} "
+            f"{r['p99'] * 1e3:>7.1f} {r['all_nodes_p50'] * 1e3:>8.1f} {r['all_nodes_max'] * 1e3:>8.1f} "
+            f"{r['bytes_per_item']:>8,.0f} {r['messages_per_item']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Micro-benchmark: legacy per-nonce hashing vs. the midstate NonceScanner.
+
+    python -m pasta.bench.hashing --nonces 200000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import asdict
+
+from pasta.core.models import TransactionBlock
+from pasta.validation import engine as ve
+from pasta.validation.hashing import NonceScanner
+
+_NEVER = "ffffffffffff"  # prefix that practically never matches: scan the full range
+
+
+def legacy_loop(data: str, nonces: int, prefix: str = _NEVER) -> None:
+    for nonce in range(nonces):
+        if ve._hash_with_nonce(data, nonce).startswith(prefix):
+            return
+
+
+def midstate_loop(data: str, nonces: int, prefix: str = _NEVER) -> None:
+    NonceScanner(data, prefix).scan(0, nonces)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Legacy vs midstate PoW hash loop")
+    parser.add_argument("--nonces", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    data = ve._serialize(asdict(TransactionBlock.create_genesis()))
+    results = {}
+    for name, loop in (("legacy", legacy_loop), ("midstate", midstate_loop)):
+        start = time.perf_counter()
+        loop(data, args.nonces)
+        elapsed = time.perf_counter() - start
+        results[name] = args.nonces / elapsed
+        print(f"{name:>9}: {results[name]:>12,.0f} hashes/s  ({len(data)} byte prefix)")
+    print(f"  speedup: {results['midstate'] / results['legacy']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Lookup latency vs. chain length: ChainIndex against a linear scan.
+
+    python -m pasta.bench.indexes --blocks 10000 100000 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from pasta.bench.store import synthetic_blocks
+from pasta.node.indexes import ChainIndex
+from pasta.node.store import ChainStore
+
+_LOOKUPS = 1_000
+
+
+def _per_lookup_us(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def bench(n: int, scan: bool) -> None:
+    store, index = ChainStore(), ChainIndex()
+    hashes, addresses = [], []
+    for block in synthetic_blocks(n):
+        store.append(block)
+        hashes.append(block["block_hash"])
+        addresses.append(block["sender_address"])
+    index.catch_up(store)
+
+    rng = random.Random(0)
+    hash_keys = rng.sample(hashes, min(_LOOKUPS, n))
+    addr_keys = rng.sample(addresses, min(_LOOKUPS, n))
+
+    by_hash = _per_lookup_us(lambda h: store.row(index.height_of(h)), hash_keys)
+    by_addr = _per_lookup_us(lambda a: [store.row(h) for h in index.heights_for_address(a)], addr_keys)
+    line = f"{n:>10,} {by_hash:>12.1f} {by_addr:>14.1f}"
+    if scan:
+        scanned = _per_lookup_us(lambda h: next(b for b in store if b["block_hash"] == h), hash_keys[:5])
+        line += f" {scanned:>14.0f}"
+    print(line)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Indexed lookups vs chain length")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--scan", action="store_true", help="also time a linear scan (slow)")
+    args = parser.parse_args(argv)
+
+    header = f"{'blocks':>10} {'hash us':>12} {'address us':>14}"
+    print(header + (f" {'scan us':>14}" if args.scan else ""))
+    for n in args.blocks:
+        bench(n, args.scan)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""End-to-end load generator with machine-readable results.
+
+Drives one node the way a busy network would: ``--keys`` wallets sign
+``--txs`` transfers between each other, which are submitted at ``--rate``
+tx/s (Poisson arrivals; 0 = as fast as the node takes them) while the
+validator matcher advances them to State B and confirms them (State C).
+The node runs in this process and is reached either directly
+(``--mode inproc``, through the admission pipeline like a REST submission)
+or over HTTP (``--mode http``, a local server thread and
+:class:`pasta.client.NodeClient`).
+
+Reported, and written as JSON with ``--out``:
+
+* admitted and confirmed transactions/second;
+* p50/p95/p99 latency per stage – A: submitted → ``tx-created``,
+  B: ``tx-created`` → ``tx-advanced-b``, C: ``tx-advanced-b`` →
+  ``block-appended`` – and end to end;
+* time spent waiting for the node lock;
+* resident memory at start, end and peak.
+
+::
+
+    python -m pasta.bench.load --txs 300 --rate 50 --out before.json
+    git checkout my-branch
+    python -m pasta.bench.load --txs 300 --rate 50 --out after.json --compare before.json
+
+The matcher keeps the newest State-B transaction as the next pairing
+target, so one transaction per branch is still unconfirmed at the end.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from pasta import Node
+from pasta.bench.checkpoint import rss_mib
+from pasta.core.crypto import Signer, generate_keypair, transaction_message
+from pasta.node import events as ev
+from pasta.node.admission import AdmissionQueueFull
+from pasta.node.matcher import percentiles
+
+STAGES = ("A", "B", "C", "end_to_end")
+POINTS = (50, 95, 99)
+
+# Metrics shown by --compare and whether a higher value is better
+COMPARED = {
+    "throughput.admitted_tx_s": True,
+    "throughput.confirmed_tx_s": True,
+    **{f"latency_ms.{stage}.p{p}": False for stage in STAGES for p in (50, 99)},
+    "lock.wait_seconds": False,
+    "memory_mib.growth": False,
+}
+
+
+class TimedLock:
+    """Drop-in wrapper for ``threading.Lock`` that adds up contended wait time."""
+
+    def __init__(self, lock) -> None:
+        self._lock = lock
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        if not self._lock.acquire(True, timeout):
+            return False
+        waited = time.perf_counter() - start
+        # Counters are only touched with the lock held
+        self.acquisitions += 1
+        self.contended += 1
+        self.wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return True
+
+    def release(self) -> None:
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "acquisitions": self.acquisitions,
+            "contended": self.contended,
+            "wait_seconds": self.wait,
+            "max_wait_ms": self.max_wait * 1e3,
+        }
+
+
+class StageClock:
+    """Per-transaction stage timestamps collected from the node's event feed."""
+
+    def __init__(self) -> None:
+        self.submitted: Dict[str, float] = {}  # signature -> submit time
+        self.created: Dict[str, float] = {}  # tx ID -> tx-created
+        self.advanced: Dict[str, float] = {}  # tx ID -> tx-advanced-b
+        self.latencies: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+        self.confirmed = 0
+
+    def on_event(self, event: ev.Event) -> None:
+        # Runs with the node lock held (see pasta.node.events): bookkeeping only
+        tx_id = event.data.get("tx_id")
+        if event.kind == ev.TX_CREATED:
+            submitted = self.submitted.get(event.data["tx"].get("signature"))
+            if submitted is not None:
+                self.created[tx_id] = event.timestamp
+                self.latencies["A"].append(event.timestamp - submitted)
+        elif event.kind == ev.TX_ADVANCED_B and tx_id in self.created:
+            self.advanced[tx_id] = event.timestamp
+            self.latencies["B"].append(event.timestamp - self.created[tx_id])
+        elif event.kind == ev.BLOCK_APPENDED and tx_id in self.created:
+            self.confirmed += 1
+            created = self.created.pop(tx_id)
+            advanced = self.advanced.pop(tx_id, None)
+            if advanced is not None:
+                self.latencies["C"].append(event.timestamp - advanced)
+            self.latencies["end_to_end"].append(event.timestamp - created)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for stage, values in self.latencies.items():
+            row = {p: v * 1e3 for p, v in percentiles(values, POINTS).items()}
+            row["samples"] = len(values)
+            out[stage] = row
+        return out
+
+
+class MemorySampler(threading.Thread):
+    """Samples RSS every *interval* seconds to catch the peak."""
+
+    def __init__(self, interval: float = 0.1) -> None:
+        super().__init__(name="pasta-bench-rss", daemon=True)
+        self.interval = interval
+        self.start_mib = self.peak_mib = rss_mib()
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        while not self._halt.wait(self.interval):
+            self.peak_mib = max(self.peak_mib, rss_mib())
+
+    def stop(self) -> Dict[str, float]:
+        self._halt.set()
+        self.join()
+        end = rss_mib()
+        return {"start": self.start_mib, "end": end, "peak": max(self.peak_mib, end), "growth": end - self.start_mib}
+
+
+def make_traffic(txs: int, keys: int, seed: int = 1) -> List[Dict]:
+    """*txs* signed transfers between *keys* wallets (random pairs and amounts)."""
+    rng = random.Random(seed)
+    signers = [Signer(generate_keypair()["private_key"]) for _ in range(keys)]
+    payloads = []
+    for i in range(txs):
+        sender, receiver = rng.sample(signers, 2) if keys > 1 else (signers[0], signers[0])
+        amount = float(rng.randint(1, 100))
+        ts = time.time() + i * 1e-6
+        msg = transaction_message(sender.public_key, receiver.public_key, amount, ts)
+        payloads.append(
+            {"sender": sender.public_key, "receiver": receiver.public_key, "amount": amount, "timestamp": ts, "signature": sender.sign(msg)}
+        )
+    return payloads
+
+
+def _submitter(node: Node, mode: str, concurrency: int):
+    """``(submit(payload) -> Future, close())`` for the chosen front door."""
+    if mode == "inproc":
+
+        def submit(payload: Dict) -> Future:
+            while True:
+                try:
+                    return node.admission.submit(payload)
+                except AdmissionQueueFull:
+                    time.sleep(0.001)
+
+        return submit, lambda: None
+
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from pasta.client import NodeClient
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args) -> None:
+            pass
+
+    server = make_server("127.0.0.1", 0, node.create_flask_app(), threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, name="pasta-bench-http", daemon=True).start()
+    client = NodeClient(f"http://127.0.0.1:{server.server_port}", pool_size=concurrency)
+    pool = ThreadPoolExecutor(concurrency, thread_name_prefix="pasta-bench-submit")
+
+    def close() -> None:
+        pool.shutdown(wait=True)
+        client.close()
+        server.shutdown()
+
+    return lambda payload: pool.submit(client.create_transaction, payload), close
+
+
+def run(
+    payloads: List[Dict],
+    mode: str = "inproc",
+    rate: float = 0.0,
+    workers: int = 1,
+    verify_workers: Optional[int] = None,
+    concurrency: int = 8,
+    split_threshold: Optional[int] = None,
+    timeout: float = 600.0,
+    seed: int = 1,
+) -> Dict[str, Any]:
+    """Push *payloads* through a fresh node; the results document (see module docstring)."""
+    rng = random.Random(seed)
+    memory = MemorySampler()
+    memory.start()
+    node = Node(require_signatures=True, verify_workers=verify_workers, mining_workers=workers, split_threshold=split_threshold)
+    lock = node._lock = TimedLock(node._lock)  # before any thread can take it
+    clock = StageClock()
+    unsubscribe = node.events.subscribe(clock.on_event)
+    matcher = node.start_matcher("BENCH-VALIDATOR", workers=workers)
+    submit, close = _submitter(node, mode, concurrency)
+
+    start = time.perf_counter()
+    due = start
+    futures = []
+    for payload in payloads:
+        if rate > 0:
+            due += rng.expovariate(rate)
+            time.sleep(max(0.0, due - time.perf_counter()))
+        clock.submitted[payload["signature"]] = time.time()
+        futures.append(submit(payload))
+    deadline = time.monotonic() + timeout
+    wait(futures, timeout=timeout)
+    close()
+    admitted_at = time.perf_counter()
+    drained = matcher.wait_idle(timeout=max(0.0, deadline - time.monotonic()))
+    finished = time.perf_counter()
+
+    unsubscribe()
+    matcher_stats = matcher.stats()
+    admitted = sum(1 for f in futures if f.done() and f.exception() is None)
+    result = {
+        "mode": mode,
+        "submitted": len(payloads),
+        "admitted": admitted,
+        "rejected": len(payloads) - admitted,
+        "confirmed": clock.confirmed,
+        "unconfirmed": admitted - clock.confirmed,
+        "drained": drained,
+        "seconds": {"admit": admitted_at - start, "total": finished - start},
+        "throughput": {
+            "admitted_tx_s": admitted / (admitted_at - start),
+            "confirmed_tx_s": clock.confirmed / (finished - start),
+        },
+        "latency_ms": clock.summary(),
+        "lock": dict(lock.to_dict(), wait_per_tx_us=lock.wait / max(1, admitted) * 1e6),
+        "matcher": {k: matcher_stats[k] for k in ("paired", "confirmed", "aggregated", "conflicts")},
+        "chain_length": len(node.blockchain),
+        "mempool": len(node.mempool),
+    }
+    node.close()
+    result["memory_mib"] = memory.stop()
+    return result
+
+
+def environment(args: Optional[argparse.Namespace] = None) -> Dict[str, Any]:
+    """Where a result came from: commit, interpreter, machine, arguments."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    def git(*cmd: str) -> Optional[str]:
+        try:
+            out = subprocess.run(["git", *cmd], cwd=root, capture_output=True, text=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        return out.stdout.strip() if out.returncode == 0 else None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": None if status is None else bool(status),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "started": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "args": vars(args) if args is not None else {},
+    }
+
+
+def _lookup(doc: Dict[str, Any], path: str) -> Optional[float]:
+    for key in path.split("."):
+        if not isinstance(doc, dict) or key not in doc:
+            return None
+        doc = doc[key]
+    return doc
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """One row per :data:`COMPARED` metric present in both results; ``worse`` flags regressions."""
+    rows = []
+    for path, higher_is_better in COMPARED.items():
+        old, now = _lookup(base, path), _lookup(new, path)
+        if old is None or now is None:
+            continue
+        change = (now - old) / old if old else 0.0
+        rows.append({"metric": path, "base": old, "new": now, "change": change, "worse": (change < 0) == higher_is_better and change != 0})
+    return rows
+
+
+def print_result(res: Dict[str, Any]) -> None:
+    print(
+        f"{res['mode']}: {res['admitted']:,}/{res['submitted']:,} admitted in {res['seconds']['admit']:.2f}s "
+        f"({res['throughput']['admitted_tx_s']:,.0f} tx/s), {res['confirmed']:,} confirmed in "
+        f"{res['seconds']['total']:.2f}s ({res['throughput']['confirmed_tx_s']:,.1f} tx/s)"
+    )
+    print(f"  {'stage':>10} {'samples':>8} " + " ".join(f"{f'p{p} ms':>9}" for p in POINTS))
+    for stage, row in res["latency_ms"].items():
+        print(f"  {stage:>10} {row['samples']:>8,} " + " ".join(f"{row.get(f'p{p}', 0):>9.1f}" for p in POINTS))
+    lock, mem = res["lock"], res["memory_mib"]
+    print(
+        f"  node lock: {lock['acquisitions']:,} acquisitions, {lock['contended']:,} contended, "
+        f"{lock['wait_seconds'] * 1e3:.1f} ms waited (max {lock['max_wait_ms']:.1f} ms)"
+    )
+    print(f"  RSS MiB: {mem['start']:.1f} -> {mem['end']:.1f} (peak {mem['peak']:.1f}, +{mem['growth']:.1f})")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="end-to-end load generator, JSON results")
+    parser.add_argument("--txs", type=int, default=300, help="signed transactions to submit")
+    parser.add_argument("--keys", type=int, default=50, help="wallets in the keypair pool")
+    parser.add_argument("--rate", type=float, default=0.0, help="offered load in tx/s (0: as fast as accepted)")
+    parser.add_argument("--mode", nargs="+", choices=["inproc", "http"], default=["inproc"])
+    parser.add_argument("--workers", type=int, default=1, help="matcher / mining worker threads")
+    parser.add_argument("--verify-workers", type=int, default=None, help="signature worker processes")
+    parser.add_argument("--concurrency", type=int, default=8, help="HTTP requests in flight")
+    parser.add_argument("--split-threshold", type=int, default=None, help="open branches above this many pending")
+    parser.add_argument("--timeout", type=float, default=600.0, help="give up waiting for confirmations after this")
+    parser.add_argument("--out", help="write the JSON results here ('-' for stdout)")
+    parser.add_argument("--compare", metavar="BASE", help="earlier --out file to compare against")
+    args = parser.parse_args(argv)
+
+    payloads = make_traffic(args.txs, args.keys)
+    doc: Dict[str, Any] = {"environment": environment(args), "runs": []}
+    for mode in args.mode:
+        res = run(
+            payloads,
+            mode=mode,
+            rate=args.rate,
+            workers=args.workers,
+            verify_workers=args.verify_workers,
+            concurrency=args.concurrency,
+            split_threshold=args.split_threshold,
+            timeout=args.timeout,
+        )
+        doc["runs"].append(res)
+        if args.out != "-":
+            print_result(res)
+
+    if args.compare:
+        with open(args.compare) as f:
+            base_doc = json.load(f)
+        base = {r["mode"]: r for r in base_doc["runs"]}
+        shaping = ("txs", "keys", "rate", "workers", "verify_workers", "concurrency", "split_threshold")
+        base_args = base_doc["environment"].get("args", {})
+        changed = [k for k in shaping if k in base_args and base_args[k] != getattr(args, k)]
+        if changed and args.out != "-":
+            print(f"note: {args.compare} was run with different {', '.join(changed)}")
+        doc["comparison"] = {r["mode"]: compare(base[r["mode"]], r) for r in doc["runs"] if r["mode"] in base}
+        if args.out != "-":
+            for mode, rows in doc["comparison"].items():
+                print(f"{mode} vs {args.compare}:")
+                for row in rows:
+                    flag = "  worse" if row["worse"] else ""
+                    print(f"  {row['metric']:>28} {row['base']:>10.2f} -> {row['new']:>10.2f} {row['change']:>+8.1%}{flag}")
+
+    if args.out == "-":
+        json.dump(doc, sys.stdout, indent=2)
+        print()
+    elif args.out:
+        with open(args.out, "w") as f:
+            json.dump(doc, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""End-to-end confirmation latency under the validator matcher.
+
+Feeds ``--txs`` transactions at ``--rate`` tx/s (Poisson arrivals) into a
+node running :class:`pasta.node.matcher.ValidatorMatcher` and reports the
+``tx-created`` → ``block-appended`` latency percentiles and the achieved
+confirmation rate for each worker count::
+
+    python -m pasta.bench.matcher --txs 100 --rate 5 --workers 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from pasta import Node
+
+
+def bench(txs: int, rate: float, workers: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    node = Node(mining_workers=workers)
+    matcher = node.start_matcher("BENCH-VALIDATOR", workers=workers)
+    start = time.perf_counter()
+    for i in range(txs):
+        node.create_transaction(f"SENDER{i % 10}", f"RECEIVER{i % 7}", float(i % 50 + 1))
+        time.sleep(rng.expovariate(rate))
+    matcher.wait_idle()
+    elapsed = time.perf_counter() - start
+    stats = matcher.stats()
+    node.close()
+
+    p = stats["latency_seconds"]
+    print(
+        f"{workers:>8} {stats['confirmed'] / elapsed:>10.2f} {p.get('p50', 0):>8.2f} {p.get('p90', 0):>8.2f} "
+        f"{p.get('p95', 0):>8.2f} {p.get('p99', 0):>8.2f} {stats['conflicts']:>10}"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="matcher confirmation latency percentiles")
+    parser.add_argument("--txs", type=int, default=100)
+    parser.add_argument("--rate", type=float, default=5.0, help="offered load, transactions/second")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    args = parser.parse_args(argv)
+
+    print(f"{'workers':>8} {'conf/s':>10} {'p50 s':>8} {'p90 s':>8} {'p95 s':>8} {'p99 s':>8} {'conflicts':>10}")
+    for n in args.workers:
+        bench(args.txs, args.rate, n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Proof-of-work throughput benchmark.
+
+Reports hashes/second of :func:`pasta.validation.engine.mine_pow` for each
+requested worker count::
+
+    python -m pasta.bench.pow --prefix 0000 --rounds 5 --workers 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import asdict
+from typing import List
+
+from pasta.core.models import TransactionBlock
+from pasta.validation import engine as ve
+from pasta.validation.parallel import get_miner
+
+
+def _sample_blocks(rounds: int) -> List[dict]:
+    genesis = TransactionBlock.create_genesis()
+    blocks = []
+    for i in range(rounds):
+        tx = ve.build_state_a(f"SENDER{i}", f"RECEIVER{i}", float(i), genesis)
+        blocks.append(asdict(tx))
+    return blocks
+
+
+def bench_workers(workers: int, blocks: List[dict], prefix: str) -> float:
+    """Mine every block with *workers* processes and return hashes/second."""
+    hashes = 0
+    if workers == 1:
+        start = time.perf_counter()
+        for block in blocks:
+            nonce, _ = ve.mine_pow(block, prefix, workers=1)
+            hashes += nonce + 1
+        elapsed = time.perf_counter() - start
+    else:
+        miner = get_miner(workers)
+        miner.mine(blocks[0], prefix[:1])  # warm-up: start the worker processes
+        start = time.perf_counter()
+        for block in blocks:
+            miner.mine(block, prefix)
+            hashes += miner.last_hash_count
+        elapsed = time.perf_counter() - start
+    return hashes / elapsed if elapsed else 0.0
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="PoW hashes/second per worker count")
+    parser.add_argument("--prefix", default=ve.DIFFICULTY_PREFIX, help="hex difficulty prefix")
+    parser.add_argument("--rounds", type=int, default=5, help="blocks mined per worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to try")
+    args = parser.parse_args(argv)
+
+    blocks = _sample_blocks(args.rounds)
+    print(f"{'workers':>8} {'hashes/s':>14} {'per core':>12}")
+    for n in args.workers:
+        rate = bench_workers(n, blocks, args.prefix)
+        print(f"{n:>8} {rate:>14,.0f} {rate / n:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
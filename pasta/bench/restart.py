@@ -0,0 +1,61 @@
+"""Warm-restart benchmark: mempool snapshot write and restart-to-serving time.
+
+Fills a persistent node's mempool, then reports how long the node lock is
+held to capture a snapshot, how long the background write takes, the file
+size, and the time from ``Node(data_dir)`` to the first answered
+``/mempool`` request::
+
+    python -m pasta.bench.restart --mempool 100000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from pasta import Node
+from pasta.node.snapshot import SNAPSHOT_FILE, write_snapshot
+
+
+def bench(n: int, data_dir: str) -> None:
+    node = Node(data_dir=data_dir, snapshot_interval=3600)
+    for i in range(n):
+        node.create_transaction(f"SENDER{i % 1000}", f"RECEIVER{i % 997}", float(i % 100 + 1))
+
+    start = time.perf_counter()
+    _, state = node._capture_snapshot()
+    locked = time.perf_counter() - start
+    path = os.path.join(data_dir, SNAPSHOT_FILE)
+    start = time.perf_counter()
+    write_snapshot(path, state)
+    written = time.perf_counter() - start
+    node.close()
+    size = os.path.getsize(path)
+
+    start = time.perf_counter()
+    node = Node(data_dir=data_dir, snapshot_interval=3600)
+    node.create_flask_app().test_client().get("/mempool?limit=1").get_data()
+    serving = time.perf_counter() - start
+    assert len(node.get_mempool()) == n + 1
+    node.close()
+    print(f"{n:>10,} {locked * 1e3:>10.1f} {written:>10.2f} {size / 2**20:>10.1f} {serving:>12.2f}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="mempool snapshot + warm restart timings")
+    parser.add_argument("--mempool", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args(argv)
+
+    print(f"{'entries':>10} {'lock ms':>10} {'write s':>10} {'MiB':>10} {'restart s':>12}")
+    for n in args.mempool:
+        data_dir = tempfile.mkdtemp(prefix="pasta-restart-")
+        try:
+            bench(n, data_dir)
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
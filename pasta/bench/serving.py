@@ -0,0 +1,207 @@
+"""Requests per second of the REST API under each serving mode.
+
+Builds a ``--blocks`` chain (see :mod:`pasta.bench.sync`), starts one
+server process per mode and drives it with ``--clients`` keep-alive
+connections for ``--seconds`` seconds.  The request mix is mostly block
+lookups by hash, plus chain pages of 100 blocks, balances and stats::
+
+    python -m pasta.bench.serving --blocks 20000 --clients 8 --seconds 10
+
+Modes:
+
+* ``dev-stdlib`` – Flask dev server, stdlib JSON, no block cache (the
+  behaviour before pasta.node.render)
+* ``dev`` – Flask dev server with orjson and pre-rendered blocks
+* ``ipc`` – one threaded proxy process in front of the node process
+  (pasta.network.ipc; the IPC hop without gunicorn)
+* ``gunicorn`` – ``--workers`` gunicorn gthread workers sharing the node
+  process over IPC (skipped when gunicorn is not installed)
+
+Clients and servers share the machine, so on few cores the numbers
+understate every mode; compare them with each other.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+MODES = ("dev-stdlib", "dev", "ipc", "gunicorn")
+
+
+def pct(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))] if ordered else float("nan")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# ---------------------------------------------------------------------------
+# Server side (runs in a child process: python -m pasta.bench.serving --serve MODE)
+# ---------------------------------------------------------------------------
+def serve(mode: str, data_dir: str, port: int, workers: int) -> None:
+    from pasta import Node
+    from pasta.network import ipc
+
+    node = Node(data_dir=data_dir)
+    if mode == "dev-stdlib":
+        node.create_flask_app(fast_json=False, block_cache=0).run("127.0.0.1", port, threaded=True)
+    elif mode == "dev":
+        node.create_flask_app().run("127.0.0.1", port, threaded=True)
+    elif mode == "gunicorn":
+        ipc.serve(node.create_flask_app(), "127.0.0.1", port, workers=workers, gunicorn_args=["--log-level", "warning"])
+    else:
+        server = ipc.NodeServer(node.create_flask_app()).start()
+        front = (
+            "import sys; from werkzeug.serving import run_simple; from pasta.network.ipc import proxy_app; "
+            "run_simple('127.0.0.1', int(sys.argv[1]), proxy_app(), threaded=True)"
+        )
+        env = dict(os.environ, PASTA_NODE_SOCKET=server.address, PASTA_NODE_AUTHKEY=server.authkey.hex())
+        subprocess.run([sys.executable, "-c", front, str(port)], env=env)
+
+
+# ---------------------------------------------------------------------------
+# Load generator
+# ---------------------------------------------------------------------------
+def _wait_ready(port: int, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/stats")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def load(port: int, paths: List[str], clients: int, seconds: float) -> Dict:
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def _client(seed: int) -> None:
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        mine, failed = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", rng.choice(paths))
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    failed += 1
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=_client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50": pct(latencies, 0.5),
+        "p99": pct(latencies, 0.99),
+        "errors": errors[0],
+    }
+
+
+def request_mix(data_dir: str, samples: int = 2_000, seed: int = 1) -> List[str]:
+    from pasta.node.storage import BlockLog
+
+    rng = random.Random(seed)
+    log = BlockLog(data_dir)
+    paths = []
+    for _ in range(samples):
+        r = rng.random()
+        if r < 0.7:
+            paths.append(f"/block/{log.row(rng.randrange(len(log)))['block_hash']}")
+        elif r < 0.8:
+            paths.append(f"/blockchain?from_height={rng.randrange(len(log))}&limit=100")
+        elif r < 0.9:
+            paths.append(f"/balance/R{rng.randrange(1000)}")
+        else:
+            paths.append("/stats")
+    log.close()
+    return paths
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="REST serving throughput per mode")
+    parser.add_argument("--blocks", type=int, default=20_000)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn workers")
+    parser.add_argument("--serve", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--data", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.serve, args.data, args.port, args.workers)
+        return
+
+    from pasta.bench.sync import build_source
+
+    tmp = tempfile.mkdtemp(prefix="pasta-serving-")
+    try:
+        data_dir = os.path.join(tmp, "chain")
+        build_source(data_dir, args.blocks)
+        paths = request_mix(data_dir)
+        print(f"{args.blocks:,} blocks, {args.clients} clients, {args.seconds:.0f} s per mode")
+        print(f"{'mode':>10} {'requests':>9} {'req/s':>8} {'p50 ms':>7} {'p99 ms':>7} {'errors':>6}")
+        for mode in args.modes:
+            if mode == "gunicorn":
+                try:
+                    import gunicorn  # noqa: F401
+                except ImportError:
+                    print(f"{mode:>10}  skipped: gunicorn is not installed")
+                    continue
+            port = _free_port()
+            cmd = [sys.executable, "-m", "pasta.bench.serving", "--serve", mode, "--data", data_dir]
+            cmd += ["--port", str(port), "--workers", str(args.workers)]
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+            try:
+                _wait_ready(port)
+                res = load(port, paths, args.clients, args.seconds)
+            finally:
+                os.killpg(proc.pid, 15)
+                proc.wait()
+            print(
+                f"{mode:>10} {res['requests']:>9,} {res['rps']:>8,.0f} {res['p50'] * 1e3:>7.1f} "
+                f"{res['p99'] * 1e3:>7.1f} {res['errors']:>6}"
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Signing throughput benchmark.
+
+Compares the per-call path (:func:`pasta.core.crypto.sign_message`, which
+decodes the key and derives the public point on every call) with a reusable
+:class:`pasta.core.crypto.Signer`, in signatures/second, plus the cost of a
+self-check with and without the precomputed verifying key::
+
+    python -m pasta.bench.signing --signatures 1000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from pasta.core.crypto import Signer, generate_keypair, sign_message
+
+
+def _rate(n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return n / elapsed if elapsed else 0.0
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="signatures/second: per-call vs reusable Signer")
+    parser.add_argument("--signatures", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    pair = generate_keypair()
+    priv, pub = pair["private_key"], pair["public_key"]
+    messages = [f"{pub}RECEIVER{i}{float(i)}" for i in range(args.signatures)]
+    raw = [m.encode() for m in messages]
+    signer = Signer(priv)
+    sigs = signer.sign_many(raw)
+    n = len(messages)
+
+    print(f"{'path':>22} {'ops/s':>12}")
+    print(f"{'sign_message':>22} {_rate(n, lambda: [sign_message(priv, m) for m in messages]):>12,.0f}")
+    print(f"{'Signer.sign':>22} {_rate(n, lambda: [signer.sign(m) for m in messages]):>12,.0f}")
+    print(f"{'Signer.sign_many bytes':>22} {_rate(n, lambda: signer.sign_many(raw)):>12,.0f}")
+    plain = Signer(priv, precompute=False)
+    print(f"{'verify (plain key)':>22} {_rate(n, lambda: [plain.verify(m, s) for m, s in zip(raw, sigs)]):>12,.0f}")
+    print(f"{'verify (precomputed)':>22} {_rate(n, lambda: [signer.verify(m, s) for m, s in zip(raw, sigs)]):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Streaming statistics cost and mint-policy backtests.
+
+Measures the per-transaction cost of :meth:`StreamStats.record` (ring
+windows, EWMA, three P² quantiles, per-level windows), then replays a
+synthetic history of ``--txs`` requests – a ``--zero`` share of them
+zero-value, the rest log-normal around 10 PASTA – under several mint
+policies and reports what each would have minted and burnt::
+
+    python -m pasta.bench.stats --txs 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from pasta.node.stats import MintPolicy, StreamStats, compare
+
+POLICIES = {
+    "lifetime": MintPolicy(),
+    "window": MintPolicy(basis="window"),
+    "ewma": MintPolicy(basis="ewma"),
+    "median": MintPolicy(basis="median"),
+    "ewma+burn": MintPolicy(target=8.0, basis="ewma", burn_rate=0.01, mint_limit=None),
+}
+
+
+def history(txs: int, zero: float, seed: int = 1) -> List[Dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "sender_address": "S",
+            "amount": 0.0 if rng.random() < zero else rng.lognormvariate(2.0, 0.8),
+            "mint_amount": 0.0,
+            "level": rng.randrange(3),
+        }
+        for _ in range(txs)
+    ]
+
+
+def update_cost(txs: int) -> float:
+    stats = StreamStats()
+    start = time.perf_counter()
+    for i in range(txs):
+        stats.record(float(i % 97), i % 3)
+    return (time.perf_counter() - start) / txs
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="streaming stats cost + mint policy backtests")
+    parser.add_argument("--txs", type=int, default=200_000)
+    parser.add_argument("--zero", type=float, default=0.3, help="share of zero-value (minting) requests")
+    parser.add_argument("--window", type=int, default=1_000)
+    args = parser.parse_args(argv)
+
+    print(f"StreamStats.record: {update_cost(min(args.txs, 200_000)) * 1e6:.2f} us/tx")
+    blocks = history(args.txs, args.zero)
+    print(f"{'policy':>10} {'seconds':>8} {'minted':>12} {'burned':>10} {'mean':>7} {'window':>7} {'median':>7}")
+    for name, policy in POLICIES.items():
+        start = time.perf_counter()
+        res = compare(blocks, {name: policy}, window=args.window)[name]
+        elapsed = time.perf_counter() - start
+        median = res["quantiles"].get("median", float("nan"))
+        print(
+            f"{name:>10} {elapsed:>8.2f} {res['minted']:>12,.0f} {res['burned']:>10,.0f} "
+            f"{res['lifetime_mean']:>7.2f} {res['window']['mean']:>7.2f} {median:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
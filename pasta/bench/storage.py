@@ -0,0 +1,56 @@
+"""Block log throughput: append rate and cold-start (re-open) time.
+
+    python -m pasta.bench.storage --blocks 1000000 10000000
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+
+from pasta.bench.store import synthetic_blocks
+from pasta.node.storage import BlockLog
+
+
+def bench(n: int, directory: str) -> None:
+    log = BlockLog(directory)
+    start = time.perf_counter()
+    for block in synthetic_blocks(n):
+        log.append(block)
+    log.close()
+    append_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    log = BlockLog(directory)
+    open_s = time.perf_counter() - start
+    start = time.perf_counter()
+    log.row(len(log) // 2)
+    first_read_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    log.height_of(log.row(n - 1)["block_hash"])
+    hash_index_s = time.perf_counter() - start
+    log.close()
+
+    print(
+        f"{n:>11,} {n / append_s:>12,.0f} {open_s:>10.3f} {first_read_ms:>12.2f} {hash_index_s:>13.2f}"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="BlockLog append throughput and cold start")
+    parser.add_argument("--blocks", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--dir", help="directory to write into (default: a temp dir)")
+    args = parser.parse_args(argv)
+
+    print(f"{'blocks':>11} {'append/s':>12} {'open s':>10} {'1st read ms':>12} {'hash map s':>13}")
+    for n in args.blocks:
+        directory = tempfile.mkdtemp(prefix="pasta-bench-", dir=args.dir)
+        try:
+            bench(n, directory)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
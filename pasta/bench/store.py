@@ -0,0 +1,79 @@
+"""Memory footprint of the chain: ``List[Dict]`` vs. the columnar ChainStore.
+
+    python -m pasta.bench.store --blocks 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator
+
+from pasta.core.models import TransactionBlock
+from pasta.node.store import ChainStore
+
+
+def synthetic_blocks(n: int, addresses: int = 1_000) -> Iterator[Dict]:
+    """Yield *n* realistic chain-block dicts drawn from an address pool."""
+    pool = [hashlib.sha512(b"%d" % i).hexdigest()[:88] for i in range(addresses)]
+    prev = "0" * 64
+    for i in range(n):
+        block_hash = hashlib.sha256(b"%d" % i).hexdigest()
+        yield vars(
+            TransactionBlock(
+                sender_address=pool[i % addresses],
+                receiver_address=pool[(i * 7 + 1) % addresses],
+                amount=(i % 1000) / 10,
+                timestamp=1_700_000_000 + i,
+                predecessor_id=prev,
+                predecessor_hash=prev,
+                validated_block_id=prev,
+                validated_block_hash=prev,
+                validator_address=pool[(i * 3) % addresses],
+                block_hash=block_hash,
+                nonce=i,
+                state="C",
+                signature=hashlib.sha512(b"s%d" % i).hexdigest()[:96],
+            )
+        )
+        prev = block_hash
+
+
+def measure(build: Callable[[int], object], n: int):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    keep = build(n)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return current, elapsed
+
+
+def _as_list(n: int):
+    return [dict(b) for b in synthetic_blocks(n)]
+
+
+def _as_store(n: int):
+    store = ChainStore()
+    for b in synthetic_blocks(n):
+        store.append(b)
+    return store
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="List[Dict] vs ChainStore memory")
+    parser.add_argument("--blocks", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    print(f"{'layout':>10} {'MiB':>10} {'bytes/block':>12} {'build s':>9}")
+    for name, build in (("list-dict", _as_list), ("columnar", _as_store)):
+        mem, secs = measure(build, args.blocks)
+        print(f"{name:>10} {mem / 2**20:>10,.1f} {mem / args.blocks:>12,.0f} {secs:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
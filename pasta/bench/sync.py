@@ -0,0 +1,108 @@
+"""Initial chain sync throughput against local stand-in nodes.
+
+Builds a ``--blocks`` chain straight into a block log (difficulty 1, so
+building it costs hashing, not mining; the benchmark lowers the nodes'
+difficulty schedule to match) – or reuses one with ``--source`` –
+serves it from a :class:`Node` on ``--peers`` local HTTP servers, and
+syncs a fresh node from them with each ``--workers`` setting, reporting
+the header stage and overall blocks per second::
+
+    python -m pasta.bench.sync --blocks 1000000 --source /tmp/pasta-sync-src
+
+The stand-in peers share the core with the syncing node here, so the
+numbers are a floor for separate machines.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import List, Tuple
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node.storage import BlockLog
+from pasta.validation import engine as ve
+
+
+def build_source(path: str, blocks: int) -> None:
+    """Write genesis plus *blocks* mined confirmations into a block log at *path*."""
+    log = BlockLog(path)
+    if len(log) == 0:
+        log.append(TransactionBlock.create_genesis())
+    tip = log.tip()
+    start = time.perf_counter()
+    for i in range(len(log) - 1, blocks):
+        block = TransactionBlock(
+            sender_address=f"S{i % 100}",
+            receiver_address=f"R{i % 1000}",
+            amount=float(i % 50),
+            timestamp=tip.timestamp + i,
+            predecessor_id=f"tx{i}",
+            predecessor_hash=tip.block_hash,
+            required_difficulty=1,
+            state="C",
+        )
+        block.nonce, block.block_hash = ve.mine_pow(block, prefix="0", workers=1)
+        block.validator_address = "VALIDATOR"
+        log.append(block)
+        tip = block
+        if (i + 1) % 100_000 == 0:
+            print(f"  built {i + 1:,} blocks in {time.perf_counter() - start:.0f} s")
+    log.close()
+
+
+def serve(node: Node, peers: int) -> Tuple[List[str], List]:
+    from werkzeug.serving import make_server
+
+    servers = [make_server("127.0.0.1", 0, node.create_flask_app(), threaded=True) for _ in range(peers)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return [f"http://127.0.0.1:{s.server_port}" for s in servers], servers
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="header-first chain sync throughput")
+    parser.add_argument("--blocks", type=int, default=200_000)
+    parser.add_argument("--source", help="block log directory to build or reuse (default: a temp dir)")
+    parser.add_argument("--peers", type=int, default=2, help="HTTP servers serving the source node")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--batch", type=int, default=2_000)
+    args = parser.parse_args(argv)
+    # Syncing nodes check every block against the schedule: match the source
+    ve.DIFFICULTY_PREFIX, ve.MIN_DIFFICULTY = "0", 1
+
+    tmp = tempfile.mkdtemp(prefix="pasta-sync-")
+    source = args.source or os.path.join(tmp, "source")
+    try:
+        start = time.perf_counter()
+        build_source(source, args.blocks)
+        src = Node(data_dir=source)
+        print(f"source: {len(src.blockchain) - 1:,} blocks, ready in {time.perf_counter() - start:.1f} s")
+        urls, servers = serve(src, args.peers)
+        genesis = src.blockchain.row(0)
+
+        print(f"{'workers':>7} {'blocks':>9} {'headers s':>9} {'total s':>8} {'blocks/s':>9} {'MB':>7} {'retries':>7}")
+        for workers in args.workers:
+            dst_dir = os.path.join(tmp, f"dst-{workers}")
+            dst = Node(data_dir=dst_dir, genesis=genesis)
+            res = dst.sync_from(urls, batch=args.batch, workers=workers)
+            assert dst.blockchain.tip().block_hash == src.blockchain.tip().block_hash
+            print(
+                f"{workers:>7} {res['blocks']:>9,} {res['headers_seconds']:>9.2f} {res['seconds']:>8.1f} "
+                f"{res['blocks_per_second']:>9,.0f} {res['bytes'] / 2**20:>7.1f} {res['retries']:>7}"
+            )
+            dst.close()
+            shutil.rmtree(dst_dir)
+        for server in servers:
+            server.shutdown()
+        src.close()
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Signature verification throughput benchmark.
+
+Reports verifications/second for the original one-call-per-signature path
+(fresh ``VerifyingKey`` every time), for :class:`pasta.core.verify.BatchVerifier`
+at each worker count with a cold memo, and for a re-check of the same batch
+(memo hits, as when a transaction moves from State A to B to C)::
+
+    python -m pasta.bench.verify --checks 2000 --keys 20 --workers 1 2 4
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import List
+
+import base58
+import ecdsa
+
+from pasta.core.crypto import generate_keypair, sign_message
+from pasta.core.verify import BatchVerifier, Check
+
+
+def sample_checks(n: int, keys: int) -> List[Check]:
+    """*n* valid signatures from *keys* distinct senders."""
+    pairs = [generate_keypair() for _ in range(keys)]
+    checks = []
+    for i in range(n):
+        pair = pairs[i % keys]
+        msg = f"{pair['public_key']}RECEIVER{i}{float(i)}"
+        checks.append((pair["public_key"], msg, sign_message(pair["private_key"], msg)))
+    return checks
+
+
+def _per_call(public_key: str, message: str, signature: str) -> bool:
+    # The pre-batch path: parse the key on every call
+    vk = ecdsa.VerifyingKey.from_string(base58.b58decode(public_key), curve=ecdsa.SECP256k1)
+    try:
+        return vk.verify(base58.b58decode(signature), message.encode())
+    except ecdsa.BadSignatureError:
+        return False
+
+
+def _rate(n: int, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    return n / elapsed if elapsed else 0.0
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="signature verifications/second")
+    parser.add_argument("--checks", type=int, default=2_000, help="signatures per batch")
+    parser.add_argument("--keys", type=int, default=20, help="distinct signing keys")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="worker counts to try")
+    args = parser.parse_args(argv)
+
+    checks = sample_checks(args.checks, args.keys)
+    print(f"{'path':>18} {'verif/s':>12}")
+    print(f"{'per-call':>18} {_rate(len(checks), lambda: [_per_call(*c) for c in checks]):>12,.0f}")
+    for n in args.workers:
+        verifier = BatchVerifier(workers=n)
+        if n != 1:
+            verifier.verify_many(sample_checks(verifier.min_parallel, 1))  # warm-up: start the workers
+        cold = _rate(len(checks), lambda: verifier.verify_many(checks))
+        warm = _rate(len(checks), lambda: verifier.verify_many(checks))
+        print(f"{f'batch x{n} cold':>18} {cold:>12,.0f}")
+        print(f"{f'batch x{n} memo':>18} {warm:>12,.0f}")
+        verifier.close()
+
+
+if __name__ == "__main__":
+    main()
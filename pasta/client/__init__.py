@@ -0,0 +1,20 @@
+"""Python client for a node's REST API.
+
+``NodeClient`` blocks and pools keep-alive connections on a
+``requests.Session``; ``AsyncNodeClient`` does the same on asyncio.  Both
+time out every call, retry with backoff (``RetryPolicy``) and raise
+``ClientError`` once a call has failed for good::
+
+    from pasta.client import NodeClient
+
+    with NodeClient("http://localhost:5000") as node:
+        node.create_transaction(payload)
+        print(node.balance(address)["balance"])
+
+``fan_out`` / ``async_fan_out`` send one call to several nodes at once.
+"""
+from pasta.client.aio import AsyncNodeClient, async_fan_out
+from pasta.client.base import NO_RETRY, ClientError, RetryPolicy
+from pasta.client.session import NodeClient, fan_out
+
+__all__ = ["AsyncNodeClient", "ClientError", "NO_RETRY", "NodeClient", "RetryPolicy", "async_fan_out", "fan_out"]
@@ -0,0 +1,131 @@
+"""asyncio client on a pooled, keep-alive ``httpx.AsyncClient``.
+
+:class:`AsyncNodeClient` keeps up to ``concurrency`` connections open per
+node; further calls wait for a free connection rather than failing.  An
+httpx pool belongs to the event loop that opened it, so the client opens
+its pool lazily and replaces it when it is used from another loop (a
+second ``asyncio.run``).  Calls share the blocking client's endpoints and
+:class:`~pasta.client.base.RetryPolicy`::
+
+    async with AsyncNodeClient("http://localhost:5000") as node:
+        balances = await asyncio.gather(*(node.balance(a) for a in addresses))
+
+:func:`async_fan_out` runs one call against several nodes at once.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from pasta.client.base import ClientError, Endpoints, RetryPolicy, chunks, dumps, find_transaction, loads
+
+__all__ = ["AsyncNodeClient", "async_fan_out"]
+
+# Failures raised before any byte of the request reached the node
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class AsyncNodeClient(Endpoints):
+    """asyncio client for the node at *base_url*."""
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:5000",
+        timeout: float = 10.0,
+        retry: RetryPolicy = RetryPolicy(),
+        concurrency: int = 32,
+    ) -> None:
+        if urlsplit(base_url).scheme not in ("http", "https"):
+            raise ValueError(f"unsupported URL {base_url!r}")
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retry = retry
+        self.concurrency = concurrency
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.counters = {"requests": 0, "retries": 0}
+
+    def __repr__(self) -> str:
+        return f"AsyncNodeClient({self.base_url!r})"
+
+    async def __aenter__(self) -> "AsyncNodeClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._loop is asyncio.get_running_loop():
+            await client.aclose()  # a pool from a finished loop is simply dropped
+
+    def _session(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, pool=None),  # waiting for a free connection is not an error
+                limits=limits,
+                headers={"User-Agent": "pasta-client", "Accept": "application/json"},
+            )
+            self._loop = loop
+        return self._client
+
+    # ------------------------------------------------------------------
+    async def _call(self, method: str, path: str, params: Optional[Dict] = None, body: Any = None) -> Any:
+        data = None if body is None else dumps(body)
+        headers = None if body is None else {"Content-Type": "application/json"}
+        for attempt in range(self.retry.retries + 1):
+            self.counters["requests"] += 1
+            last = attempt == self.retry.retries
+            try:
+                resp = await self._session().request(method, path, params=params, content=data, headers=headers)
+            except httpx.TransportError as exc:
+                if last or not self.retry.retryable(method, sent=not isinstance(exc, _NOT_SENT)):
+                    raise ClientError(f"{method} {self.base_url}{path}: {exc!r}", retried=attempt > 0) from exc
+                delay = self.retry.delay(attempt)
+            else:
+                is_json = resp.headers.get("content-type", "").startswith("application/json")
+                value = loads(resp.content) if is_json else resp.text
+                if resp.status_code < 400:
+                    return value
+                if last or not self.retry.retryable(method, resp.status_code):
+                    raise ClientError(f"{method} {path}: {resp.status_code} {str(value)[:200]}", resp.status_code, value, attempt > 0)
+                delay = self.retry.delay(attempt, resp.headers.get("retry-after"))
+            self.counters["retries"] += 1
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def create_transaction(self, payload: Dict) -> Dict:
+        """POST one payload; a 409 on a retry counts only if the node holds the transaction."""
+        try:
+            return await super().create_transaction(payload)
+        except ClientError as exc:
+            if exc.status != 409 or not exc.retried:
+                raise
+            tx = find_transaction(await self.address_txs(payload["sender"]), payload)
+            if tx is None:
+                raise
+            return {"message": "State A created", "tx": tx}
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+    async def create_transactions(self, payloads: Sequence[Dict]) -> List[Dict]:
+        """Submit any number of payloads, up to ``concurrency`` batch requests in flight."""
+        pages = await asyncio.gather(*(self.create_batch(chunk) for chunk in chunks(payloads)))
+        return [result for page in pages for result in page["results"]]
+
+    async def pipeline(self, calls: Sequence[Tuple[Any, ...]], return_exceptions: bool = False) -> List[Any]:
+        """Run ``(method_name, *args)`` calls concurrently; results in call order."""
+        return await asyncio.gather(*(getattr(self, name)(*args) for name, *args in calls), return_exceptions=return_exceptions)
+
+
+async def async_fan_out(clients: Sequence[AsyncNodeClient], name: str, *args: Any) -> Dict[str, Any]:
+    """Await ``client.<name>(*args)`` on every client at once; ``{base_url: result or ClientError}``."""
+    results = await asyncio.gather(*(getattr(c, name)(*args) for c in clients), return_exceptions=True)
+    return {c.base_url: r for c, r in zip(clients, results)}
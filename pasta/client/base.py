@@ -0,0 +1,170 @@
+"""Pieces shared by the blocking and the asyncio client.
+
+:class:`Endpoints` maps the node's REST routes to methods.  Each one only
+builds a request and hands it to the client's ``_call(method, path,
+params, body)``, so the same methods return a value on
+:class:`~pasta.client.session.NodeClient` and an awaitable on
+:class:`~pasta.client.aio.AsyncNodeClient`.
+"""
+from __future__ import annotations
+
+import json
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Union
+from urllib.parse import quote
+
+try:  # optional dependency, as on the node
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+__all__ = [
+    "MAX_BATCH_SIZE",
+    "NO_RETRY",
+    "ClientError",
+    "Endpoints",
+    "RetryPolicy",
+    "chunks",
+    "dumps",
+    "find_transaction",
+    "loads",
+]
+
+MAX_BATCH_SIZE = 10_000  # transactions per /transactions/batch request (the node's limit)
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class ClientError(Exception):
+    """A request failed for good: ``status`` is the HTTP code, or ``None`` if the node was unreachable.
+
+    ``retried`` is true when the failing answer came after earlier attempts.
+    """
+
+    def __init__(self, message: str, status: Optional[int] = None, body: Any = None, retried: bool = False) -> None:
+        super().__init__(message)
+        self.status = status
+        self.body = body
+        self.retried = retried
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter: ``backoff * 2**attempt``, capped at ``max_backoff``.
+
+    Reads are retried on transport errors and on ``statuses``.  Writes are
+    only retried when the connection could not be opened (nothing was sent)
+    or the node answered 503, which it uses for work it did not accept
+    (full admission queue or mempool, or an admission that timed out).
+
+    A 409 on such a retry does not prove that an earlier attempt got in.
+    The node forgets the hash of every submission it rejected, and an
+    attempt that timed out may still be in flight.  The clients'
+    ``create_transaction`` therefore looks the transaction up on the node
+    (:func:`find_transaction`) before it reports success, and otherwise
+    raises the 409.
+    """
+
+    retries: int = 3
+    backoff: float = 0.1
+    max_backoff: float = 2.0
+    jitter: float = 0.2  # +- fraction of each delay
+    statuses: FrozenSet[int] = frozenset({502, 503, 504})
+
+    def retryable(self, method: str, status: Optional[int] = None, sent: bool = True) -> bool:
+        if status is not None:
+            return status in self.statuses and (method in SAFE_METHODS or status == 503)
+        return method in SAFE_METHODS or not sent
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass  # an HTTP date: use our own schedule
+        base = min(self.backoff * 2**attempt, self.max_backoff)
+        return base * (1 + random.uniform(-self.jitter, self.jitter))
+
+
+NO_RETRY = RetryPolicy(retries=0)
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj, separators=(",", ":")).encode()
+
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def find_transaction(txs: Dict[str, List[Dict]], payload: Dict) -> Optional[Dict]:
+    """The entry for the signed *payload* in an :meth:`Endpoints.address_txs` answer, if any."""
+    signature = payload.get("signature")
+    if not signature:
+        return None  # unsigned transactions carry no identity to match
+    for tx in txs.get("pending", []) + txs.get("confirmed", []):
+        if (tx.get("signature"), tx.get("sender_address"), tx.get("receiver_address")) == (
+            signature,
+            payload.get("sender"),
+            payload.get("receiver"),
+        ):
+            return tx
+    return None
+
+
+def chunks(items: Sequence, size: int = MAX_BATCH_SIZE) -> List[Sequence]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _ref(role: str, ref: Union[int, str]) -> Dict[str, Union[int, str]]:
+    # Mempool entries are addressed by stable tx ID or legacy index
+    return {f"{role}_id": ref} if isinstance(ref, str) else {f"{role}_index": ref}
+
+
+class Endpoints:
+    """The node's REST API; subclasses supply ``_call``."""
+
+    def _call(self, method: str, path: str, params: Optional[Dict] = None, body: Any = None):
+        raise NotImplementedError
+
+    # -- chain -------------------------------------------------------------
+    def blockchain(self, from_height: Optional[int] = None, limit: Optional[int] = None):
+        """The full chain, or one page ``{"blocks", "next_from_height", ...}`` with *from_height*/*limit*."""
+        params = {k: v for k, v in (("from_height", from_height), ("limit", limit)) if v is not None}
+        return self._call("GET", "/blockchain", params or None)
+
+    def block(self, block_hash: str):
+        return self._call("GET", f"/block/{quote(block_hash, safe='')}")
+
+    def balance(self, address: str):
+        """``{"address", "balance", "height"}``."""
+        return self._call("GET", f"/balance/{quote(address, safe='')}")
+
+    def address_txs(self, address: str):
+        return self._call("GET", f"/address/{quote(address, safe='')}/txs")
+
+    def stats(self):
+        return self._call("GET", "/stats")
+
+    def peers(self):
+        return self._call("GET", "/peers")
+
+    # -- mempool -----------------------------------------------------------
+    def mempool(self):
+        return self._call("GET", "/mempool")
+
+    def mempool_tx(self, tx_id: str):
+        return self._call("GET", f"/mempool/{quote(tx_id, safe='')}")
+
+    def create_transaction(self, payload: Dict):
+        """POST one ``{"sender", "receiver", "amount", "timestamp", "signature"}`` payload."""
+        return self._call("POST", "/create_transaction", body=payload)
+
+    def create_batch(self, payloads: Sequence[Dict]):
+        """POST up to :data:`MAX_BATCH_SIZE` payloads; ``{"accepted", "rejected", "results"}``."""
+        return self._call("POST", "/transactions/batch", body=list(payloads))
+
+    def advance_b(self, my: Union[int, str], target: Union[int, str]):
+        return self._call("POST", "/advance_b", body={**_ref("my", my), **_ref("target", target)})
+
+    def advance_c(self, target: Union[int, str], validator: str):
+        return self._call("POST", "/advance_c", body={**_ref("target", target), "validator": validator})
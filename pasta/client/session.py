@@ -0,0 +1,155 @@
+"""Blocking client on a pooled, keep-alive ``requests.Session``.
+
+One :class:`NodeClient` per node holds up to ``pool_size`` open
+connections, so consecutive calls skip the TCP handshake and concurrent
+calls from several threads (:meth:`NodeClient.pipeline`) do not queue
+behind each other.  Every call has a timeout and is retried with backoff
+per the client's :class:`~pasta.client.base.RetryPolicy`; a call that
+still fails raises :class:`~pasta.client.base.ClientError`.
+"""
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from pasta.client.base import ClientError, Endpoints, RetryPolicy, chunks, dumps, find_transaction, loads
+
+__all__ = ["NodeClient", "fan_out"]
+
+_Call = Tuple[Any, ...]  # ("method_name", *args)
+
+
+def _decode(resp: requests.Response) -> Any:
+    if resp.headers.get("Content-Type", "").startswith("application/json"):
+        return loads(resp.content)
+    return resp.text
+
+
+def _never_sent(exc: requests.RequestException) -> bool:
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    return isinstance(reason, NewConnectionError)  # refused / unreachable before anything was written
+
+
+class NodeClient(Endpoints):
+    """Client for the node at *base_url*, e.g. ``NodeClient("http://localhost:5000")``."""
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:5000",
+        timeout: float = 10.0,
+        retry: RetryPolicy = RetryPolicy(),
+        pool_size: int = 16,
+        session: Optional[requests.Session] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retry = retry
+        self.pool_size = pool_size
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)  # retries are ours, not urllib3's
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": "pasta-client", "Accept": "application/json"})
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.counters = {"requests": 0, "retries": 0}
+
+    def __repr__(self) -> str:
+        return f"NodeClient({self.base_url!r})"
+
+    def __enter__(self) -> "NodeClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self.session.close()
+
+    # ------------------------------------------------------------------
+    def _call(self, method: str, path: str, params: Optional[Dict] = None, body: Any = None) -> Any:
+        url = self.base_url + path
+        data = None if body is None else dumps(body)
+        headers = None if body is None else {"Content-Type": "application/json"}
+        for attempt in range(self.retry.retries + 1):
+            self.counters["requests"] += 1
+            last = attempt == self.retry.retries
+            try:
+                resp = self.session.request(method, url, params=params, data=data, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if last or not self.retry.retryable(method, sent=not _never_sent(exc)):
+                    raise ClientError(f"{method} {url}: {exc}", retried=attempt > 0) from exc
+                delay = self.retry.delay(attempt)
+            else:
+                if resp.status_code < 400:
+                    return _decode(resp)
+                if last or not self.retry.retryable(method, resp.status_code):
+                    raise ClientError(
+                        f"{method} {path}: {resp.status_code} {resp.text[:200]}", resp.status_code, _decode(resp), attempt > 0
+                    )
+                delay = self.retry.delay(attempt, resp.headers.get("Retry-After"))
+            self.counters["retries"] += 1
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def create_transaction(self, payload: Dict) -> Dict:
+        """POST one payload; a 409 on a retry counts only if the node holds the transaction."""
+        try:
+            return super().create_transaction(payload)
+        except ClientError as exc:
+            if exc.status != 409 or not exc.retried:
+                raise
+            tx = find_transaction(self.address_txs(payload["sender"]), payload)
+            if tx is None:
+                raise
+            return {"message": "State A created", "tx": tx}
+
+    # ------------------------------------------------------------------
+    # Batches
+    # ------------------------------------------------------------------
+    def create_transactions(self, payloads: Sequence[Dict]) -> List[Dict]:
+        """Submit any number of payloads through ``/transactions/batch``; one result per payload."""
+        results: List[Dict] = []
+        for chunk in chunks(payloads):
+            results.extend(self.create_batch(chunk)["results"])
+        return results
+
+    def iter_blocks(self, from_height: int = 0, page: int = 1_000) -> Iterator[Dict]:
+        """Every block from *from_height* on, one page per request."""
+        while from_height is not None:
+            resp = self.blockchain(from_height=from_height, limit=page)
+            yield from resp["blocks"]
+            from_height = resp["next_from_height"]
+
+    def pipeline(self, calls: Sequence[_Call], return_exceptions: bool = False) -> List[Any]:
+        """Run ``(method_name, *args)`` calls concurrently over the pool; results in call order.
+
+        ``client.pipeline([("balance", a) for a in addresses])``
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.pool_size, thread_name_prefix="pasta-client")
+        futures = [self._pool.submit(getattr(self, name), *args) for name, *args in calls]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except ClientError as exc:
+                if not return_exceptions:
+                    raise
+                results.append(exc)
+        return results
+
+
+def fan_out(clients: Sequence[NodeClient], name: str, *args: Any) -> Dict[str, Any]:
+    """Call ``client.<name>(*args)`` on every client at once; ``{base_url: result or ClientError}``."""
+    with ThreadPoolExecutor(max(1, len(clients)), thread_name_prefix="pasta-fanout") as pool:
+        futures = {c.base_url: pool.submit(getattr(c, name), *args) for c in clients}
+    return {url: (f.exception() or f.result()) for url, f in futures.items()}
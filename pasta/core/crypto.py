@@ -1,6 +1,11 @@
 """Basic crypto helpers using ecdsa + base58 (prototype only)."""
+from functools import lru_cache
+from typing import Iterable, List, Union
+
 import ecdsa, base58
 
+VK_CACHE_SIZE = 4096  # parsed public keys kept per process
+
 def generate_keypair() -> dict:
     """Generate secp256k1 keypair, return dict with private_key and public_key (base58)."""
     priv = ecdsa.SigningKey.generate(curve=ecdsa.SECP256k1)
@@ -10,23 +15,78 @@ def generate_keypair() -> dict:
     return {"private_key": priv_b58, "public_key": pub_b58}
 
 
-def sign_message(private_key_b58: str, message: str) -> str:
+def sign_message(private_key_b58: str, message: Union[str, bytes]) -> str:
     """Sign arbitrary message string with base58-encoded secp256k1 private key.
 
     Returns base58-encoded DER signature so it can be easily transported as text.
+    For many signatures with the same key use :class:`Signer` instead.
     """
-    priv_bytes = base58.b58decode(private_key_b58)
-    sk = ecdsa.SigningKey.from_string(priv_bytes, curve=ecdsa.SECP256k1)
-    signature = sk.sign(message.encode())  # default SHA-1 inside ecdsa lib is acceptable for toy
-    return base58.b58encode(signature).decode()
+    return Signer(private_key_b58, precompute=False).sign(message)
+
+
+class Signer:
+    """Reusable signing key for hot wallets.
+
+    The base58 key is decoded and the public point derived once, instead of
+    on every :func:`sign_message` call.  With ``precompute=True`` the
+    verifying key also builds ecdsa's precomputation table so :meth:`verify`
+    (e.g. a self-check before broadcasting) is several times faster.
+    Signatures are interchangeable with :func:`sign_message`.
+    """
+
+    def __init__(self, private_key_b58: str, precompute: bool = True) -> None:
+        priv_bytes = base58.b58decode(private_key_b58)
+        self._sk = ecdsa.SigningKey.from_string(priv_bytes, curve=ecdsa.SECP256k1)
+        self._vk = self._sk.get_verifying_key()
+        if precompute:
+            self._vk.precompute()
+        self.public_key = base58.b58encode(self._vk.to_string()).decode()
+
+    def sign_bytes(self, message: bytes) -> bytes:
+        """Raw signature over *message* (no base58)."""
+        return self._sk.sign(message)  # default SHA-1 inside ecdsa lib is acceptable for toy
+
+    def sign(self, message: Union[str, bytes]) -> str:
+        if isinstance(message, str):
+            message = message.encode()
+        return base58.b58encode(self.sign_bytes(message)).decode()
 
+    def sign_many(self, messages: Iterable[Union[str, bytes]]) -> List[str]:
+        """Sign every message; signatures in input order."""
+        return [self.sign(m) for m in messages]
 
-def verify_message(public_key_b58: str, message: str, signature_b58: str) -> bool:
-    """Verify message signature (matching sign_message)."""
+    def verify(self, message: Union[str, bytes], signature_b58: str) -> bool:
+        if isinstance(message, str):
+            message = message.encode()
+        try:
+            return self._vk.verify(base58.b58decode(signature_b58), message)
+        except (ecdsa.BadSignatureError, ValueError):
+            return False
+
+
+def transaction_message(sender: str, receiver: str, amount: float, timestamp: float) -> str:
+    """The string a wallet signs for a transaction (same layout as pasta-cli)."""
+    return f"{sender}{receiver}{amount}{timestamp}"
+
+
+@lru_cache(maxsize=VK_CACHE_SIZE)
+def verifying_key(public_key_b58: str) -> ecdsa.VerifyingKey:
+    """Parse a base58 public key (address) once; repeat senders hit the LRU."""
     pub_bytes = base58.b58decode(public_key_b58)
-    vk = ecdsa.VerifyingKey.from_string(pub_bytes, curve=ecdsa.SECP256k1)
+    return ecdsa.VerifyingKey.from_string(pub_bytes, curve=ecdsa.SECP256k1)
+
+
+def verify_message(public_key_b58: str, message: Union[str, bytes], signature_b58: str) -> bool:
+    """Verify message signature (matching sign_message).
+
+    Malformed keys or signatures count as a failed verification.
+    """
+    if isinstance(message, str):
+        message = message.encode()
     try:
-        vk.verify(base58.b58decode(signature_b58), message.encode())
+        vk = verifying_key(public_key_b58)
+        vk.verify(base58.b58decode(signature_b58), message)
         return True
-    except ecdsa.BadSignatureError:
-        return False 
\ No newline at end of file
+    except (ecdsa.BadSignatureError, ecdsa.MalformedPointError, ValueError):
+        return False
+ 
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""Canonical, versioned binary encoding of a :class:`TransactionBlock`.
+
+Hashing and PoW used to run over ``str(sorted(asdict(block).items()))``,
+which allocates heavily and depends on Python's ``repr`` of floats.  The
+encoding below is compact, independent of Python formatting and fixed by
+this module alone.
+
+Layout (version 1, big-endian)::
+
+    u8   version
+    i64  timestamp
+    i32  level
+    i64  amount                   ┐
+    i64  sender_balance_before    │
+    i64  sender_balance_after     │ fixed point,
+    i64  receiver_balance_before  │ AMOUNT_SCALE units
+    i64  receiver_balance_after   │ per PASTA
+    i64  mint_amount              │
+    i64  average_tx_size          ┘
+    i32  required_difficulty
+    i64  storage_requirement
+    str  sender_address, receiver_address, predecessor_id, predecessor_hash,
+         validated_block_id, validated_block_hash, validator_address, state,
+         signature
+    str  signed_amount, signed_timestamp          (version 2 only)
+    ---- proof section (not hashed) ----
+    str  block_hash
+    i64  nonce (-1 = None)
+
+``str`` is a u16 byte length followed by UTF-8; length ``0xFFFF`` encodes
+``None``.  Everything up to the proof section is the block's *hashed
+payload*: :meth:`TransactionBlock.compute_hash` and the PoW both run over it.
+
+Version 2 appends the amount and timestamp text of a signed transaction's
+message (see :func:`pasta.core.crypto.transaction_message`), so the
+signature can be checked again by any node.  Blocks without them are still
+written as version 1, which keeps their hashes unchanged.
+"""
+from __future__ import annotations
+
+import math
+import struct
+from typing import Any, Dict, Mapping, Union
+
+__all__ = [
+    "AMOUNT_SCALE",
+    "ENCODING_VERSION",
+    "HASHED_FIELDS",
+    "check_fields",
+    "decode_block",
+    "encode_block",
+    "hashed_payload",
+]
+
+ENCODING_VERSION = 2
+AMOUNT_SCALE = 100_000_000  # 1 PASTA = 10^8 base units
+
+_AMOUNTS = (
+    "amount",
+    "sender_balance_before",
+    "sender_balance_after",
+    "receiver_balance_before",
+    "receiver_balance_after",
+    "mint_amount",
+    "average_tx_size",
+)
+_STRINGS = (
+    "sender_address",
+    "receiver_address",
+    "predecessor_id",
+    "predecessor_hash",
+    "validated_block_id",
+    "validated_block_hash",
+    "validator_address",
+    "state",
+    "signature",
+)
+_SIGNED = ("signed_amount", "signed_timestamp")  # version 2
+HASHED_FIELDS = frozenset(("timestamp", "level", "required_difficulty", "storage_requirement") + _AMOUNTS + _STRINGS + _SIGNED)
+
+_INTS = ("timestamp", "level", "required_difficulty", "storage_requirement")
+_REQUIRED = frozenset(("sender_address", "receiver_address", "amount", "timestamp", "predecessor_id", "predecessor_hash"))
+
+_HEAD = struct.Struct(">Bqi7qiq")
+_LEN = struct.Struct(">H")
+_NONCE = struct.Struct(">q")
+_NONE_LEN = 0xFFFF
+_NONE = _LEN.pack(_NONE_LEN)
+
+
+def _fixed(value: float) -> int:
+    return round(value * AMOUNT_SCALE)
+
+
+def _pack_str(value: Any) -> bytes:
+    if value is None:
+        return _NONE
+    raw = str(value).encode()
+    if len(raw) >= _NONE_LEN:
+        raise ValueError(f"string field too long for encoding ({len(raw)} bytes)")
+    return _LEN.pack(len(raw)) + raw
+
+
+def _fields(block: Union[Mapping[str, Any], Any]) -> Mapping[str, Any]:
+    return block if isinstance(block, Mapping) else vars(block)
+
+
+def hashed_payload(block: Union[Mapping[str, Any], Any]) -> bytes:
+    """Return the bytes covered by the block hash and the PoW."""
+    f = _fields(block)
+    signed = [f.get(name) for name in _SIGNED]
+    version = 1 if signed == [None, None] else 2
+    head = _HEAD.pack(
+        version,
+        int(f["timestamp"]),
+        f.get("level", 0),
+        *[_fixed(f.get(name, 0.0)) for name in _AMOUNTS],
+        f.get("required_difficulty", 1),
+        f.get("storage_requirement", 0),
+    )
+    strings = [f.get(name) for name in _STRINGS]
+    if version == 2:
+        strings += signed
+    return head + b"".join([_pack_str(value) for value in strings])
+
+
+def encode_block(block: Union[Mapping[str, Any], Any]) -> bytes:
+    """Full encoding: hashed payload followed by the proof section."""
+    f = _fields(block)
+    nonce = f.get("nonce")
+    return hashed_payload(f) + _pack_str(f.get("block_hash")) + _NONCE.pack(-1 if nonce is None else nonce)
+
+
+def check_fields(block: Mapping[str, Any]) -> Dict[str, Any]:
+    """Type-check untrusted ``TransactionBlock`` kwargs (a peer's block or entry).
+
+    Integers must be ``int``, amounts finite numbers (returned as ``float``),
+    text fields ``str`` or ``None``, and the whole block must fit the
+    encoding.  Returns a checked copy; raises ``ValueError`` otherwise.
+    """
+    if not isinstance(block, Mapping):
+        raise ValueError("block must be an object")
+    unknown = set(block) - set(_INTS + _AMOUNTS + _STRINGS + _SIGNED + ("block_hash", "nonce"))
+    if unknown:
+        raise ValueError(f"unknown fields {sorted(unknown)}")
+    missing = _REQUIRED - set(block)
+    if missing:
+        raise ValueError(f"missing fields {sorted(missing)}")
+    out = dict(block)
+    for name in _INTS + ("nonce",):
+        value = out.get(name, 0)
+        if name == "nonce" and value is None:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"{name} must be a non-negative integer")
+    for name in _AMOUNTS:
+        if name not in out:
+            continue
+        value = out[name]
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+            raise ValueError(f"{name} must be a finite number")
+        out[name] = float(value)
+    for name in _STRINGS + _SIGNED + ("block_hash",):
+        if not isinstance(out.get(name), (str, type(None))):
+            raise ValueError(f"{name} must be a string")
+    try:
+        encode_block(out)
+    except (struct.error, ValueError, OverflowError) as exc:
+        raise ValueError(f"block does not fit the encoding: {exc}") from None
+    return out
+
+
+def decode_block(data: Union[bytes, memoryview]) -> Dict[str, Any]:
+    """Inverse of :func:`encode_block`; returns plain ``TransactionBlock`` kwargs.
+
+    Amounts come back rounded to ``1 / AMOUNT_SCALE`` PASTA.
+    """
+    version, timestamp, level, *rest = _HEAD.unpack_from(data, 0)
+    if not 1 <= version <= ENCODING_VERSION:
+        raise ValueError(f"unsupported block encoding version {version}")
+    out: Dict[str, Any] = {"timestamp": timestamp, "level": level}
+    for name, value in zip(_AMOUNTS, rest):
+        out[name] = value / AMOUNT_SCALE
+    out["required_difficulty"], out["storage_requirement"] = rest[-2:]
+
+    pos = _HEAD.size
+    out.update(dict.fromkeys(_SIGNED))
+    for name in _STRINGS + (_SIGNED if version == 2 else ()) + ("block_hash",):
+        (n,) = _LEN.unpack_from(data, pos)
+        pos += 2
+        if n == _NONE_LEN:
+            out[name] = None
+        else:
+            out[name] = bytes(data[pos : pos + n]).decode()
+            pos += n
+    (nonce,) = _NONCE.unpack_from(data, pos)
+    out["nonce"] = None if nonce < 0 else nonce
+    return out
@@ -1,11 +1,15 @@
 from __future__ import annotations
 import hashlib
 import time
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import Optional
 
+from pasta.core.encoding import HASHED_FIELDS, encode_block, hashed_payload
+
 @dataclass
 class TransactionBlock:
+    # Hash cache lives in a slot so it never shows up in __dict__/asdict()
+    __slots__ = ("_hash_cache", "__dict__")
     # Transaction Data
     sender_address: str
     receiver_address: str
@@ -45,13 +49,30 @@ class TransactionBlock:
 
     # Extra: signature (not in original spec block but necessary)
     signature: Optional[str] = None
+    # Amount and timestamp as they appear in the signed message; amount and
+    # timestamp above are the minted amount and the node's arrival time
+    signed_amount: Optional[str] = None
+    signed_timestamp: Optional[str] = None
+
+    def __setattr__(self, name, value) -> None:
+        object.__setattr__(self, name, value)
+        if name in HASHED_FIELDS:
+            object.__setattr__(self, "_hash_cache", None)
+
+    def canonical_bytes(self) -> bytes:
+        """Hashed payload in the canonical binary encoding (see pasta.core.encoding)."""
+        return hashed_payload(self)
+
+    def to_bytes(self) -> bytes:
+        """Full canonical encoding including block_hash and nonce."""
+        return encode_block(self)
 
     def compute_hash(self) -> str:
-        data = asdict(self).copy()
-        data.pop("block_hash", None)
-        data.pop("nonce", None)
-        serialized = str(sorted(data.items())).encode()
-        return hashlib.sha256(serialized).hexdigest()
+        cached = getattr(self, "_hash_cache", None)
+        if cached is None:
+            cached = hashlib.sha256(hashed_payload(self)).hexdigest()
+            object.__setattr__(self, "_hash_cache", cached)
+        return cached
 
     @classmethod
     def create_genesis(cls) -> "TransactionBlock":
@@ -0,0 +1,181 @@
+"""Batch signature verification.
+
+:func:`pasta.core.crypto.verify_message` checks one signature at a time in
+pure Python (a few milliseconds each).  :class:`BatchVerifier` takes many
+``(public_key, message, signature)`` triples and returns the results in
+order:
+
+* results already known are answered from a memo keyed by
+  ``(sha256(public_key || message), signature)`` – the signed payload of a
+  transaction never changes while it moves through States A→B→C, so it is
+  verified once no matter how often it is re-checked;
+* duplicates inside a batch are verified once;
+* the remaining checks are cut into chunks and spread over a pool of worker
+  processes (each keeps its own LRU of parsed ``VerifyingKey`` objects, see
+  :func:`pasta.core.crypto.verifying_key`).  Small batches, or a verifier
+  created with ``workers=1``, run inline and skip the process hop.
+
+Worker processes use the *spawn* start method, like the PoW miner, so the
+pool is safe to use from the threaded Flask server.
+"""
+from __future__ import annotations
+
+import atexit
+import hashlib
+import multiprocessing as mp
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from pasta.core.crypto import verify_message
+
+__all__ = ["BatchVerifier", "VerifiedCache", "get_verifier", "verify_batch"]
+
+Check = Tuple[str, Union[str, bytes], str]  # (public_key_b58, message, signature_b58)
+_Key = Tuple[bytes, str]
+
+DEFAULT_CHUNK_SIZE = 64
+MIN_PARALLEL = 32  # below this many uncached checks the pool costs more than it saves
+
+
+def check_key(public_key: str, message: Union[str, bytes], signature: str) -> _Key:
+    """Memo key of one check: digest of what was signed, plus the signature."""
+    if isinstance(message, str):
+        message = message.encode()
+    return hashlib.sha256(public_key.encode() + b"\0" + message).digest(), signature
+
+
+class VerifiedCache:
+    """Thread-safe LRU of ``check_key -> bool``."""
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[_Key, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: _Key) -> Optional[bool]:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: _Key, result: bool) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _verify_chunk(checks: List[Check]) -> List[bool]:
+    return [verify_message(*check) for check in checks]
+
+
+class BatchVerifier:
+    """Memoising, process-parallel signature verifier.
+
+    The pool is created lazily on first use and kept alive between calls.
+    ``workers=None`` (or 0) uses every CPU core.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        cache_size: int = 100_000,
+        min_parallel: int = MIN_PARALLEL,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.min_parallel = min_parallel
+        self.cache = VerifiedCache(cache_size)
+
+        self._ctx = mp.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._ctx)
+            return self._pool
+
+    def verify(self, public_key: str, message: Union[str, bytes], signature: str) -> bool:
+        """Single check through the memo (always inline)."""
+        return self.verify_many([(public_key, message, signature)])[0]
+
+    def verify_many(self, checks: Sequence[Check]) -> List[bool]:
+        """Verify every ``(public_key, message, signature)``; results in input order."""
+        keys = [check_key(*check) for check in checks]
+        results: List[Optional[bool]] = [self.cache.get(key) for key in keys]
+
+        todo: Dict[_Key, Check] = {}
+        for key, check, result in zip(keys, checks, results):
+            if result is None and key not in todo:
+                todo[key] = check
+        if todo:
+            fresh = dict(zip(todo, self._run(list(todo.values()))))
+            for key, ok in fresh.items():
+                self.cache.put(key, ok)
+            results = [fresh[key] if result is None else result for key, result in zip(keys, results)]
+        return results  # type: ignore[return-value]
+
+    def _run(self, checks: List[Check]) -> List[bool]:
+        if self.workers == 1 or len(checks) < self.min_parallel:
+            return _verify_chunk(checks)
+        pool = self._ensure_pool()
+        # Enough chunks to balance the workers, never smaller than chunk_size/4
+        size = max(self.chunk_size // 4, min(self.chunk_size, -(-len(checks) // (self.workers * 4))))
+        chunks = [checks[i : i + size] for i in range(0, len(checks), size)]
+        out: List[bool] = []
+        for part in pool.map(_verify_chunk, chunks):
+            out.extend(part)
+        return out
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+# ---------------------------------------------------------------------------
+# Shared verifier so the node, admission code and scripts share one memo/pool
+# ---------------------------------------------------------------------------
+_verifier: Optional[BatchVerifier] = None
+_verifier_lock = threading.Lock()
+
+
+def get_verifier() -> BatchVerifier:
+    """Return the process-wide :class:`BatchVerifier`, creating it once."""
+    global _verifier
+    with _verifier_lock:
+        if _verifier is None:
+            _verifier = BatchVerifier()
+        return _verifier
+
+
+def verify_batch(checks: Sequence[Check]) -> List[bool]:
+    """Functional shortcut for ``get_verifier().verify_many(checks)``."""
+    return get_verifier().verify_many(checks)
+
+
+@atexit.register
+def _shutdown_verifier() -> None:  # pragma: no cover – interpreter teardown
+    if _verifier is not None:
+        _verifier.close()
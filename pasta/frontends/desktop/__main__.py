@@ -52,6 +52,10 @@ class MainWindow(QMainWindow):
         advance_b_action = tx_menu.addAction("Advance to State B…")
         advance_b_action.triggered.connect(self.open_advance_b_dialog)
 
+        self.auto_validate_action = tx_menu.addAction("Auto-validate…")
+        self.auto_validate_action.setCheckable(True)
+        self.auto_validate_action.toggled.connect(self.toggle_auto_validate)
+
         wallet_menu = menu.addMenu("&Wallet")
         gen_kp_action = wallet_menu.addAction("Generate New Keypair")
         gen_kp_action.triggered.connect(self.generate_keypair_dialog)
@@ -87,29 +91,47 @@ class MainWindow(QMainWindow):
         dlg.exec()
 
     def open_advance_b_dialog(self):
-        """Prompt for my/target mempool indices and invoke advance_b."""
-        from PySide6.QtWidgets import QDialog, QFormLayout, QSpinBox, QDialogButtonBox, QMessageBox
+        """Prompt for my/target mempool transactions and invoke advance_b."""
+        from PySide6.QtWidgets import QComboBox, QDialog, QFormLayout, QDialogButtonBox, QMessageBox
 
         dlg = QDialog(self)
         dlg.setWindowTitle("Advance Transaction to B")
         layout = QFormLayout(dlg)
-        my_idx = QSpinBox()
-        target_idx = QSpinBox()
-        mp_len = len(self.node.get_mempool())
-        for sb in (my_idx, target_idx):
-            sb.setRange(0, max(0, mp_len - 1))
-        layout.addRow("My tx index", my_idx)
-        layout.addRow("Target tx index", target_idx)
+        my_tx = QComboBox()
+        target_tx = QComboBox()
+        # Entries are passed by stable tx ID, so a confirmation elsewhere
+        # while the dialog is open cannot shift the selection
+        for idx, tx in enumerate(self.node.get_mempool(with_ids=True)):
+            label = f"#{idx} {tx['tx_id'][:8]} [{tx['state']}] {tx['sender_address'][:8]}→{tx['receiver_address'][:8]}"
+            for box in (my_tx, target_tx):
+                box.addItem(label, tx["tx_id"])
+        layout.addRow("My tx", my_tx)
+        layout.addRow("Target tx", target_tx)
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         layout.addWidget(buttons)
         buttons.accepted.connect(dlg.accept)
         buttons.rejected.connect(dlg.reject)
-        if dlg.exec() == QDialog.Accepted:
-            tx = self.node.advance_b(my_idx.value(), target_idx.value())
+        if dlg.exec() == QDialog.Accepted and my_tx.count():
+            tx = self.node.advance_b(my_tx.currentData(), target_tx.currentData())
             if tx:
                 QMessageBox.information(self, "Success", "Transaction advanced to State B.")
             else:
-                QMessageBox.warning(self, "Error", "Invalid indices chosen.")
+                QMessageBox.warning(self, "Error", "Transactions are no longer in the mempool or changed.")
+
+    def toggle_auto_validate(self, enabled: bool):
+        """Start/stop the node's validator matcher (pairs and confirms automatically)."""
+        from PySide6.QtWidgets import QInputDialog
+
+        if not enabled:
+            self.node.stop_matcher()
+            return
+        address, ok = QInputDialog.getText(self, "Auto-validate", "Validator address (receives the rewards):")
+        if ok and address.strip():
+            self.node.start_matcher(address.strip())
+        else:
+            self.auto_validate_action.blockSignals(True)
+            self.auto_validate_action.setChecked(False)
+            self.auto_validate_action.blockSignals(False)
 
     def open_wizard(self):
         from pasta.frontends.desktop.widgets.wizard import TransactionWizard
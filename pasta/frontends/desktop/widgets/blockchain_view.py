@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import typing as _t
 
-from PySide6.QtCore import QTimer
 from PySide6.QtGui import QAction, QStandardItem, QStandardItemModel
 from PySide6.QtWidgets import QDockWidget, QTableView, QHeaderView
 
@@ -24,11 +23,10 @@ class BlockchainView(QDockWidget):
         self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-        # Refresh timer
-        self.timer = QTimer(self)
-        self.timer.setInterval(2_000)  # 2 seconds
-        self.timer.timeout.connect(self.refresh)
-        self.timer.start()
+        # Refresh when the node confirms a block (no polling)
+        from pasta.frontends.desktop.widgets.node_events import NodeEventBridge
+        self.events = NodeEventBridge(node, self)
+        self.events.event.connect(self._on_event)
 
         # Manual refresh action (context menu)
         self.refresh_action = QAction("Refresh", self)
@@ -48,10 +46,16 @@ class BlockchainView(QDockWidget):
             dlg = BlockDetailsDialog(f"Block #{row}", chain[row], self)
             dlg.exec()
 
+    def _on_event(self, event):
+        if event.kind == "block-appended":
+            self.refresh()
+
     def refresh(self):  # noqa: D401 slot
         chain = self.node.get_blockchain()
+        # The chain is append-only: only materialise rows added since last time
+        start = self.model.rowCount() if self.model.rowCount() <= len(chain) else 0
         self.model.setRowCount(len(chain))
-        for idx, block in enumerate(chain):
+        for idx, block in enumerate(chain[start:], start):
             self.model.setItem(idx, 0, QStandardItem(str(idx)))
             self.model.setItem(idx, 1, QStandardItem(block.get("block_hash", "")[:10]))
             self.model.setItem(idx, 2, QStandardItem(block.get("sender_address", "")[:10]))
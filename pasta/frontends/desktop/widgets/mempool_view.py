@@ -7,6 +7,10 @@ from PySide6.QtGui import QStandardItem, QStandardItemModel
 from PySide6.QtWidgets import QDockWidget, QTableView, QHeaderView
 
 from pasta import Node
+from pasta.node import events as ev
+
+# Event kinds that change the mempool (a branch merge swaps in its entries)
+_MEMPOOL_EVENTS = frozenset({ev.TX_CREATED, ev.TX_ADVANCED_B, ev.BLOCK_APPENDED, ev.MEMPOOL_REMOVED, ev.BRANCH_MERGED})
 
 
 class MempoolView(QDockWidget):
@@ -19,30 +23,44 @@ class MempoolView(QDockWidget):
         self.table.doubleClicked.connect(self._show_details)
         self.setWidget(self.table)
 
-        self.model = QStandardItemModel(0, 3)
-        self.model.setHorizontalHeaderLabels(["Index", "Signature", "State"])
+        self.model = QStandardItemModel(0, 4)
+        self.model.setHorizontalHeaderLabels(["Index", "ID", "Signature", "State"])
         self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
-        self.timer = QTimer(self)
-        self.timer.setInterval(2_000)
-        self.timer.timeout.connect(self.refresh)
-        self.timer.start()
+        # Mempool events only arm a single-shot timer, so a burst of them
+        # (a block confirming hundreds of txs) costs one table rebuild
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(150)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        from pasta.frontends.desktop.widgets.node_events import NodeEventBridge
+        self.events = NodeEventBridge(node, self)
+        self.events.event.connect(self._on_event)
 
         self.refresh()
 
+    def _on_event(self, event):
+        if event.kind in _MEMPOOL_EVENTS and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
     def _show_details(self, idx):
-        row = idx.row()
-        mp = self.node.get_mempool()
-        if row < len(mp):
+        # Look the row up by its stable ID: positions shift as txs confirm
+        item = self.model.item(idx.row(), 1)
+        tx = self.node.get_mempool_tx(item.data()) if item is not None else None
+        if tx is not None:
             from pasta.frontends.desktop.widgets.block_details import BlockDetailsDialog
-            dlg = BlockDetailsDialog(f"Mempool TX #{row}", mp[row], self)
+            dlg = BlockDetailsDialog(f"Mempool TX {tx['tx_id'][:8]}", tx, self)
             dlg.exec()
 
     def refresh(self):
-        mp = self.node.get_mempool()
+        mp = self.node.get_mempool(with_ids=True)
         self.model.setRowCount(len(mp))
         for idx, tx in enumerate(mp):
+            id_item = QStandardItem(tx["tx_id"][:8])
+            id_item.setData(tx["tx_id"])
             self.model.setItem(idx, 0, QStandardItem(str(idx)))
-            self.model.setItem(idx, 1, QStandardItem(str(tx.get("signature", ""))[:10]))
-            self.model.setItem(idx, 2, QStandardItem(tx.get("state", "")))
+            self.model.setItem(idx, 1, id_item)
+            self.model.setItem(idx, 2, QStandardItem(str(tx.get("signature", ""))[:10]))
+            self.model.setItem(idx, 3, QStandardItem(tx.get("state", "")))
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import typing as _t
+
+from PySide6.QtCore import QObject, Signal
+
+from pasta import Node
+
+
+class NodeEventBridge(QObject):
+    """Re-emits the node's change feed as a Qt signal on the GUI thread.
+
+    Node events are published from whichever thread committed the change;
+    emitting a signal from there queues the slot call onto the receiver's
+    thread, so widgets can refresh safely and nothing polls while idle.
+    """
+
+    event = Signal(object)  # pasta.node.events.Event
+
+    def __init__(self, node: Node, parent: _t.Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._unsubscribe = node.events.subscribe(self.event.emit)
+        self.destroyed.connect(lambda *_: self._unsubscribe())
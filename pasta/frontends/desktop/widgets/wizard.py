@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from typing import Optional
 
 from PySide6.QtWidgets import (
@@ -8,7 +9,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Signal
 
 from pasta import Node, generate_keypair
-from pasta.core.crypto import sign_message
+from pasta.core.crypto import sign_message, transaction_message
 
 
 class ActionPage(QWizardPage):
@@ -145,22 +146,23 @@ class TransactionWizard(QWizard):
             QMessageBox.critical(self, "Invalid amount", "Amount must be a non-negative number or left blank.")
             return
 
-        try:
-            tx = self.node.create_transaction(sender, receiver, amount)
-        except Exception as exc:  # Catch any backend errors and surface them
-            QMessageBox.critical(self, "Transaction error", str(exc))
-            return
-
         # --- Signing -----------------------------------------------------
+        # Same message as pasta-cli, so the node and its peers can verify it
         priv_key = self.sign_page.key_edit.text().strip()
+        signature = timestamp = None
         if priv_key:
-            msg = str(sorted(tx.items()))  # simple canonical representation
+            timestamp = time.time()
             try:
-                sig = sign_message(priv_key, msg)
-                tx["signature"] = sig  # same dict reference stored in node
+                signature = sign_message(priv_key, transaction_message(sender, receiver, amount, timestamp))
             except Exception as exc:
                 QMessageBox.critical(self, "Signing failed", str(exc))
                 return
 
+        try:
+            tx = self.node.create_transaction(sender, receiver, amount, signature, timestamp)
+        except Exception as exc:  # Catch any backend errors and surface them
+            QMessageBox.critical(self, "Transaction error", str(exc))
+            return
+
         print("Created tx (signed):", tx)
         super().accept()
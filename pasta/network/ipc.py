@@ -0,0 +1,239 @@
+"""Production serving: gunicorn workers in front of one shared node process.
+
+A node holds its chain, mempool and locks in memory, so it cannot be
+forked into several gunicorn workers.  Instead the node process runs a
+:class:`NodeServer` that executes requests against the node's Flask app,
+reached over a Unix socket (``multiprocessing.connection`` with an auth
+key).  The gunicorn workers only run :class:`ProxyApp`, a small WSGI app
+that forwards each request's environ and body to it and streams back the
+status, headers and body chunks.  HTTP parsing, keep-alive, TLS
+termination and slow clients stay in the workers; the node process only
+sees complete requests.
+
+Each request holds one pooled connection to the node for as long as it
+streams, so long-lived responses (``/events``) work unchanged and the
+node serves as many requests at once as there are connections open::
+
+    python -m pasta.network.server --production --workers 4 --threads 8
+
+:func:`serve` starts gunicorn with ``pasta.network.ipc:proxy_app()`` (the
+socket and key are passed through ``PASTA_NODE_SOCKET`` and
+``PASTA_NODE_AUTHKEY``).  gunicorn is an optional dependency.
+"""
+from __future__ import annotations
+
+import os
+import queue
+import secrets
+import subprocess
+import sys
+import tempfile
+import threading
+import traceback
+from io import BytesIO
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+__all__ = ["NodeServer", "ProxyApp", "proxy_app", "serve"]
+
+# Environ values that are forwarded; everything else (file objects, server
+# internals) is local to the worker
+_WSGI_KEYS = ("wsgi.url_scheme",)
+_START, _CHUNK, _END, _ERROR = "start", "chunk", "end", "error"
+
+
+# ---------------------------------------------------------------------------
+# Node side
+# ---------------------------------------------------------------------------
+class NodeServer:
+    """Serve the WSGI *app* to :class:`ProxyApp` workers on *address* (a Unix socket path)."""
+
+    def __init__(self, app, address: Optional[str] = None, authkey: Optional[bytes] = None) -> None:
+        self.app = app
+        self.address = address or os.path.join(tempfile.mkdtemp(prefix="pasta-node-"), "node.sock")
+        self.authkey = authkey or secrets.token_bytes(32)
+        if os.path.exists(self.address):
+            os.unlink(self.address)  # stale socket of a previous run
+        self._listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        self._thread: Optional[threading.Thread] = None
+        self._closed = threading.Event()
+        self.connections = 0
+
+    def start(self) -> "NodeServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="pasta-node-ipc", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        while not self._closed.is_set():
+            try:
+                conn = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                if self._closed.is_set():
+                    return
+                continue  # failed handshake (wrong key, worker died mid-accept)
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,), name="pasta-node-conn", daemon=True).start()
+
+    def _handle(self, conn: Connection) -> None:
+        with conn:
+            while True:
+                try:
+                    environ, body = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if not self._respond(conn, environ, body):
+                    return
+
+    def _respond(self, conn: Connection, environ: Dict[str, Any], body: bytes) -> bool:
+        """Run one request; False when the worker went away mid-response."""
+        started: List[Tuple[str, List[Tuple[str, str]]]] = []
+        environ.update(
+            {
+                "wsgi.version": (1, 0),
+                "wsgi.input": BytesIO(body),
+                "wsgi.errors": sys.stderr,
+                "wsgi.multithread": True,
+                "wsgi.multiprocess": False,
+                "wsgi.run_once": False,
+            }
+        )
+
+        def start_response(status, headers, exc_info=None):
+            started.append((status, list(headers)))
+
+        try:
+            result = self.app(environ, start_response)
+        except Exception as exc:  # the Flask app already turns route errors into 500s
+            conn.send((_ERROR, repr(exc)))
+            return True
+        try:
+            chunks = iter(result)
+            first = next(chunks, b"")  # start_response may be deferred until the first chunk
+            conn.send((_START,) + started[-1])
+            if first:
+                conn.send((_CHUNK, first))
+            for chunk in chunks:
+                if chunk:
+                    conn.send((_CHUNK, chunk))
+            conn.send((_END,))
+            return True
+        except (OSError, EOFError):
+            return False
+        except Exception:  # a streaming body failed after the status was sent
+            traceback.print_exc()
+            return False
+        finally:
+            close = getattr(result, "close", None)
+            if close is not None:
+                close()
+
+    def close(self) -> None:
+        self._closed.set()
+        self._listener.close()
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+class ProxyApp:
+    """WSGI app forwarding every request to a :class:`NodeServer`."""
+
+    def __init__(self, address: str, authkey: bytes, pool_size: int = 64) -> None:
+        self.address = address
+        self.authkey = authkey
+        self._idle: "queue.LifoQueue[Connection]" = queue.LifoQueue(pool_size)
+
+    def _acquire(self) -> Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return Client(self.address, family="AF_UNIX", authkey=self.authkey)
+
+    def _release(self, conn: Connection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def __call__(self, environ: Dict[str, Any], start_response):
+        forwarded = {k: v for k, v in environ.items() if k.isupper() and isinstance(v, str)}
+        forwarded.update((k, environ[k]) for k in _WSGI_KEYS if k in environ)
+        length = environ.get("CONTENT_LENGTH")
+        body = environ["wsgi.input"].read(int(length)) if length else b""
+        request = (forwarded, body)
+        # A pooled connection may have gone stale (node restarted); only
+        # reads are retried, a POST may already have been applied
+        attempts = 2 if environ.get("REQUEST_METHOD") in ("GET", "HEAD") else 1
+        for attempt in range(attempts):
+            conn = self._acquire()
+            try:
+                conn.send(request)
+                reply = conn.recv()
+                break
+            except (OSError, EOFError):
+                conn.close()
+                if attempt == attempts - 1:
+                    start_response("502 Bad Gateway", [("Content-Type", "text/plain")])
+                    return [b"node process unavailable"]
+        if reply[0] == _ERROR:
+            self._release(conn)
+            start_response("500 Internal Server Error", [("Content-Type", "text/plain")])
+            return [reply[1].encode()]
+        _, status, headers = reply
+        start_response(status, headers)
+        return self._body(conn)
+
+    def _body(self, conn: Connection) -> Iterator[bytes]:
+        done = False
+        try:
+            while True:
+                msg = conn.recv()
+                if msg[0] == _END:
+                    done = True
+                    return
+                yield msg[1]
+        finally:
+            # A client that hung up mid-stream leaves the node writing into
+            # this connection: drop it instead of pooling it
+            if done:
+                self._release(conn)
+            else:
+                conn.close()
+
+
+def proxy_app(address: Optional[str] = None, authkey: Optional[str] = None) -> ProxyApp:
+    """gunicorn app factory; defaults come from ``PASTA_NODE_SOCKET`` / ``PASTA_NODE_AUTHKEY`` (hex)."""
+    return ProxyApp(
+        address or os.environ["PASTA_NODE_SOCKET"], bytes.fromhex(authkey or os.environ["PASTA_NODE_AUTHKEY"])
+    )
+
+
+def serve(app, host: str = "0.0.0.0", port: int = 5000, workers: int = 4, threads: int = 8, gunicorn_args=()) -> int:
+    """Serve *app* from this process behind *workers* gunicorn processes; returns gunicorn's exit code."""
+    try:
+        import gunicorn  # noqa: F401 – only checked here, the workers import it
+    except ImportError as exc:
+        raise RuntimeError("production serving needs gunicorn (pip install gunicorn)") from exc
+    server = NodeServer(app).start()
+    env = dict(os.environ, PASTA_NODE_SOCKET=server.address, PASTA_NODE_AUTHKEY=server.authkey.hex())
+    cmd = [
+        sys.executable, "-m", "gunicorn",
+        "--workers", str(workers),
+        "--worker-class", "gthread",
+        "--threads", str(threads),
+        "--bind", f"{host}:{port}",
+        *gunicorn_args,
+        "pasta.network.ipc:proxy_app()",
+    ]  # fmt: skip
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        return proc.wait()
+    except KeyboardInterrupt:
+        proc.terminate()
+        return proc.wait()
+    finally:
+        server.close()
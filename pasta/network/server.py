@@ -6,12 +6,36 @@ from __future__ import annotations
 """
 
 import os
+import json
 import argparse
 
 from pasta.node import Node
+from pasta.node.stats import MintPolicy
 
-# Single in-process node
-_node = Node()
+# Single in-process node; REST submissions must be signed unless
+# PASTA_REQUIRE_SIGNATURES=0 (e.g. for unsigned test traffic).
+# PASTA_SPLIT_THRESHOLD=N splits the chain once a branch holds N pending txs.
+# PASTA_MINT_BASIS=window|ewma|median|... picks the statistic minting follows.
+# PASTA_P2P_PORT=N joins the gossip network on port N, dialing the
+# comma-separated host:port list in PASTA_PEERS; nodes of one network share
+# the genesis block stored (as JSON) at PASTA_GENESIS.
+# PASTA_SYNC_FROM=url,url catches up with those nodes' chain before serving.
+_genesis_path = os.getenv("PASTA_GENESIS")
+_genesis = None
+if _genesis_path:
+    with open(_genesis_path, encoding="utf-8") as f:
+        _genesis = json.load(f)
+_node = Node(
+    require_signatures=os.getenv("PASTA_REQUIRE_SIGNATURES", "1") != "0",
+    split_threshold=int(os.getenv("PASTA_SPLIT_THRESHOLD", "0")) or None,
+    mint_policy=MintPolicy(basis=os.getenv("PASTA_MINT_BASIS", "lifetime")),
+    genesis=_genesis,
+)
+if os.getenv("PASTA_SYNC_FROM"):
+    _node.sync_from([u for u in os.environ["PASTA_SYNC_FROM"].split(",") if u])
+if os.getenv("PASTA_P2P_PORT"):
+    _peers = [p.rsplit(":", 1) for p in os.getenv("PASTA_PEERS", "").split(",") if p]
+    _node.start_gossip(int(os.environ["PASTA_P2P_PORT"]), [(h, int(port)) for h, port in _peers], host="0.0.0.0")
 app = _node.create_flask_app(__name__)
 
 
@@ -22,8 +46,22 @@ def run(host: str = "0.0.0.0", port: int | None = None):
     app.run(host=host, port=port, threaded=True)
 
 
+def run_production(host: str = "0.0.0.0", port: int | None = None, workers: int = 4, threads: int = 8):
+    """Serve this process's node behind gunicorn workers (see pasta.network.ipc)."""
+    from pasta.network.ipc import serve
+
+    if port is None:
+        port = int(os.getenv("PORT", 5000))
+    return serve(app, host, port, workers=workers, threads=threads)
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run PastaCoin REST server")
     parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--production", action="store_true", help="gunicorn workers sharing this node over IPC")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8, help="threads per gunicorn worker")
     args = parser.parse_args()
+    if args.production:
+        raise SystemExit(run_production(port=args.port, workers=args.workers, threads=args.threads))
     run(port=args.port)
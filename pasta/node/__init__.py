@@ -6,46 +6,171 @@ Encapsulates blockchain & mempool state so every front-end (CLI, GUI, REST
 server) can share the same logic without global variables.
 
 NOTE: This class is intentionally minimal – it only mirrors the behaviour that
-existed previously in pasta.network.server.  Additional networking (peer-to-peer)
-will be added later.
+existed previously in pasta.network.server.  Peer-to-peer propagation lives in
+pasta.node.gossip (``Node.start_gossip``).
 """
 
+import logging
+import os
 import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+from typing import List, Dict, Optional, Tuple, Union
 
 from flask import Flask  # type: ignore – optional dependency (used in start_rest_server)
 
+from pasta.core.encoding import AMOUNT_SCALE, check_fields
 from pasta.core.models import TransactionBlock
 from pasta.validation import engine as ve
-from pasta.core.crypto import generate_keypair as _generate_keypair
+from pasta.core.crypto import generate_keypair as _generate_keypair, transaction_message
+from pasta.core.verify import BatchVerifier
+from pasta.node.admission import AdmissionPipeline, AdmissionQueueFull, AdmissionRejected
+from pasta.node.branches import AGGREGATION, MAIN, Branch, BranchTable
+from pasta.node.checkpoint import (
+    CHECKPOINT_FILE,
+    build_checkpoint_block,
+    expected_difficulty,
+    read_checkpoint,
+    verify_checkpoint,
+    write_checkpoint,
+)
+from pasta.node.mining import JobQueueFull, MiningJob, MiningScheduler
+from pasta.node import events as ev
+from pasta.node.gossip import ACCEPTED, KNOWN, ORPHAN, REJECTED, Gossip
+from pasta.node.indexes import ChainIndex
+from pasta.node.ledger import Ledger
+from pasta.node.matcher import ValidatorMatcher
+from pasta.node.mempool import Mempool, MempoolFull
+from pasta.node.render import DEFAULT_BLOCK_CACHE, BlockJSONCache, json_provider
+from pasta.node.render import dumps as _dumps, loads as _loads
+from pasta.node.snapshot import SNAPSHOT_FILE, Snapshotter, read_snapshot, validate_entries
+from pasta.node.stats import DEFAULT_WINDOW, MintPolicy, StreamStats
+from pasta.node.store import BlockStore, ChainStore, ChainView
+from pasta.node.sync import MAX_SYNC_BLOCKS, MAX_SYNC_HEADERS, SYNC_MIMETYPE, ChainSync, pack_records
 
 __all__ = ["Node", "create_default_app", "_generate_keypair"]
 
+NDJSON_MIMETYPE = "application/x-ndjson"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1_000
+RENDER_CHUNK = 256  # chain rows rendered per acquisition of the node lock
+SSE_KEEPALIVE = 15.0  # seconds between keep-alive comments on idle /events streams
+ADMISSION_TIMEOUT = 30.0  # seconds /create_transaction waits for the pipeline
+MAX_BATCH_SIZE = 10_000  # transactions per JSON batch / per NDJSON chunk
+_log = logging.getLogger(__name__)
+# Fields a relayed State-B copy must share with the State-A entry it replaces
+_TX_IDENTITY = ("sender_address", "receiver_address", "amount", "mint_amount", "signature", "signed_amount", "signed_timestamp")
+
 
 class Node:
     """In-memory blockchain node suitable for tests, REST, or GUI embedding."""
 
-    def __init__(self) -> None:
-        self.blockchain: List[Dict] = []
-        self.mempool: List[Dict] = []
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        mining_workers: int = 1,
+        max_pending_jobs: int = 64,
+        require_signatures: bool = False,
+        verify_workers: Optional[int] = None,
+        max_mempool: Optional[int] = None,
+        snapshot_interval: float = 5.0,
+        auto_validator: Optional[str] = None,
+        split_threshold: Optional[int] = None,
+        max_branches: int = 8,
+        checkpoint_interval: Optional[int] = None,
+        prune_history: bool = False,
+        cold_dir: Optional[str] = None,
+        bootstrap: Union[None, str, Dict] = None,
+        mint_policy: Optional[MintPolicy] = None,
+        stats_window: int = DEFAULT_WINDOW,
+        genesis: Optional[Dict] = None,
+    ) -> None:
+        # A bootstrap checkpoint (file path or the GET /checkpoint document)
+        # seeds an empty store at the checkpoint height, see pasta.node.checkpoint
+        if isinstance(bootstrap, str):
+            path = bootstrap
+            bootstrap = read_checkpoint(path)
+            if bootstrap is None:
+                raise ValueError(f"no checkpoint in {path}")
+        if bootstrap is not None:
+            verify_checkpoint(bootstrap)
+        base = 0 if bootstrap is None else bootstrap["height"]
+
+        # With a data_dir the chain lives in an on-disk block log and survives
+        # restarts; otherwise it is kept in a columnar in-memory store.
+        self.blockchain: BlockStore
+        if data_dir is not None:
+            from pasta.node.storage import BlockLog
+
+            self.blockchain = BlockLog(data_dir, base=base, cold_dir=cold_dir)
+        else:
+            self.blockchain = ChainStore(base)
+        self.mempool = Mempool(max_size=max_mempool)  # tx_id -> entry, see pasta.node.mempool
+        self.index = ChainIndex()
+        self.ledger = Ledger()
+        # Branch tips, splits and aggregation (see pasta.node.branches);
+        # split_threshold=None keeps every transaction on the main chain
+        self.branches = BranchTable(self._locate, split_threshold, max_branches)
+
+        # Balance checkpoints every checkpoint_interval blocks (mined by the
+        # matcher or POST /checkpoint); prune_history drops the blocks behind
+        self.checkpoint_interval = checkpoint_interval
+        self.prune_history = prune_history
+        self.last_checkpoint: Optional[Dict] = None
+        self._checkpoint_path = None if data_dir is None else os.path.join(data_dir, CHECKPOINT_FILE)
+        self._checkpoint_lock = threading.Lock()
+        self.events = ev.EventBus()
         self._lock = threading.Lock()
 
-        # Guarantee genesis existence on startup
-        self._ensure_genesis()
+        # Asynchronous PoW jobs (see pasta.node.mining); threads start lazily
+        self.jobs = MiningScheduler(workers=mining_workers, max_queue=max_pending_jobs)
+
+        # Signature checks (see pasta.node.admission); REST submissions are
+        # admitted through the staged pipeline, in-process calls verify inline
+        self.require_signatures = require_signatures
+        self.verifier = BatchVerifier(workers=verify_workers)
+        self.admission = AdmissionPipeline(self)
+
+        # Streaming stats and the mint/burn policy they feed (see pasta.node.stats)
+        self.stats = StreamStats(window=stats_window)
+        self.mint_policy = mint_policy or MintPolicy()
+        self.stats.value(self.mint_policy.basis)  # unknown basis: fail at start-up
 
-        # rolling stats for experimental minting phase
-        self.tx_counter: int = 0
-        self.total_amount: float = 0.0
+        # Start ledger, branches and stats from the newest usable checkpoint
+        # instead of replaying the chain from genesis
+        if bootstrap is not None and len(self.blockchain) == base:
+            self.blockchain.append(bootstrap["block"])
+            if self._checkpoint_path is not None:
+                write_checkpoint(self._checkpoint_path, bootstrap)
+        checkpoint = read_checkpoint(self._checkpoint_path) if self._checkpoint_path else bootstrap
+        if checkpoint is not None:
+            self._load_checkpoint(checkpoint)
+
+        # Warm restart: reload the mempool + stats snapshot (see pasta.node.snapshot)
+        self.snapshots: Optional[Snapshotter] = None
+        if data_dir is not None:
+            path = os.path.join(data_dir, SNAPSHOT_FILE)
+            self._restore_snapshot(path)
+            self.snapshots = Snapshotter(path, self._capture_snapshot, snapshot_interval)
+
+        # Guarantee genesis existence on startup; the nodes of one network
+        # share a genesis block (a fresh one is made otherwise)
+        self._ensure_genesis(genesis)
+        self.gossip: Optional[Gossip] = None
+
+        # Automatic pairing/confirmation (see pasta.node.matcher)
+        self.matcher: Optional[ValidatorMatcher] = None
+        if auto_validator is not None:
+            self.start_matcher(auto_validator, workers=mining_workers)
 
     # ---------------------------------------------------------------------
     # Genesis helpers
     # ---------------------------------------------------------------------
-    def _ensure_genesis(self) -> None:
+    def _ensure_genesis(self, genesis: Optional[Dict] = None) -> None:
         """Create the initial blockchain + State-B genesis tx in mempool."""
-        if not self.blockchain:
-            gen = TransactionBlock.create_genesis()
-            self.blockchain.append(gen.__dict__)
+        if not len(self.blockchain):
+            self.blockchain.append(genesis or TransactionBlock.create_genesis())
 
         if not self.mempool:
             genesis_hash = self.blockchain[0]["block_hash"]
@@ -59,98 +184,865 @@ class Node:
                 level=0,
                 validated_block_id=genesis_hash,
                 validated_block_hash=genesis_hash,
+                required_difficulty=ve.difficulty_for_level(0),
                 state="B",
             )
-            self.mempool.append(gtx.__dict__)
+            tx_id, _ = self.mempool.add(gtx.__dict__)
+            self.index.add_pending(gtx.__dict__)
+            self.branches.catch_up(self.blockchain)
+            self.branches.track_entry(tx_id, gtx.__dict__)
+
+    def _locate(self, block_hash: str) -> Optional[int]:
+        self.index.catch_up(self.blockchain)
+        return self.index.height_of(block_hash)
+
+    # ---------------------------------------------------------------------
+    # Mempool snapshots
+    # ---------------------------------------------------------------------
+    def _capture_snapshot(self) -> Tuple[int, Dict]:
+        """(version, state) for the snapshot thread; only references are taken under the lock."""
+        with self._lock:
+            return self.events.last_seq, {
+                "height": len(self.blockchain) - 1,
+                "tip_hash": self.blockchain.tip().block_hash,
+                "tx_counter": self.tx_counter,
+                "total_amount": self.total_amount,
+                "stats": self.stats.state(),
+                "entries": self.mempool.items(),
+            }
+
+    def _restore_snapshot(self, path: str) -> None:
+        state = read_snapshot(path)
+        if state is None or not len(self.blockchain):
+            return
+        self.branches.catch_up(self.blockchain)
+        dropped = 0
+        for tx_id, tx in validate_entries(state, self.blockchain, self.blockchain.height_of):
+            try:
+                _, evicted = self.mempool.add(tx, tx_id)
+            except MempoolFull:  # max_mempool shrank since the snapshot was written
+                dropped += 1
+                continue
+            self.index.add_pending(tx)
+            self.branches.track_entry(tx_id, tx)
+            for old_id, old in evicted:
+                self.index.remove_pending(old)
+                self.branches.untrack(old_id)
+        if dropped:
+            _log.warning("dropped %d snapshot entries that no longer fit max_mempool=%d", dropped, self.mempool.max_size)
+        self._load_stats(state)
+
+    # ---------------------------------------------------------------------
+    # Balance checkpoints
+    # ---------------------------------------------------------------------
+    def _load_checkpoint(self, state: Dict) -> None:
+        height, chain = state["height"], self.blockchain
+        if not (chain.base <= height < len(chain) and chain.row(height)["block_hash"] == state["block"]["block_hash"]):
+            if chain.base:
+                raise ValueError("checkpoint does not match the pruned chain")
+            return  # stale file from another chain: replay from genesis instead
+        self.ledger.load(state["balances"], applied=height)  # the state right before the checkpoint block
+        self.branches.restore(state["branches"], applied=height + 1)
+        self._load_stats(state)
+        self.last_checkpoint = state
+
+    def checkpoint_due(self) -> bool:
+        """True when ``checkpoint_interval`` blocks were confirmed since the last checkpoint."""
+        if not self.checkpoint_interval:
+            return False
+        last = self.last_checkpoint["height"] if self.last_checkpoint else 0
+        return len(self.blockchain) - 1 - last >= self.checkpoint_interval
+
+    def checkpoint(self, validator_address: str) -> Optional[Dict]:
+        """Mine a balance checkpoint on the main branch; ``None`` if the state moved meanwhile.
+
+        The checkpoint document is written to ``<data_dir>/checkpoint.json``
+        before anything is pruned (``prune_history``).
+        """
+        with self._checkpoint_lock:
+            with self._lock:
+                self.ledger.catch_up(self.blockchain)
+                self.branches.catch_up(self.blockchain)
+                main, applied = self.branches.get(MAIN), self.ledger.applied
+                balances = self.ledger.snapshot()
+                block = build_checkpoint_block(main.tip_hash, balances, validator_address)
+            block.nonce, block.block_hash = ve.mine_pow(block, ve.pow_prefix(block))
+            with main.lock, self._lock:
+                if main.tip_hash != block.predecessor_hash or len(self.blockchain) != applied:
+                    return None  # confirmations landed while mining: balances are stale
+                height = self._append_block(block)
+                state = {
+                    "height": height,
+                    "block": dict(vars(block)),
+                    "balances": balances,
+                    "tx_counter": self.tx_counter,
+                    "total_amount": self.total_amount,
+                    "stats": self.stats.state(),
+                    "branches": [dict(b.to_dict(), pending=0) for b in self.branches.branches()],
+                }
+                self.last_checkpoint = state
+                self.events.publish(ev.BLOCK_APPENDED, {"height": height, "tx_id": None, "block": state["block"]})
+                self.events.publish(ev.CHECKPOINT, {"height": height, "block": state["block"]})
+            if self._checkpoint_path is not None:
+                write_checkpoint(self._checkpoint_path, state)  # durable before pruning
+            if self.prune_history:
+                self.prune()
+            return state["block"]
+
+    def prune(self, height: Optional[int] = None) -> int:
+        """Drop blocks below *height* (at most the last checkpoint); returns the new base."""
+        with self._lock:
+            if self.last_checkpoint is None:
+                return self.blockchain.base
+            limit = self.last_checkpoint["height"]
+            height = limit if height is None else min(height, limit)
+            self.ledger.catch_up(self.blockchain)
+            self.branches.catch_up(self.blockchain)
+            base = self.blockchain.prune(height)
+            self.index.prune(base)
+            self.branches.prune(base)
+            return base
+
+    def start_matcher(self, validator_address: str, workers: int = 1) -> ValidatorMatcher:
+        """Start (or restart with new settings) the automatic validator matcher."""
+        self.stop_matcher()
+        self.matcher = ValidatorMatcher(self, validator_address, workers=workers)
+        self.matcher.start()
+        return self.matcher
+
+    def stop_matcher(self) -> None:
+        if self.matcher is not None:
+            self.matcher.stop()
+
+    def start_gossip(self, port: int = 0, peers=(), host: str = "127.0.0.1", **kwargs) -> Gossip:
+        """Join the peer-to-peer network on a background event loop (see pasta.node.gossip)."""
+        self.stop_gossip()
+        self.gossip = Gossip(self, host=host, port=port, peers=peers, **kwargs).start_background()
+        return self.gossip
+
+    def stop_gossip(self) -> None:
+        if self.gossip is not None:
+            self.gossip.stop_background()
+            self.gossip = None
+
+    def sync_from(self, peers: List[str], **kwargs) -> Dict:
+        """Catch up with the longest chain served by *peers* (base URLs); see pasta.node.sync."""
+        return ChainSync(self, peers, **kwargs).run()
+
+    def close(self) -> None:
+        """Write a final snapshot, flush and release persistent storage (safe on in-memory nodes)."""
+        self.stop_gossip()
+        self.stop_matcher()
+        if self.snapshots is not None:
+            self.snapshots.close()
+            self.snapshots = None
+        with self._lock:
+            self.blockchain.close()
+        self.verifier.close()
 
     # ---------------------------------------------------------------------
     # Public query helpers (thread-safe)
     # ---------------------------------------------------------------------
-    def get_blockchain(self) -> List[Dict]:
+    def get_blockchain(self) -> ChainView:
+        """Lazy snapshot of the chain; rows become dicts only when read."""
         with self._lock:
-            return list(self.blockchain)  # shallow copy
+            return self.blockchain.view()
 
-    def get_mempool(self) -> List[Dict]:
+    def get_mempool(self, with_ids: bool = False) -> List[Dict]:
+        """Mempool entries in arrival order; *with_ids* returns copies carrying ``tx_id``."""
         with self._lock:
+            if with_ids:
+                return [dict(tx, tx_id=tx_id) for tx_id, tx in self.mempool.items()]
             return list(self.mempool)
 
+    def get_mempool_tx(self, ref: Union[int, str]) -> Optional[Dict]:
+        """Mempool entry by tx ID (or legacy index) with its ``tx_id``, or ``None``."""
+        with self._lock:
+            tx_id = self.mempool.resolve(ref)
+            return None if tx_id is None else dict(self.mempool.get(tx_id), tx_id=tx_id)
+
+    def next_ready(self, state: str = "B") -> Optional[Dict]:
+        """Oldest mempool entry in *state* (``"B"``: next one ready for validation)."""
+        with self._lock:
+            tx_id = self.mempool.peek(state)
+            return None if tx_id is None else dict(self.mempool.get(tx_id), tx_id=tx_id)
+
+    # ------------------------------------------------------------------
+    # Indexed lookups (O(1) + O(k) results, independent of chain length)
+    # ------------------------------------------------------------------
+    def _rows(self, heights: List[int]) -> List[Dict]:
+        return [dict(self.blockchain.row(h), height=h) for h in heights]
+
+    def get_balance(self, address: str) -> Dict:
+        """Confirmed balance of *address* from the running ledger (O(1))."""
+        with self._lock:
+            self.ledger.catch_up(self.blockchain)
+            return {"address": address, "balance": self.ledger.balance(address), "height": len(self.blockchain) - 1}
+
+    def get_block(self, block_hash: str) -> Optional[Dict]:
+        """Confirmed block with *block_hash* (plus its ``height``) or ``None``."""
+        with self._lock:
+            self.index.catch_up(self.blockchain)
+            height = self.index.height_of(block_hash)
+            return None if height is None else self._rows([height])[0]
+
+    def block_height(self, block_hash: str) -> Optional[int]:
+        """Height of the confirmed block *block_hash*, or ``None``."""
+        with self._lock:
+            return self._locate(block_hash)
+
+    def get_address_txs(self, address: str) -> Dict[str, List[Dict]]:
+        """Confirmed and pending transactions sent or received by *address*."""
+        with self._lock:
+            self.index.catch_up(self.blockchain)
+            return {
+                "confirmed": self._rows(self.index.heights_for_address(address)),
+                "pending": [dict(tx) for tx in self.index.pending_for_address(address)],
+            }
+
+    def get_children(self, block_hash: str) -> Dict[str, List[Dict]]:
+        """Blocks and pending transactions whose predecessor is *block_hash*."""
+        with self._lock:
+            self.index.catch_up(self.blockchain)
+            return {
+                "confirmed": self._rows(self.index.child_heights(block_hash)),
+                "pending": [dict(tx) for tx in self.index.pending_children(block_hash)],
+            }
+
+    def get_validators(self, block_hash: str) -> Dict[str, List[Dict]]:
+        """Transactions whose State-B proof validated *block_hash*."""
+        with self._lock:
+            self.index.catch_up(self.blockchain)
+            return {
+                "confirmed": self._rows(self.index.validator_heights(block_hash)),
+                "pending": [dict(tx) for tx in self.index.pending_validators(block_hash)],
+            }
+
     # ------------------------------------------------------------------
     # Transaction workflow
     # ------------------------------------------------------------------
+    @property
+    def tx_counter(self) -> int:
+        return self.stats.count
+
+    @property
+    def total_amount(self) -> float:
+        return self.stats.total
+
+    def _load_stats(self, state: Dict) -> None:
+        self.stats.load(state.get("stats") or {"count": state["tx_counter"], "total": state["total_amount"]})
+
     def _average_amount(self) -> float:
-        return self.total_amount / self.tx_counter if self.tx_counter else 0.0
+        return self.stats.value("lifetime")
+
+    def get_stats(self) -> Dict:
+        """Streaming transaction statistics plus the active mint policy."""
+        return dict(self.stats.to_dict(), policy=self.mint_policy.to_dict())
+
+    def create_transaction(
+        self,
+        sender: str,
+        receiver: str,
+        amount: float,
+        signature: Optional[str] = None,
+        timestamp: Optional[float] = None,
+    ) -> Dict:
+        """Create a State-A transaction, apply experimental minting, and add to mempool.
+
+        *signature* must sign ``transaction_message(sender, receiver, amount,
+        timestamp)`` with the sender's key; a bad signature (or a missing one
+        when ``require_signatures`` is set) raises ``ValueError``.  A full
+        mempool evicts old State-A entries or raises ``MempoolFull``.
+        """
+        signed = None
+        if signature is None:
+            if self.require_signatures:
+                raise ValueError("Missing signature")
+        elif timestamp is None or not self.verifier.verify(
+            sender, transaction_message(sender, receiver, amount, timestamp), signature
+        ):
+            raise ValueError("Invalid signature")
+        else:
+            signed = (str(amount), str(timestamp))
 
-    def create_transaction(self, sender: str, receiver: str, amount: float) -> Dict:
-        """Create a State-A transaction, apply experimental minting, and add to mempool."""
         with self._lock:
-            # Experimental minting: first 100k tx may be zero-value; we mint up to target 10 PASTA
-            if amount == 0 and self.tx_counter < 100_000:
-                mint = max(0.0, 10.0 - self._average_amount())
-                amount = mint  # inject minted coins into tx
+            return self._create_locked(sender, receiver, amount, signature, signed)[1]
+
+    def create_transactions(self, txs: List[Dict]) -> List[Dict]:
+        """Create a batch of State-A transactions from ``/create_transaction`` payloads.
+
+        The batch passes the admission checks stage by stage (syntax, replay,
+        one batched signature verification); minting, stats and the mempool
+        inserts then happen under a single acquisition of the node lock.  A
+        bad item does not fail the others: one result per payload, in order,
+        ``{"status": 201, "tx_id", "tx"}`` or ``{"status": 4xx/503, "error"}``.
+        """
+        results = []
+        for sub in self.admission.admit_many(txs):
+            exc = sub.future.exception()
+            if exc is None:
+                results.append({"status": 201, "tx_id": sub.tx_id, "tx": sub.future.result()})
             else:
-                mint = 0.0
+                results.append({"status": exc.status, "error": exc.reason})
+        return results
+
+    def _create_many(self, items: List[Tuple[str, str, float, Optional[str], Optional[Tuple[str, str]]]]) -> List:
+        """``(tx_id, entry)`` or the ``MempoolFull`` error per (sender, receiver, amount, signature, signed)."""
+        results: List = []
+        with self._lock:
+            for sender, receiver, amount, signature, signed in items:
+                try:
+                    results.append(self._create_locked(sender, receiver, amount, signature, signed))
+                except MempoolFull as exc:
+                    results.append(exc)
+        return results
+
+    def _create_locked(
+        self, sender: str, receiver: str, amount: float, signature: Optional[str], signed: Optional[Tuple[str, str]] = None
+    ) -> Tuple[str, Dict]:
+        # *signed* is the (amount, timestamp) text of the signed message,
+        # kept on the entry so peers can verify the signature again
+        # Experimental minting: by default the first 100k tx may be
+        # zero-value and mint up to the 10 PASTA target (see MintPolicy)
+        amount, mint, signal = self.mint_policy.decide(amount, self.stats)
+
+        # Build on the least-loaded open branch (the main chain unless split)
+        self.branches.catch_up(self.blockchain)
+        branch = self.branches.pick()
+        tx_obj = ve.build_state_a(sender, receiver, amount, branch.tip_hash, level=branch.level)
+        tx_obj.mint_amount = mint
+        tx_obj.average_tx_size = signal
+        tx_obj.signature = signature
+        if signed is not None:
+            tx_obj.signed_amount, tx_obj.signed_timestamp = signed
+
+        tx_id, evicted = self.mempool.add(tx_obj.__dict__)
+
+        # stats update (use post-mint amount)
+        self.stats.record(amount, branch.level, mint)
+
+        self.index.add_pending(tx_obj.__dict__)
+        self.branches.track(tx_id, branch)
+        for old_id, old in evicted:
+            self.index.remove_pending(old)
+            self.branches.untrack(old_id)
+            self.events.publish(ev.MEMPOOL_REMOVED, {"tx_id": old_id, "tx": dict(old), "reason": "evicted"})
+        self.events.publish(ev.TX_CREATED, {"tx_id": tx_id, "tx": dict(tx_obj.__dict__)})
+        opened = self.branches.split(branch)
+        if opened is not None:
+            self.events.publish(ev.BRANCH_OPENED, {"branch": opened.to_dict()})
+        return tx_id, tx_obj.__dict__
+
+    # PoW runs outside self._lock: snapshot the mempool entries under the
+    # lock, mine on private copies, then re-take the lock only to check that
+    # the entries are still there and unchanged before committing.
 
-            predecessor = TransactionBlock(**self.blockchain[-1])
-            tx_obj = ve.build_state_a(sender, receiver, amount, predecessor)
-            tx_obj.mint_amount = mint
-            tx_obj.average_tx_size = self._average_amount()
+    # Entries are addressed by stable tx ID or, for older clients, by their
+    # current position in the mempool (resolved to an ID under the lock).
 
-            # stats update (use post-mint amount)
-            self.tx_counter += 1
-            self.total_amount += amount
+    def _is_current(self, entry: Dict, snapshot: Dict) -> bool:
+        return self.mempool.id_of(entry) is not None and entry == snapshot
 
-            self.mempool.append(tx_obj.__dict__)
-            return tx_obj.__dict__
+    def _entry(self, ref: Union[int, str]) -> Optional[Dict]:
+        tx_id = self.mempool.resolve(ref)
+        return None if tx_id is None else self.mempool.get(tx_id)
 
-    def advance_b(self, my_index: int, target_index: int) -> Optional[Dict]:
+    def _snapshot_b(self, my_ref: Union[int, str], target_ref: Union[int, str]) -> Optional[Tuple[Dict, Dict, Dict, Dict]]:
         with self._lock:
-            try:
-                my_tx_dict = self.mempool[my_index]
-                target_tx_dict = self.mempool[target_index]
-            except IndexError:
+            my_tx_dict, target_tx_dict = self._entry(my_ref), self._entry(target_ref)
+            if my_tx_dict is None or target_tx_dict is None:
                 return None
+            return my_tx_dict, dict(my_tx_dict), target_tx_dict, dict(target_tx_dict)
 
-            my_tx = TransactionBlock(**my_tx_dict)
-            target_tx = TransactionBlock(**target_tx_dict)
-            ve.advance_to_state_b(my_tx, target_tx)
-            # Save back mutated my_tx
-            self.mempool[my_index] = my_tx.__dict__
+    def _run_b(self, snap: Tuple[Dict, Dict, Dict, Dict], cancel: Optional[threading.Event] = None) -> Optional[Dict]:
+        my_ref, my_snap, target_ref, target_snap = snap
+        my_tx = TransactionBlock(**my_snap)
+        target_tx = TransactionBlock(**target_snap)
+        ve.advance_to_state_b(my_tx, target_tx, cancel=cancel)
+        with self._lock:
+            if not (self._is_current(my_ref, my_snap) and self._is_current(target_ref, target_snap)):
+                return None
+            # Save back mutated my_tx under the same ID
+            tx_id = self.mempool.id_of(my_ref)
+            self.mempool.replace(tx_id, my_tx.__dict__)
+            self.index.replace_pending(my_ref, my_tx.__dict__)
+            self.events.publish(ev.TX_ADVANCED_B, {"tx_id": tx_id, "tx": dict(my_tx.__dict__)})
             return my_tx.__dict__
 
-    def advance_c(self, target_index: int, validator_address: str) -> Optional[Dict]:
+    def _snapshot_c(self, target_ref: Union[int, str]) -> Optional[Tuple[Dict, Dict, Dict, Branch]]:
+        with self._lock:
+            target_tx_dict = self._entry(target_ref)
+            if target_tx_dict is None:
+                return None
+            # Balance and linkage fields are part of the mined payload, so fix
+            # them now: the block is rebased onto its branch's current tip
+            self.ledger.catch_up(self.blockchain)
+            fixed = self.ledger.preview(target_tx_dict)
+            self.branches.catch_up(self.blockchain)
+            branch = self.branches.branch_for_tx(self.mempool.id_of(target_tx_dict)) or self.branches.get(MAIN)
+            fixed.update(
+                predecessor_id=branch.tip_hash,
+                predecessor_hash=branch.tip_hash,
+                level=branch.level,
+                required_difficulty=ve.difficulty_for_level(branch.level),
+            )
+            return target_tx_dict, dict(target_tx_dict), fixed, branch
+
+    def _append_block(self, block: TransactionBlock) -> int:
+        """Append a confirmed block and advance index, ledger and branches (lock held)."""
+        self.ledger.catch_up(self.blockchain)
+        self.branches.catch_up(self.blockchain)
+        height = self.blockchain.append(block)
+        self.ledger.apply(vars(block))
+        if self.index.indexed == height:
+            self.index.add_block(height, vars(block))
+            self.index.indexed += 1
+        self.branches.add_block(height, vars(block))
+        return height
+
+    def _run_c(
+        self, snap: Tuple[Dict, Dict, Dict, Branch], validator_address: str, cancel: Optional[threading.Event] = None
+    ) -> Optional[Dict]:
+        target_ref, target_snap, fixed, branch = snap
+        target_tx = TransactionBlock(**target_snap)
+        for name, value in fixed.items():
+            setattr(target_tx, name, value)
+        ve.advance_to_state_c(target_tx, validator_address, cancel=cancel)
+        # Blocks racing for the same tip serialise on the branch lock; the
+        # node lock is only held for the short shared commit below
+        with branch.lock:
+            if not branch.open or branch.tip_hash != target_tx.predecessor_hash:
+                return None  # another block extended this branch while we mined
+            with self._lock:
+                if not self._is_current(target_ref, target_snap):
+                    return None
+                self.ledger.catch_up(self.blockchain)
+                if not self.ledger.is_current(vars(target_tx)):
+                    return None  # another block moved these balances while we mined
+                # Move from mempool to blockchain
+                height = self._append_block(target_tx)
+                tx_id = self.mempool.id_of(target_ref)
+                self.mempool.remove(tx_id)
+                self.index.remove_pending(target_ref)
+                self.branches.untrack(tx_id)
+                self.events.publish(ev.BLOCK_APPENDED, {"height": height, "tx_id": tx_id, "block": dict(target_tx.__dict__)})
+                self.events.publish(ev.MEMPOOL_REMOVED, {"tx_id": tx_id, "tx": dict(target_ref), "reason": "confirmed"})
+                return target_tx.__dict__
+
+    def advance_b(self, my_index: Union[int, str], target_index: Union[int, str]) -> Optional[Dict]:
+        """Mine State-B proof synchronously; ``None`` on bad IDs/indices or conflict."""
+        snap = self._snapshot_b(my_index, target_index)
+        return None if snap is None else self._run_b(snap)
+
+    def advance_c(self, target_index: Union[int, str], validator_address: str) -> Optional[Dict]:
+        """Mine State-C proof synchronously; ``None`` on bad ID/index or conflict."""
+        snap = self._snapshot_c(target_index)
+        return None if snap is None else self._run_c(snap, validator_address)
+
+    # ------------------------------------------------------------------
+    # Entries relayed by peers (see pasta.node.gossip)
+    # ------------------------------------------------------------------
+    def _signature_ok(self, entry: Dict) -> bool:
+        """Check a peer entry's signature, and that it covers the entry's amount."""
+        if entry["signature"] is None:
+            return not self.require_signatures
+        signed_amount, signed_timestamp = entry["signed_amount"], entry["signed_timestamp"]
+        if signed_amount is None or signed_timestamp is None:
+            return False
+        # The signer asked for signed_amount; minting turns a request for 0
+        # into the minted amount (at most the policy target), see MintPolicy
+        mint = entry["mint_amount"]
+        requested = 0.0 if mint > 0 else entry["amount"]
+        try:
+            if round(float(signed_amount) * AMOUNT_SCALE) != round(requested * AMOUNT_SCALE):
+                return False
+        except (ValueError, OverflowError):
+            return False
+        if mint > 0 and (mint != entry["amount"] or mint > self.mint_policy.target):
+            return False
+        message = transaction_message(entry["sender_address"], entry["receiver_address"], signed_amount, signed_timestamp)
+        return self.verifier.verify(entry["sender_address"], message, entry["signature"])
+
+    def receive_transaction(self, tx_id: str, entry: Dict) -> str:
+        """Insert a peer's mempool entry under its original ID.
+
+        A State-B copy of an entry held in State A replaces it.  Returns
+        ``ACCEPTED``, ``KNOWN`` or ``REJECTED`` (malformed, badly signed or
+        no room).
+        """
+        try:
+            entry = vars(TransactionBlock(**check_fields(entry)))
+        except ValueError:
+            return REJECTED
+        if entry["state"] not in ("A", "B") or not isinstance(tx_id, str) or not self._signature_ok(entry):
+            return REJECTED
         with self._lock:
+            old = self.mempool.get(tx_id)
+            if old is not None:
+                if not (old["state"] == "A" and entry["state"] == "B"):
+                    return KNOWN
+                if any(old[name] != entry[name] for name in _TX_IDENTITY):
+                    return REJECTED  # same ID, different transaction
+                self.mempool.replace(tx_id, entry)
+                self.index.replace_pending(old, entry)
+                self.events.publish(ev.TX_ADVANCED_B, {"tx_id": tx_id, "tx": dict(entry), "remote": True})
+                return ACCEPTED
             try:
-                target_tx_dict = self.mempool[target_index]
-            except IndexError:
+                _, evicted = self.mempool.add(entry, tx_id)
+            except MempoolFull:
+                return REJECTED
+            for old_id, old in evicted:
+                self.index.remove_pending(old)
+                self.branches.untrack(old_id)
+                self.events.publish(ev.MEMPOOL_REMOVED, {"tx_id": old_id, "tx": dict(old), "reason": "evicted"})
+            if entry["state"] == "A":
+                try:
+                    self.stats.record(entry["amount"], entry["level"], entry["mint_amount"])
+                except (TypeError, ValueError):
+                    self.mempool.remove(tx_id)  # nothing else refers to it yet
+                    return REJECTED
+            self.index.add_pending(entry)
+            self.branches.catch_up(self.blockchain)
+            self.branches.track_entry(tx_id, entry)
+            if entry["state"] == "A":
+                self.events.publish(ev.TX_CREATED, {"tx_id": tx_id, "tx": dict(entry), "remote": True})
+            else:
+                self.events.publish(ev.TX_ADVANCED_B, {"tx_id": tx_id, "tx": dict(entry), "remote": True})
+            return ACCEPTED
+
+    def receive_block(self, block: Dict, tx_id: Optional[str] = None) -> str:
+        """Append a block confirmed by a peer; its mempool entry *tx_id* leaves ours.
+
+        The proof of work and the balance fields are checked against this
+        node's ledger.  Returns ``ACCEPTED``, ``KNOWN``, ``ORPHAN`` (its
+        predecessor is unknown so far) or ``REJECTED``.
+        """
+        try:
+            block_obj = TransactionBlock(**check_fields(block))
+        except ValueError:
+            return REJECTED
+        if block_obj.required_difficulty != expected_difficulty(block_obj) or not ve.verify_pow(block_obj):
+            return REJECTED
+        with self._lock:
+            self.branches.catch_up(self.blockchain)
+            if self._locate(block_obj.block_hash) is not None:
+                return KNOWN
+            if self._locate(block_obj.predecessor_hash) is None:
+                return ORPHAN
+            branch = self.branches.extends(block_obj.predecessor_hash, block_obj.level)
+        if branch is None:
+            return REJECTED  # forks off below a branch tip
+        # Same lock order as a local confirmation of that branch
+        with branch.lock, self._lock:
+            self.branches.catch_up(self.blockchain)
+            if self._locate(block_obj.block_hash) is not None:
+                return KNOWN
+            if self.branches.extends(block_obj.predecessor_hash, block_obj.level) is not branch:
+                return REJECTED
+            self.ledger.catch_up(self.blockchain)
+            if not self.ledger.is_current(vars(block_obj)):
+                return REJECTED
+            height = self._append_block(block_obj)
+            self.events.publish(
+                ev.BLOCK_APPENDED, {"height": height, "tx_id": tx_id, "block": dict(vars(block_obj)), "remote": True}
+            )
+            entry = self.mempool.get(tx_id) if tx_id else None
+            if entry is not None:
+                self.mempool.remove(tx_id)
+                self.index.remove_pending(entry)
+                self.branches.untrack(tx_id)
+                self.events.publish(ev.MEMPOOL_REMOVED, {"tx_id": tx_id, "tx": dict(entry), "reason": "confirmed"})
+            return ACCEPTED
+
+    # ------------------------------------------------------------------
+    # Branches
+    # ------------------------------------------------------------------
+    def get_branches(self) -> List[Dict]:
+        """Every branch with its level, tip and pending load."""
+        with self._lock:
+            self.branches.catch_up(self.blockchain)
+            return [b.to_dict() for b in self.branches.branches()]
+
+    def aggregate(self, branch_id: int, validator_address: str) -> Optional[Dict]:
+        """Mine an aggregation block merging drained *branch_id* into its parent.
+
+        ``None`` when the branch is not ready (still has pending entries, open
+        children or no blocks) or when the parent moved on while mining.
+        """
+        with self._lock:
+            self.branches.catch_up(self.blockchain)
+            child = self.branches.get(branch_id)
+            if child is None or child not in self.branches.drained():
                 return None
-            target_tx = TransactionBlock(**target_tx_dict)
-            ve.advance_to_state_c(target_tx, validator_address)
-            # Move from mempool to blockchain
-            self.blockchain.append(target_tx.__dict__)
-            self.mempool.pop(target_index)
-            return target_tx.__dict__
+            parent = self.branches.get(child.parent)
+            child.open = False  # no new transactions while the aggregation is mined
+            block = TransactionBlock(
+                sender_address=AGGREGATION,
+                receiver_address=AGGREGATION,
+                amount=0,
+                timestamp=int(time.time()),
+                predecessor_id=parent.tip_hash,
+                predecessor_hash=parent.tip_hash,
+                level=parent.level,
+                validated_block_id=child.tip_hash,
+                validated_block_hash=child.tip_hash,
+                required_difficulty=ve.difficulty_for_level(parent.level),
+            )
+            self.ledger.catch_up(self.blockchain)
+            for name, value in self.ledger.preview(vars(block)).items():
+                setattr(block, name, value)
+            child_tip = child.tip_hash
+        try:
+            ve.advance_to_state_c(block, validator_address)
+        except BaseException:
+            child.open = True
+            raise
+        with parent.lock, child.lock:
+            with self._lock:
+                if not (parent.open and parent.tip_hash == block.predecessor_hash and child.tip_hash == child_tip):
+                    child.open = True  # lost the race: try again later
+                    return None
+                self.ledger.catch_up(self.blockchain)
+                height = self._append_block(block)
+                self.events.publish(ev.BLOCK_APPENDED, {"height": height, "tx_id": None, "block": dict(vars(block))})
+                self.events.publish(ev.BRANCH_MERGED, {"branch": child.to_dict(), "into": parent.branch_id})
+                return vars(block)
+
+    # ------------------------------------------------------------------
+    # Asynchronous mining jobs
+    # ------------------------------------------------------------------
+    def submit_advance_b(self, my_index: Union[int, str], target_index: Union[int, str]) -> Optional[MiningJob]:
+        """Queue an advance_b job; ``None`` on bad indices, JobQueueFull when saturated."""
+        snap = self._snapshot_b(my_index, target_index)
+        return None if snap is None else self.jobs.submit("advance_b", partial(self._run_b, snap))
+
+    def submit_advance_c(self, target_index: Union[int, str], validator_address: str) -> Optional[MiningJob]:
+        """Queue an advance_c job; ``None`` on bad index, JobQueueFull when saturated."""
+        snap = self._snapshot_c(target_index)
+        if snap is None:
+            return None
+        return self.jobs.submit("advance_c", partial(self._run_c, snap, validator_address))
 
     # ------------------------------------------------------------------
     # REST server convenience
     # ------------------------------------------------------------------
-    def create_flask_app(self, import_name: str = "pasta_node_app") -> Flask:
-        """Return a Flask app exposing the standard node JSON API."""
-        from flask import Flask, jsonify, request  # local import to avoid mandatory dep
+    def create_flask_app(
+        self, import_name: str = "pasta_node_app", fast_json: bool = True, block_cache: int = DEFAULT_BLOCK_CACHE
+    ) -> Flask:
+        """Return a Flask app exposing the standard node JSON API.
+
+        *fast_json* encodes responses with orjson (see pasta.node.render);
+        the JSON of up to *block_cache* served blocks is kept pre-rendered.
+        """
+        import json
+
+        from flask import Flask, Response, abort, jsonify, request, stream_with_context  # local import to avoid mandatory dep
         from flask_cors import CORS
 
         app = Flask(import_name)
         CORS(app)
+        app.json = json_provider(app, fast_json)
+        encode = _dumps if fast_json else lambda obj: app.json.dumps(obj).encode()
+        rendered = BlockJSONCache(block_cache, encode)
+        app.extensions["pasta_block_cache"] = rendered
 
         # closure variables
         node = self
 
+        # -- chain / mempool listing ------------------------------------
+        # Without query parameters both routes return the full JSON list as
+        # before.  ?from_height=/?since_height=/?offset=&limit= return one
+        # page plus a cursor.  The tail filters differ per route:
+        # ?since_height=<h> on /blockchain is a block height (everything
+        # above it), ?since_ts=<t> on /mempool a Unix timestamp (entries
+        # newer than it); plain ?since= is the legacy spelling of both.
+        # ?stream=1 (or Accept: application/x-ndjson) streams NDJSON
+        # from a snapshot taken up front.  Chain rows are read under the node
+        # lock (see _rendered) so that a concurrent prune cannot remove them.
+        def _int_arg(name: str, default: Optional[int], minimum: Optional[int] = 0) -> Optional[int]:
+            raw = request.args.get(name)
+            if raw is None:
+                return default
+            try:
+                value = int(raw)
+            except ValueError:
+                abort(400, f"{name} must be an int")
+            if minimum is not None and value < minimum:
+                abort(400, f"{name} must be >= {minimum}")
+            return value
+
+        def _wants_stream() -> bool:
+            if request.args.get("stream") in ("1", "true"):
+                return True
+            return request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+        def _ndjson(rows):
+            def _generate():
+                batch = []
+                for row in rows:
+                    batch.append(row if isinstance(row, bytes) else encode(row))
+                    if len(batch) == 256:
+                        yield b"\n".join(batch) + b"\n"
+                        batch = []
+                if batch:
+                    yield b"\n".join(batch) + b"\n"
+
+            return Response(_generate(), mimetype=NDJSON_MIMETYPE)
+
+        def _json(data: bytes):
+            return Response(data, mimetype="application/json")
+
+        # Confirmed blocks are immutable: chain routes splice pre-rendered rows.
+        # Node.prune (checkpoints) drops the oldest ones, so rows are read
+        # RENDER_CHUNK at a time under the node lock.  A listing whose first
+        # rows were pruned meanwhile starts at the new base; one overtaken by
+        # a prune after it began ends there instead of skipping rows.
+        def _rendered(start: int, stop: int):
+            store, pos = node.blockchain, start
+            while pos < stop:
+                with node._lock:
+                    if pos < store.base:
+                        if pos > start:
+                            return
+                        pos = start = store.base
+                    end = max(pos, min(stop, pos + RENDER_CHUNK))
+                    rows = rendered.rows(store, pos, end)
+                yield from rows
+                pos = end
+
         @app.route("/blockchain")
         def _get_chain():
-            return jsonify(node.get_blockchain())
+            chain = node.get_blockchain()  # lazy, fixed-length snapshot
+            first = chain.first_height  # > 0 once pruned behind a checkpoint
+            paged = any(k in request.args for k in ("from_height", "since_height", "since", "limit"))
+            start = max(first, _int_arg("from_height", 0))
+            since = _int_arg("since_height", _int_arg("since", None, minimum=None), minimum=None)
+            if since is not None:
+                start = max(first, since + 1)  # tail query: every block above height *since*
+            stop = first + len(chain)
+            if _wants_stream():
+                limit = _int_arg("limit", None, minimum=1)
+                return _ndjson(_rendered(start, stop if limit is None else min(stop, start + limit)))
+            if not paged:
+                return _json(b"[" + b",".join(_rendered(first, stop)) + b"]")
+            limit = min(_int_arg("limit", DEFAULT_PAGE_SIZE, minimum=1), MAX_PAGE_SIZE)  # 0 would never advance
+            with node._lock:  # one page (at most MAX_PAGE_SIZE rows) is read in one go
+                start = max(start, node.blockchain.base)
+                end = max(start, min(stop, start + limit))
+                page = rendered.array(node.blockchain, start, end)
+            tip = stop - 1
+            cursor = {"from_height": start, "next_from_height": end if end <= tip else None, "tip_height": tip}
+            return _json(b'{"blocks":' + page + b"," + encode(cursor)[1:])
+
+        # -- header-first sync (see pasta.node.sync) ---------------------
+        def _sync_range(max_limit: int):
+            chain = node.blockchain
+            tip, base = len(chain), chain.base
+            start = _int_arg("from_height", base)
+            if start < base:
+                abort(410, f"blocks below {base} were pruned")
+            stop = max(start, min(tip, start + min(_int_arg("limit", max_limit), max_limit)))
+            headers = {"X-From-Height": str(start), "X-Tip-Height": str(tip - 1)}
+            return chain, start, stop, headers
+
+        @app.route("/sync/headers")
+        def _sync_headers():
+            chain, start, stop, headers = _sync_range(MAX_SYNC_HEADERS)
+            return Response(chain.hashes(start, stop), mimetype=SYNC_MIMETYPE, headers=headers)
+
+        @app.route("/sync/blocks")
+        def _sync_blocks():
+            chain, start, stop, headers = _sync_range(MAX_SYNC_BLOCKS)
+            return Response(pack_records(chain.records(start, stop)), mimetype=SYNC_MIMETYPE, headers=headers)
 
         @app.route("/mempool")
         def _get_mempool():
-            return jsonify(node.get_mempool())
+            mempool = node.get_mempool(with_ids=True)  # copies taken under the lock
+            name = "since_ts" if "since_ts" in request.args else "since"
+            since = request.args.get(name)
+            if since is not None:
+                try:
+                    ts = float(since)
+                except ValueError:
+                    abort(400, f"{name} must be a timestamp")
+                mempool = [tx for tx in mempool if tx["timestamp"] > ts]
+            if _wants_stream():
+                return _ndjson(mempool)
+            if since is None and not any(k in request.args for k in ("offset", "limit")):
+                return jsonify(mempool)
+            offset = _int_arg("offset", 0)
+            limit = min(_int_arg("limit", DEFAULT_PAGE_SIZE, minimum=1), MAX_PAGE_SIZE)
+            page = mempool[offset : offset + limit]
+            end = offset + len(page)
+            return jsonify(
+                {"transactions": page, "offset": offset, "next_offset": end if end < len(mempool) else None}
+            )
+
+        @app.route("/mempool/next")
+        def _next_ready():
+            tx = node.next_ready(request.args.get("state", "B"))
+            if tx is None:
+                return "No transaction in that state", 404
+            return jsonify(tx)
+
+        @app.route("/mempool/<tx_id>")
+        def _get_mempool_tx(tx_id):
+            tx = node.get_mempool_tx(tx_id)
+            if tx is None:
+                return "Unknown transaction", 404
+            return jsonify(tx)
+
+        @app.route("/events")
+        def _events():
+            """Server-Sent Events feed; resume with ?since=<seq> or Last-Event-ID."""
+            try:
+                last = int(request.args.get("since", request.headers.get("Last-Event-ID", node.events.last_seq)))
+            except ValueError:
+                abort(400, "since must be an int")
+
+            def _generate(seq: int):
+                yield "retry: 2000\n\n"
+                if seq > node.events.last_seq:  # cursor from before a node restart
+                    seq = node.events.last_seq
+                    yield f"event: reset\ndata: {json.dumps({'seq': seq})}\n\n"
+                while True:
+                    events, complete = node.events.wait(seq, timeout=SSE_KEEPALIVE)
+                    if not complete:
+                        # history no longer reaches back: client must re-sync over REST
+                        yield f"event: reset\ndata: {json.dumps({'seq': node.events.last_seq})}\n\n"
+                    if not events:
+                        yield ": keepalive\n\n"
+                        continue
+                    for e in events:
+                        yield f"id: {e.seq}\nevent: {e.kind}\ndata: {json.dumps(e.to_dict())}\n\n"
+                    seq = events[-1].seq
+
+            headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            return Response(_generate(last), mimetype="text/event-stream", headers=headers)
+
+        @app.route("/block/<block_hash>")
+        def _get_block(block_hash):
+            with node._lock:  # a prune must not drop the row between lookup and read
+                height = node._locate(block_hash)
+                if height is None:
+                    return "Unknown block", 404
+                return _json(rendered.with_height(node.blockchain, height))
+
+        @app.route("/block/<block_hash>/children")
+        def _get_children(block_hash):
+            return jsonify(node.get_children(block_hash))
+
+        @app.route("/block/<block_hash>/validators")
+        def _get_validators(block_hash):
+            return jsonify(node.get_validators(block_hash))
+
+        @app.route("/balance/<address>")
+        def _get_balance(address):
+            return jsonify(node.get_balance(address))
+
+        @app.route("/address/<address>/txs")
+        def _get_address_txs(address):
+            return jsonify(node.get_address_txs(address))
 
         @app.route("/generate_keypair")
         def _gen_keypair():
@@ -158,32 +1050,75 @@ class Node:
 
         @app.route("/create_transaction", methods=["POST"])
         def _create_tx():
-            data = request.get_json() or {}
-            required = {"sender", "receiver", "amount"}
-            if not required.issubset(set(data)):
-                return "Missing fields", 400
-
+            data = request.get_json(silent=True) or {}
             try:
-                amount = float(data["amount"])
-            except ValueError:
-                return "Bad amount", 400
-
-            tx = node.create_transaction(data["sender"], data["receiver"], amount)
+                tx = node.admission.submit(data).result(timeout=ADMISSION_TIMEOUT)
+            except AdmissionRejected as exc:
+                return exc.reason, exc.status
+            except FutureTimeout:
+                return jsonify({"message": "admission timed out"}), 503, {"Retry-After": "1"}
             return jsonify({"message": "State A created", "tx": tx}), 201
 
+        # -- bulk submission: a JSON list ({"transactions": [...]} also works)
+        # of up to MAX_BATCH_SIZE payloads, or NDJSON of any length that is
+        # admitted MAX_BATCH_SIZE at a time with results streamed back
+        @app.route("/transactions/batch", methods=["POST"])
+        def _create_batch():
+            if request.mimetype == NDJSON_MIMETYPE:
+                return _create_ndjson_batch()
+            data = request.get_json(silent=True)
+            if isinstance(data, dict):
+                data = data.get("transactions")
+            if not isinstance(data, list):
+                abort(400, "expected a JSON list of transactions")
+            if len(data) > MAX_BATCH_SIZE:
+                abort(413, f"at most {MAX_BATCH_SIZE} transactions per JSON batch; send NDJSON")
+            results = node.create_transactions(data)
+            accepted = sum(r["status"] == 201 for r in results)
+            return jsonify({"accepted": accepted, "rejected": len(results) - accepted, "results": results})
+
+        def _create_ndjson_batch():
+            stream = request.stream
+
+            def _generate():
+                chunk = []
+                for line in stream:
+                    if not line.strip():
+                        continue
+                    try:
+                        chunk.append(_loads(line))
+                    except ValueError:
+                        chunk.append(None)  # rejected by the syntax stage, keeps results aligned
+                    if len(chunk) == MAX_BATCH_SIZE:
+                        yield b"".join(encode(r) + b"\n" for r in node.create_transactions(chunk))
+                        chunk = []
+                if chunk:
+                    yield b"".join(encode(r) + b"\n" for r in node.create_transactions(chunk))
+
+            return Response(stream_with_context(_generate()), mimetype=NDJSON_MIMETYPE)
+
+        @app.route("/admission")
+        def _admission_metrics():
+            return jsonify(node.admission.metrics())
+
+        # Mempool entries are named by "<role>_id" (stable tx ID) or, as
+        # before, "<role>_index" (position); aborts 400 when neither works.
+        def _ref(data: Dict, role: str) -> Union[int, str]:
+            if f"{role}_id" in data:
+                if not isinstance(data[f"{role}_id"], str):
+                    abort(400, "IDs must be strings")
+                return data[f"{role}_id"]
+            if f"{role}_index" not in data:
+                abort(400, "Missing fields")
+            try:
+                return int(data[f"{role}_index"])
+            except (TypeError, ValueError):
+                abort(400, "Index must be int")
+
         @app.route("/advance_b", methods=["POST"])
         def _advance_b():
             data = request.get_json() or {}
-            required = {"my_index", "target_index"}
-            if not required.issubset(set(data)):
-                return "Missing fields", 400
-            try:
-                my_idx = int(data["my_index"])
-                tgt_idx = int(data["target_index"])
-            except ValueError:
-                return "Index must be int", 400
-
-            tx = node.advance_b(my_idx, tgt_idx)
+            tx = node.advance_b(_ref(data, "my"), _ref(data, "target"))
             if tx is None:
                 return "Bad indices", 400
             return jsonify({"message": "Advanced to B", "tx": tx})
@@ -191,23 +1126,150 @@ class Node:
         @app.route("/advance_c", methods=["POST"])
         def _advance_c():
             data = request.get_json() or {}
-            required = {"target_index", "validator"}
-            if not required.issubset(set(data)):
+            if "validator" not in data:
                 return "Missing fields", 400
-            try:
-                tgt_idx = int(data["target_index"])
-            except ValueError:
-                return "Index must be int", 400
-            tx = node.advance_c(tgt_idx, data["validator"])
+            tx = node.advance_c(_ref(data, "target"), data["validator"])
             if tx is None:
                 return "Bad index", 400
             return jsonify({"message": "Moved to blockchain", "tx": tx})
 
+        @app.route("/checkpoint", methods=["GET"])
+        def _get_checkpoint():
+            if node.last_checkpoint is None:
+                return "No checkpoint yet", 404
+            return jsonify(node.last_checkpoint)
+
+        @app.route("/checkpoint", methods=["POST"])
+        def _make_checkpoint():
+            data = request.get_json() or {}
+            if "validator" not in data:
+                return "Missing fields", 400
+            block = node.checkpoint(data["validator"])
+            if block is None:
+                return "Chain moved while mining, retry", 409
+            return jsonify({"message": "Checkpoint created", "block": block})
+
+        @app.route("/stats")
+        def _get_stats():
+            return jsonify(node.get_stats())
+
+        @app.route("/branches")
+        def _get_branches():
+            return jsonify(node.get_branches())
+
+        @app.route("/branches/<int:branch_id>/aggregate", methods=["POST"])
+        def _aggregate(branch_id):
+            data = request.get_json() or {}
+            if "validator" not in data:
+                return "Missing fields", 400
+            block = node.aggregate(branch_id, data["validator"])
+            if block is None:
+                return "Branch cannot be aggregated", 400
+            return jsonify({"message": "Branch merged", "block": block})
+
+        # -- asynchronous mining jobs -----------------------------------
+        def _accepted(job: Optional[MiningJob], error: str):
+            if job is None:
+                return error, 400
+            body = job.to_dict()
+            body["poll"] = f"/jobs/{job.job_id}"
+            return jsonify(body), 202
+
+        @app.errorhandler(JobQueueFull)
+        @app.errorhandler(AdmissionQueueFull)
+        @app.errorhandler(MempoolFull)
+        def _queue_full(exc):
+            return jsonify({"message": str(exc)}), 503, {"Retry-After": "1"}
+
+        @app.route("/jobs/advance_b", methods=["POST"])
+        def _job_advance_b():
+            data = request.get_json() or {}
+            return _accepted(node.submit_advance_b(_ref(data, "my"), _ref(data, "target")), "Bad indices")
+
+        @app.route("/jobs/advance_c", methods=["POST"])
+        def _job_advance_c():
+            data = request.get_json() or {}
+            if "validator" not in data:
+                return "Missing fields", 400
+            return _accepted(node.submit_advance_c(_ref(data, "target"), data["validator"]), "Bad index")
+
+        # -- automatic validation -------------------------------------
+        @app.route("/matcher")
+        def _matcher_stats():
+            if node.matcher is None:
+                return jsonify({"running": False})
+            return jsonify(node.matcher.stats())
+
+        @app.route("/matcher/start", methods=["POST"])
+        def _matcher_start():
+            data = request.get_json() or {}
+            if "validator" not in data:
+                return "Missing fields", 400
+            try:
+                workers = int(data.get("workers", 1))
+            except (TypeError, ValueError):
+                return "workers must be int", 400
+            if workers < 1:
+                return "workers must be >= 1", 400
+            return jsonify(node.start_matcher(data["validator"], workers).stats())
+
+        @app.route("/matcher/stop", methods=["POST"])
+        def _matcher_stop():
+            node.stop_matcher()
+            return _matcher_stats()
+
+        @app.route("/peers")
+        def _peers():
+            if node.gossip is None:
+                return "Gossip is not running", 404
+            return jsonify(node.gossip.stats())
+
+        @app.route("/peers", methods=["POST"])
+        def _add_peer():
+            data = request.get_json(silent=True)
+            if node.gossip is None:
+                return "Gossip is not running", 404
+            if not isinstance(data, dict) or "host" not in data or "port" not in data:
+                return "Missing fields", 400
+            host, port = data["host"], data["port"]
+            if not isinstance(host, str) or not host:
+                return "host must be a non-empty string", 400
+            if isinstance(port, str) and port.isdigit():
+                port = int(port)
+            if not (type(port) is int and 0 < port < 65536):
+                return "port must be an int in 1..65535", 400
+            peer = node.gossip.connect_threadsafe(host, port)
+            if peer is None:
+                return "Peer unreachable or refused", 409
+            return jsonify(peer.to_dict())
+
+        @app.route("/jobs/<job_id>", methods=["GET"])
+        def _job_status(job_id):
+            job = node.jobs.get(job_id)
+            if job is None:
+                return "Unknown job", 404
+            return jsonify(job.to_dict())
+
+        @app.route("/jobs/<job_id>", methods=["DELETE"])
+        def _job_cancel(job_id):
+            job = node.jobs.cancel(job_id)
+            if job is None:
+                return "Unknown job", 404
+            return jsonify(job.to_dict())
+
         return app
 
-    def start_rest_server(self, host: str = "0.0.0.0", port: int = 5000, threaded: bool = True):
-        """Convenience wrapper to run Flask dev server synchronously."""
+    def start_rest_server(self, host: str = "0.0.0.0", port: int = 5000, threaded: bool = True, workers: int = 0):
+        """Convenience wrapper to run Flask dev server synchronously.
+
+        With *workers* > 0 the app is served by that many gunicorn workers
+        that share this node over IPC instead (see pasta.network.ipc).
+        """
         app = self.create_flask_app()
+        if workers:
+            from pasta.network.ipc import serve
+
+            return serve(app, host, port, workers=workers)
         app.run(host=host, port=port, threaded=threaded)
 
 
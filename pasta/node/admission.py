@@ -0,0 +1,311 @@
+"""Staged admission pipeline in front of the mempool.
+
+Transactions submitted over REST pass four stages, each with its own bounded
+queue, worker thread and counters, cheapest first so that junk is dropped
+before it costs any elliptic-curve work:
+
+1. **syntax** – required fields, types, finite non-negative amount, and a
+   signature + timestamp when the node requires signatures;
+2. **dedupe** – the transaction hash (sha256 over sender, receiver, amount,
+   timestamp and signature) is looked up in a window of recently seen
+   hashes; replays are rejected with ``409``.  A hash is released again
+   when a later stage rejects the submission, so a retry after a ``503``
+   is admitted rather than reported as a replay.  Unsigned submissions
+   without a timestamp carry no identity and skip this stage;
+3. **verify** – signatures are checked in batches by the node's
+   :class:`pasta.core.verify.BatchVerifier` (process pool + memo) against
+   the amount and timestamp exactly as sent, which the entry keeps as
+   ``signed_amount`` / ``signed_timestamp`` for peers to check again;
+4. **insert** – the node adds the State-A entries of a whole batch under
+   one acquisition of its lock (``503`` for an item when the mempool is full
+   and nothing can be evicted).
+
+Each stage drains up to ``batch`` items per wake-up.  :meth:`submit`
+returns a ``Future`` that resolves to the new mempool entry or fails with
+:class:`AdmissionRejected`; when the first queue is full it raises
+:class:`AdmissionQueueFull` so the REST layer can answer ``503``.
+:meth:`admit_many` runs a caller's batch through the same stages on the
+calling thread instead (``Node.create_transactions``, ``/transactions/batch``).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pasta.core.crypto import transaction_message
+from pasta.node.mempool import MempoolFull
+
+__all__ = ["AdmissionPipeline", "AdmissionQueueFull", "AdmissionRejected", "Submission"]
+
+SYNTAX, DEDUPE, VERIFY, INSERT = "syntax", "dedupe", "verify", "insert"
+STAGES = (SYNTAX, DEDUPE, VERIFY, INSERT)
+
+
+class AdmissionRejected(Exception):
+    """A submission failed *stage*; ``status`` is the HTTP code to answer with."""
+
+    def __init__(self, stage: str, reason: str, status: int = 400) -> None:
+        super().__init__(reason)
+        self.stage = stage
+        self.reason = reason
+        self.status = status
+
+
+class AdmissionQueueFull(Exception):
+    """Raised by :meth:`AdmissionPipeline.submit` when the syntax queue is full."""
+
+
+@dataclass
+class Submission:
+    data: Dict[str, Any]
+    sender: str = ""
+    receiver: str = ""
+    amount: float = 0.0
+    signature: Optional[str] = None
+    timestamp: Optional[float] = None
+    signed: Optional[Tuple[str, str]] = None  # amount and timestamp text of the signed message
+    tx_hash: Optional[bytes] = None  # set once the hash is recorded as seen
+    tx_id: Optional[str] = None
+    future: Future = field(default_factory=Future)
+    created: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class StageMetrics:
+    received: int = 0
+    passed: int = 0
+    rejected: int = 0
+    batches: int = 0
+    busy_seconds: float = 0.0
+
+    def to_dict(self, queued: int) -> Dict[str, Any]:
+        return {
+            "queued": queued,
+            "received": self.received,
+            "passed": self.passed,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 6),
+        }
+
+
+# A stage maps a batch to one outcome per item: None (passed) or (reason, status)
+_Outcome = Optional[Tuple[str, int]]
+
+
+class AdmissionPipeline:
+    """syntax → dedupe → verify → insert, one thread and queue per stage."""
+
+    def __init__(
+        self,
+        node,
+        max_queue: int = 10_000,
+        batch: int = 256,
+        dedupe_window: int = 100_000,
+    ) -> None:
+        self.node = node
+        self.max_queue = max_queue
+        self.batch = batch
+        self.dedupe_window = dedupe_window
+
+        self._queues: Dict[str, "queue.Queue[Submission]"] = {s: queue.Queue(maxsize=max_queue) for s in STAGES}
+        self._metrics: Dict[str, StageMetrics] = {s: StageMetrics() for s in STAGES}
+        self._handlers: Dict[str, Callable[[List[Submission]], List[_Outcome]]] = {
+            SYNTAX: self._syntax,
+            DEDUPE: self._dedupe,
+            VERIFY: self._verify,
+            INSERT: self._insert,
+        }
+        self._seen: "OrderedDict[bytes, None]" = OrderedDict()
+        self._seen_lock = threading.Lock()  # the dedupe worker and admit_many callers share it
+        self._lock = threading.Lock()
+        self._threads: list = []
+        self.completed = 0
+        self.latency_seconds = 0.0  # summed submit → resolved time of admitted txs
+
+    # ------------------------------------------------------------------
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        for i, stage in enumerate(STAGES):
+            nxt = STAGES[i + 1] if i + 1 < len(STAGES) else None
+            t = threading.Thread(target=self._worker, args=(stage, nxt), name=f"pasta-admit-{stage}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, data: Dict[str, Any]) -> "Future[Dict]":
+        """Queue a ``/create_transaction`` payload; the future yields the mempool entry."""
+        sub = Submission(data=data)
+        with self._lock:
+            self._ensure_workers()
+        try:
+            self._queues[SYNTAX].put_nowait(sub)
+        except queue.Full:
+            raise AdmissionQueueFull(f"{self.max_queue} transactions already waiting for admission") from None
+        return sub.future
+
+    def admit_many(self, payloads: List[Dict[str, Any]]) -> List[Submission]:
+        """Run *payloads* through every stage on the calling thread, one batch per stage.
+
+        Every returned submission's future is resolved; admitted ones also
+        carry their ``tx_id``.
+        """
+        subs = [Submission(data=data) for data in payloads]
+        items = subs
+        for stage in STAGES:
+            if not items:
+                break
+            items = self._run_stage(stage, items)
+        return subs
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {s: self._metrics[s].to_dict(self._queues[s].qsize()) for s in STAGES}
+            avg = self.latency_seconds / self.completed if self.completed else 0.0
+            return {"stages": stages, "admitted": self.completed, "avg_latency_seconds": avg}
+
+    # ------------------------------------------------------------------
+    def _worker(self, stage: str, nxt: Optional[str]) -> None:
+        q = self._queues[stage]
+        while True:
+            items = [q.get()]
+            while len(items) < self.batch:
+                try:
+                    items.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            for sub in self._run_stage(stage, items):
+                if nxt is not None:
+                    self._queues[nxt].put(sub)  # blocks: back-pressure from slower stages
+            for _ in items:
+                q.task_done()
+
+    def _run_stage(self, stage: str, items: List[Submission]) -> List[Submission]:
+        """Run *stage* on *items*; rejected futures fail, the passed items are returned."""
+        start = time.perf_counter()
+        try:
+            outcomes = self._handlers[stage](items)
+        except Exception as exc:  # never let one bad batch kill the stage
+            outcomes = [(f"{stage} failed: {exc}", 500)] * len(items)
+        busy = time.perf_counter() - start
+
+        passed = []
+        for sub, outcome in zip(items, outcomes):
+            if outcome is None:
+                passed.append(sub)
+            else:
+                self._release(sub)
+                if not sub.future.done():
+                    sub.future.set_exception(AdmissionRejected(stage, *outcome))
+        metrics = self._metrics[stage]
+        with self._lock:
+            metrics.received += len(items)
+            metrics.passed += len(passed)
+            metrics.rejected += len(items) - len(passed)
+            metrics.batches += 1
+            metrics.busy_seconds += busy
+        return passed
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+    def _syntax(self, items: List[Submission]) -> List[_Outcome]:
+        return [self._check_syntax(sub) for sub in items]
+
+    def _check_syntax(self, sub: Submission) -> _Outcome:
+        data = sub.data
+        if not isinstance(data, dict) or not {"sender", "receiver", "amount"}.issubset(data):
+            return "Missing fields", 400
+        sender, receiver = data["sender"], data["receiver"]
+        if not (isinstance(sender, str) and sender and isinstance(receiver, str) and receiver):
+            return "sender and receiver must be non-empty strings", 400
+        try:
+            amount = float(data["amount"])
+        except (TypeError, ValueError):
+            return "Bad amount", 400
+        if not math.isfinite(amount) or amount < 0:
+            return "Bad amount", 400
+
+        signature, timestamp = data.get("signature"), data.get("timestamp")
+        if signature is None:
+            if self.node.require_signatures:
+                return "Missing signature", 400
+        elif not isinstance(signature, str) or not signature:
+            return "Bad signature", 400
+        if timestamp is not None:
+            try:
+                timestamp = float(timestamp)
+            except (TypeError, ValueError):
+                return "Bad timestamp", 400
+        elif signature is not None:
+            return "Signed transactions need the signed timestamp", 400
+
+        sub.sender, sub.receiver, sub.amount = sender, receiver, amount
+        sub.signature, sub.timestamp = signature, timestamp
+        if signature is not None:
+            # The signer formatted the values as sent ("5" and "5.0" differ)
+            sub.signed = (str(data["amount"]), str(data["timestamp"]))
+        return None
+
+    def _dedupe(self, items: List[Submission]) -> List[_Outcome]:
+        outcomes: List[_Outcome] = []
+        for sub in items:
+            if sub.timestamp is None and sub.signature is None:
+                outcomes.append(None)
+                continue
+            ident = json.dumps([sub.sender, sub.receiver, sub.amount, sub.timestamp, sub.signature])
+            tx_hash = hashlib.sha256(ident.encode()).digest()
+            with self._seen_lock:
+                if tx_hash in self._seen:
+                    outcomes.append(("Duplicate transaction", 409))
+                    continue
+                self._seen[tx_hash] = None
+                if len(self._seen) > self.dedupe_window:
+                    self._seen.popitem(last=False)
+            sub.tx_hash = tx_hash
+            outcomes.append(None)
+        return outcomes
+
+    def _release(self, sub: Submission) -> None:
+        # A rejected submission was never admitted: forget its hash so the
+        # client can retry (a duplicate rejected by dedupe never recorded one)
+        if sub.tx_hash is not None:
+            with self._seen_lock:
+                self._seen.pop(sub.tx_hash, None)
+            sub.tx_hash = None
+
+    def _verify(self, items: List[Submission]) -> List[_Outcome]:
+        signed = [sub for sub in items if sub.signature is not None]
+        checks = [
+            (sub.sender, transaction_message(sub.sender, sub.receiver, *sub.signed), sub.signature)
+            for sub in signed
+        ]
+        bad = {id(sub) for sub, ok in zip(signed, self.node.verifier.verify_many(checks)) if not ok}
+        return [("Invalid signature", 400) if id(sub) in bad else None for sub in items]
+
+    def _insert(self, items: List[Submission]) -> List[_Outcome]:
+        # Signatures were checked by the verify stage: insert the whole batch
+        # under one acquisition of the node lock
+        results = self.node._create_many([(sub.sender, sub.receiver, sub.amount, sub.signature, sub.signed) for sub in items])
+        outcomes: List[_Outcome] = []
+        now = time.perf_counter()
+        for sub, result in zip(items, results):
+            if isinstance(result, MempoolFull):
+                outcomes.append((str(result), 503))
+                continue
+            outcomes.append(None)
+            sub.tx_id, tx = result
+            sub.future.set_result(tx)
+        with self._lock:
+            admitted = [sub for sub in items if sub.tx_id is not None]
+            self.completed += len(admitted)
+            self.latency_seconds += sum(now - sub.created for sub in admitted)
+        return outcomes
@@ -0,0 +1,268 @@
+"""Branch-aware view of the chain: splits, levels and aggregation.
+
+The block store stays one append-only log in confirmation order; what it
+holds is a DAG.  :class:`BranchTable` tracks which *branch* every block
+belongs to, and each branch's tip:
+
+* the **main** branch (level 0) starts at genesis;
+* a **split** opens a child branch one level up, forking at its parent's
+  current tip.  Higher levels mine at a lower difficulty
+  (:func:`pasta.validation.engine.difficulty_for_level`), so their blocks
+  come faster;
+* an **aggregation block** (sender and receiver :data:`AGGREGATION`) is
+  appended to the parent branch and names the merged child's tip in
+  ``validated_block_id``; the child is closed from then on.
+
+Membership is derived from linkage alone – a block belongs to the branch
+of its predecessor when the levels match, otherwise to the child branch
+keyed by ``(predecessor, level)`` – so the table is rebuilt from any block
+log by :meth:`BranchTable.catch_up` and nothing extra is persisted.
+
+Every confirmation is rebased onto its branch's tip when its proof is
+mined, which makes each branch a linear chain: two blocks racing for the
+same tip conflict, blocks on different branches do not.  Each
+:class:`Branch` carries its own lock, held while a block is checked
+against and appended to that tip.
+
+New transactions go to the open branch with the fewest pending entries
+(:meth:`BranchTable.pick`).  When even that one holds ``split_threshold``
+pending entries the mempool is saturated and :meth:`BranchTable.split`
+opens a child of it (up to ``max_branches`` open branches).  A child with
+confirmed blocks, no pending entries and no open children of its own is
+ready to be aggregated (:meth:`BranchTable.drained`).
+
+All methods except the per-branch locks expect the caller to hold the
+node lock.
+"""
+from __future__ import annotations
+
+import threading
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from pasta.node.store import BlockStore
+
+__all__ = ["AGGREGATION", "MAIN", "Branch", "BranchTable"]
+
+AGGREGATION = "AGGREGATION"  # sender/receiver marker of aggregation blocks
+MAIN = 0  # branch ID of the main chain
+
+
+@dataclass
+class Branch:
+    branch_id: int
+    level: int
+    parent: Optional[int]
+    fork_hash: str  # block the branch splits from
+    tip_hash: str  # equals fork_hash until the first block lands
+    tip_height: int
+    blocks: int = 0
+    pending: int = 0
+    open: bool = True
+    merged_by: Optional[str] = None  # hash of the aggregation block
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "branch_id": self.branch_id,
+            "level": self.level,
+            "parent": self.parent,
+            "fork_hash": self.fork_hash,
+            "tip_hash": self.tip_hash,
+            "tip_height": self.tip_height,
+            "blocks": self.blocks,
+            "pending": self.pending,
+            "open": self.open,
+            "merged_by": self.merged_by,
+        }
+
+
+class BranchTable:
+    """Branches, their tips and the pending load assigned to each.
+
+    *locate* maps a block hash to its height; it is only consulted for
+    predecessors that are neither a current tip nor a fork point (chains
+    written before blocks were rebased onto their tips).
+    """
+
+    def __init__(
+        self,
+        locate: Callable[[str], Optional[int]],
+        split_threshold: Optional[int] = None,
+        max_branches: int = 8,
+    ) -> None:
+        self.locate = locate
+        self.split_threshold = split_threshold
+        self.max_branches = max_branches
+        self.applied = 0  # number of chain blocks reflected in the table
+        self._branches: Dict[int, Branch] = {}
+        self._keys: Dict[Tuple[str, int], int] = {}  # (fork_hash, level) -> branch ID
+        self._tips: Dict[str, int] = {}  # tip hash -> branch ID
+        self._heights = array("I")  # branch ID per height, from _base on
+        self._base = 0
+        self._assigned: Dict[str, int] = {}  # pending tx ID -> branch ID
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._branches)
+
+    def get(self, branch_id: int) -> Optional[Branch]:
+        return self._branches.get(branch_id)
+
+    def branches(self) -> List[Branch]:
+        return list(self._branches.values())
+
+    def open_branches(self) -> List[Branch]:
+        return [b for b in self._branches.values() if b.open]
+
+    def branch_of(self, block_hash: str) -> Optional[Branch]:
+        """Branch holding the confirmed block *block_hash*."""
+        branch_id = self._tips.get(block_hash)
+        if branch_id is None:
+            height = self.locate(block_hash)
+            if height is None or not 0 <= height - self._base < len(self._heights):
+                return None
+            branch_id = self._heights[height - self._base]
+        return self._branches[branch_id]
+
+    def branch_for_tx(self, tx_id: str) -> Optional[Branch]:
+        """Open branch a pending transaction confirms on (a merged branch's nearest open ancestor)."""
+        branch_id = self._assigned.get(tx_id)
+        if branch_id is None:
+            return None
+        branch = self._branches[branch_id]
+        while not branch.open and branch.parent is not None:
+            branch = self._branches[branch.parent]
+        return branch
+
+    # ------------------------------------------------------------------
+    # Confirmed blocks
+    # ------------------------------------------------------------------
+    def _open(self, parent: Optional[Branch], fork_hash: str, tip_height: int, level: int) -> Branch:
+        branch = Branch(
+            branch_id=len(self._branches),
+            level=level,
+            parent=None if parent is None else parent.branch_id,
+            fork_hash=fork_hash,
+            tip_hash=fork_hash,
+            tip_height=tip_height,
+        )
+        self._branches[branch.branch_id] = branch
+        self._keys[(fork_hash, level)] = branch.branch_id
+        return branch
+
+    def _branch_for(self, predecessor: str, level: int) -> Branch:
+        tip_of = self._tips.get(predecessor)
+        if tip_of is not None and self._branches[tip_of].level == level:
+            return self._branches[tip_of]  # the common case: extends a tip
+        branch_id = self._keys.get((predecessor, level))
+        if branch_id is not None:
+            return self._branches[branch_id]  # first block(s) of a child
+        parent = self.branch_of(predecessor)
+        if parent is None:
+            if not self._branches:
+                return self._open(None, predecessor, -1, level)
+            return self._branches[MAIN]  # unknown predecessor: attach to main
+        if parent.level == level:
+            return parent
+        height = self.locate(predecessor)
+        return self._open(parent, predecessor, -1 if height is None else height, level)
+
+    def extends(self, predecessor: str, level: int) -> Optional[Branch]:
+        """Branch whose lock guards a block linking to *predecessor* at *level*.
+
+        That is the branch whose tip it extends, or the parent of the child
+        branch it starts; ``None`` for a block forking off below a tip.
+        """
+        tip_of = self._tips.get(predecessor)
+        if tip_of is not None and self._branches[tip_of].level == level:
+            return self._branches[tip_of]
+        branch_id = self._keys.get((predecessor, level))
+        if branch_id is not None:
+            branch = self._branches[branch_id]
+            return branch if branch.tip_hash == predecessor else None
+        parent = self.branch_of(predecessor)
+        if parent is not None and parent.level + 1 == level:
+            return parent
+        return None
+
+    def add_block(self, height: int, block: Mapping[str, Any]) -> Branch:
+        """Record the block appended at *height*; returns its branch."""
+        branch = self._branch_for(block["predecessor_hash"], block.get("level", 0))
+        if self._tips.get(branch.tip_hash) == branch.branch_id:
+            del self._tips[branch.tip_hash]
+        branch.tip_hash, branch.tip_height = block["block_hash"], height
+        branch.blocks += 1
+        self._tips[branch.tip_hash] = branch.branch_id
+        self._heights.append(branch.branch_id)
+        if block["sender_address"] == AGGREGATION and block.get("validated_block_id"):
+            merged = self.branch_of(block["validated_block_id"])
+            if merged is not None and merged is not branch:
+                merged.open = False
+                merged.merged_by = block["block_hash"]
+        self.applied += 1
+        return branch
+
+    def catch_up(self, store: BlockStore) -> None:
+        """Apply every block appended to *store* since the last call."""
+        for height in range(self.applied, len(store)):
+            self.add_block(height, store.row(height))
+
+    def prune(self, base: int) -> None:
+        """Forget per-height membership below *base* (tips and branches stay)."""
+        if base > self._base:
+            del self._heights[: base - self._base]
+            self._base = base
+
+    def restore(self, branches: List[Mapping[str, Any]], applied: int) -> None:
+        """Start from a checkpoint's branch list, taken after *applied* blocks."""
+        for data in branches:
+            branch = Branch(**data)
+            self._branches[branch.branch_id] = branch
+            self._keys[(branch.fork_hash, branch.level)] = branch.branch_id
+            if branch.blocks:
+                self._tips[branch.tip_hash] = branch.branch_id
+        self.applied = self._base = applied
+
+    # ------------------------------------------------------------------
+    # Pending load, splits and aggregation
+    # ------------------------------------------------------------------
+    def pick(self) -> Branch:
+        """Open branch a new transaction should build on: least loaded, then highest level."""
+        return min(self.open_branches(), key=lambda b: (b.pending, -b.level, b.branch_id))
+
+    def split(self, branch: Branch) -> Optional[Branch]:
+        """Open a child of *branch* if it is saturated; returns the new branch."""
+        if self.split_threshold is None or branch.pending < self.split_threshold:
+            return None
+        if len(self.open_branches()) >= self.max_branches or (branch.tip_hash, branch.level + 1) in self._keys:
+            return None
+        return self._open(branch, branch.tip_hash, branch.tip_height, branch.level + 1)
+
+    def track(self, tx_id: str, branch: Branch) -> None:
+        self._assigned[tx_id] = branch.branch_id
+        branch.pending += 1
+
+    def track_entry(self, tx_id: str, entry: Mapping[str, Any]) -> Branch:
+        """Assign an existing entry (restored snapshot) by its linkage."""
+        branch = self._branch_for(entry["predecessor_hash"], entry.get("level", 0))
+        self.track(tx_id, branch)
+        return branch
+
+    def untrack(self, tx_id: str) -> None:
+        branch_id = self._assigned.pop(tx_id, None)
+        if branch_id is not None:
+            self._branches[branch_id].pending -= 1
+
+    def drained(self) -> List[Branch]:
+        """Open child branches ready for aggregation, deepest first."""
+        has_open_child = {b.parent for b in self._branches.values() if b.open}
+        ready = [
+            b
+            for b in self._branches.values()
+            if b.open and b.parent is not None and b.blocks and not b.pending and b.branch_id not in has_open_child
+        ]
+        return sorted(ready, key=lambda b: -b.level)
@@ -0,0 +1,111 @@
+"""Balance checkpoints: validated account state for pruning and bootstrap.
+
+A checkpoint is an ordinary block on the main branch – sender and receiver
+:data:`CHECKPOINT`, amount 0 – whose ``validated_block_hash`` commits to
+the whole account state right before it: :func:`state_digest` over every
+``address -> balance`` (fixed point, sorted).  Like any block it carries a
+proof of work; it is mined with its validator and final state already set,
+so :func:`verify_checkpoint` can check it on its own.
+
+The matching state is kept next to the chain as ``checkpoint.json``::
+
+    {"version": 1, "height": ..., "block": {...}, "balances": {...},
+     "tx_counter": ..., "total_amount": ..., "stats": {...}, "branches": [...]}
+
+and served at ``GET /checkpoint``.  With it:
+
+* blocks below the checkpoint height can be pruned (``Node.prune``) – the
+  ledger, branch tips and stats all restart from the checkpoint;
+* a node started with ``Node(bootstrap=state)`` seeds an empty store with
+  the checkpoint block at its height and never replays the blocks before
+  it;
+* a restarted node loads the ledger from the checkpoint instead of
+  replaying the chain from genesis.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from pasta.core.encoding import AMOUNT_SCALE, hashed_payload
+from pasta.core.models import TransactionBlock
+from pasta.node.snapshot import read_snapshot, write_snapshot
+from pasta.validation import engine as ve
+
+__all__ = [
+    "CHECKPOINT",
+    "CHECKPOINT_FILE",
+    "build_checkpoint_block",
+    "expected_difficulty",
+    "read_checkpoint",
+    "state_digest",
+    "verify_checkpoint",
+    "write_checkpoint",
+]
+
+CHECKPOINT = "CHECKPOINT"  # sender/receiver marker of balance checkpoint blocks
+CHECKPOINT_FILE = "checkpoint.json"
+
+# Checkpoint files are atomic JSON documents, written like mempool snapshots
+write_checkpoint = write_snapshot
+
+
+def expected_difficulty(block: TransactionBlock) -> int:
+    """Difficulty *block* must be mined at: its level's, the main chain's for checkpoints.
+
+    A block names its own ``required_difficulty``, so blocks from peers are
+    held to this schedule rather than to the field.
+    """
+    return ve.difficulty_for_level(0 if block.sender_address == CHECKPOINT else block.level)
+
+
+def state_digest(balances: Mapping[str, float]) -> str:
+    """sha256 over the sorted ``address\\0balance`` lines, balances in fixed point."""
+    h = hashlib.sha256()
+    for address in sorted(balances):
+        h.update(b"%s\0%d\n" % (address.encode(), round(balances[address] * AMOUNT_SCALE)))
+    return h.hexdigest()
+
+
+def build_checkpoint_block(predecessor_hash: str, balances: Mapping[str, float], validator_address: str) -> TransactionBlock:
+    """Unmined checkpoint block extending *predecessor_hash* (a main-branch tip)."""
+    return TransactionBlock(
+        sender_address=CHECKPOINT,
+        receiver_address=CHECKPOINT,
+        amount=0,
+        timestamp=int(time.time()),
+        predecessor_id=predecessor_hash,
+        predecessor_hash=predecessor_hash,
+        level=0,
+        validated_block_id=predecessor_hash,
+        validated_block_hash=state_digest(balances),
+        required_difficulty=ve.difficulty_for_level(0),
+        validator_address=validator_address,
+        state="C",
+    )
+
+
+def verify_checkpoint(state: Mapping[str, Any]) -> None:
+    """Raise ``ValueError`` unless *state* is a well-formed, mined checkpoint."""
+    try:
+        block = TransactionBlock(**state["block"])
+        balances, height = state["balances"], int(state["height"])
+        state["tx_counter"], state["total_amount"], state["branches"]
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"malformed checkpoint: {exc}") from None
+    if block.sender_address != CHECKPOINT or height < 0:
+        raise ValueError("not a checkpoint block")
+    if block.required_difficulty != expected_difficulty(block):
+        raise ValueError("checkpoint is not mined at main-chain difficulty")
+    if state_digest(balances) != block.validated_block_hash:
+        raise ValueError("balances do not match the checkpoint digest")
+    digest = hashlib.sha256(hashed_payload(block) + b"%d" % (block.nonce or 0)).hexdigest()
+    if block.nonce is None or digest != block.block_hash or not digest.startswith(ve.pow_prefix(block)):
+        raise ValueError("checkpoint proof of work does not verify")
+
+
+def read_checkpoint(path: str) -> Optional[Dict[str, Any]]:
+    """Load a checkpoint file; ``None`` when missing or unreadable."""
+    state = read_snapshot(path)
+    return state if state is not None and "balances" in state else None
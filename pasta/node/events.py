@@ -0,0 +1,109 @@
+"""Ordered change feed for chain and mempool updates.
+
+Every state change the node commits is published as an :class:`Event` with
+a monotonically increasing ``seq``:
+
+* ``tx-created``      – a State-A transaction entered the mempool
+* ``tx-advanced-b``   – a mempool transaction received its State-B proof
+* ``block-appended``  – a block was confirmed (payload carries ``height``)
+* ``mempool-removed`` – a transaction left the mempool
+* ``branch-opened``   – the mempool saturated and a child branch was split off
+* ``branch-merged``   – an aggregation block merged a branch into its parent
+* ``checkpoint``      – a balance checkpoint block was appended
+* ``chain-synced``    – a range of blocks downloaded from peers was
+  committed (one event per range, no ``block-appended`` per block)
+
+The last ``history`` events are retained so clients can resume from the
+last ``seq`` they saw.  Waiting is done on a condition variable, so idle
+consumers (SSE connections, GUI) cost no CPU and wake up as soon as the
+next event is published.
+
+In-process subscribers registered with :meth:`EventBus.subscribe` are
+called synchronously while the node lock is held; they must be quick and
+must not call back into the node (hand the event to another thread or a Qt
+signal instead).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+__all__ = ["Event", "EventBus"]
+
+TX_CREATED = "tx-created"
+TX_ADVANCED_B = "tx-advanced-b"
+BLOCK_APPENDED = "block-appended"
+MEMPOOL_REMOVED = "mempool-removed"
+BRANCH_OPENED = "branch-opened"
+BRANCH_MERGED = "branch-merged"
+CHECKPOINT = "checkpoint"
+CHAIN_SYNCED = "chain-synced"
+
+
+@dataclass(frozen=True)
+class Event:
+    seq: int
+    kind: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "kind": self.kind, "data": self.data, "timestamp": self.timestamp}
+
+
+class EventBus:
+    """Sequence-numbered publish/subscribe with a bounded replay buffer."""
+
+    def __init__(self, history: int = 10_000) -> None:
+        self._cond = threading.Condition()
+        self._events: Deque[Event] = deque(maxlen=history)
+        self._seq = 0
+        self._subscribers: List[Callable[[Event], None]] = []
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(self, kind: str, data: Dict[str, Any]) -> Event:
+        with self._cond:
+            self._seq += 1
+            event = Event(self._seq, kind, data)
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+            self._cond.notify_all()
+        for callback in subscribers:
+            callback(event)
+        return event
+
+    def subscribe(self, callback: Callable[[Event], None]) -> Callable[[], None]:
+        """Register *callback* for future events; returns an unsubscribe function."""
+        with self._cond:
+            self._subscribers.append(callback)
+
+        def _unsubscribe() -> None:
+            with self._cond:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return _unsubscribe
+
+    def since(self, seq: int) -> Tuple[List[Event], bool]:
+        """Retained events after *seq* and whether the history still reaches back that far."""
+        with self._cond:
+            return self._since_locked(seq)
+
+    def _since_locked(self, seq: int) -> Tuple[List[Event], bool]:
+        if not self._events:
+            return [], True
+        first = self._events[0].seq  # retained events have consecutive seqs
+        return list(islice(self._events, max(0, seq + 1 - first), None)), first <= seq + 1
+
+    def wait(self, seq: int, timeout: Optional[float] = None) -> Tuple[List[Event], bool]:
+        """Block until an event newer than *seq* exists (or *timeout*), then return :meth:`since`."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > seq, timeout)
+            return self._since_locked(seq)
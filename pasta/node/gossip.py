@@ -0,0 +1,407 @@
+"""Peer-to-peer gossip of transactions and blocks.
+
+A :class:`Gossip` service runs on an asyncio loop next to a ``Node`` and
+keeps one persistent TCP connection per peer – every message to that peer
+reuses it, and frames queued together go out in one write.
+
+Wire format: a ``u32`` big-endian length followed by a compact JSON object
+whose ``t`` field is the message type:
+
+* ``hello``   – handshake, sent by both sides first: protocol version, node
+  ID, genesis hash and listen port.  A version or genesis mismatch, a
+  second connection to the same node or a full peer table disconnects;
+* ``inv``     – inventory announcement, ``items = [[kind, id], ...]`` where
+  kind is ``tx`` (id ``<tx_id>:<state>``) or ``block`` (the block hash);
+* ``getdata`` – request for announced items;
+* ``tx`` / ``block`` – a body, with the mempool ``tx_id`` it belongs to.
+
+Propagation is inventory first.  Anything new on the node – created
+locally or accepted from a peer – is announced to at most ``fanout`` peers
+not known to have it; announcements to one peer are batched for
+``inv_interval`` seconds.  A node requests only items it has not seen
+(``seen`` is a bounded LRU) and not already requested from another peer,
+so each body crosses each link at most once.  Blocks whose predecessor has
+not arrived yet wait in an orphan pool until it does.
+
+Transactions keep their mempool ID across the network, so a confirmation
+relayed as a block removes the same entry everywhere.  Every relay
+type-checks what it receives (``pasta.core.encoding.check_fields``);
+entries must carry a valid signature over their signed amount and
+timestamp (unsigned ones only pass nodes that do not require signatures),
+and blocks a proof of work at the difficulty their level requires plus
+balance fields that match the relay's own ledger.
+
+The service is loop-agnostic: many can share one loop (simulations, see
+``pasta.bench.gossip``) or ``Node.start_gossip()`` runs one on a
+background thread.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import struct
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pasta.node import events as ev
+
+__all__ = ["ACCEPTED", "KNOWN", "ORPHAN", "REJECTED", "Gossip", "Peer"]
+
+PROTOCOL_VERSION = 1
+MAX_FRAME = 4 * 2**20
+HIGH_WATER = 256 * 1024  # bytes buffered for a peer before the reader waits for it to drain
+
+# Outcomes of Node.receive_transaction / Node.receive_block
+ACCEPTED = "accepted"
+KNOWN = "known"
+ORPHAN = "orphan"
+REJECTED = "rejected"
+
+TX = "tx"
+BLOCK = "block"
+
+Item = Tuple[str, str]  # (kind, id)
+
+_LEN = struct.Struct(">I")
+
+
+class _LRU(OrderedDict):
+    """Bounded insertion-ordered set/map; the oldest keys fall out first."""
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+
+    def put(self, key, value=None) -> bool:
+        """Insert *key*; False if it was already there."""
+        if key in self:
+            return False
+        self[key] = value
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+        return True
+
+
+@dataclass(eq=False)
+class Peer:
+    node_id: str
+    host: str
+    port: Optional[int]  # advertised listen port
+    outbound: bool
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    known: _LRU = field(default_factory=lambda: _LRU(50_000))  # items it has or was sent
+    pending_inv: List[Item] = field(default_factory=list)
+    flush: Optional[asyncio.TimerHandle] = None
+    task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"node_id": self.node_id, "host": self.host, "port": self.port, "outbound": self.outbound}
+
+
+class Gossip:
+    """Inventory-first gossip between one node and its peers."""
+
+    def __init__(
+        self,
+        node,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        peers: Iterable[Tuple[str, int]] = (),
+        fanout: int = 8,
+        max_peers: int = 32,
+        inv_interval: float = 0.005,
+        seen_size: int = 100_000,
+        handshake_timeout: float = 5.0,
+        request_timeout: float = 5.0,
+        node_id: Optional[str] = None,
+    ) -> None:
+        self.node = node
+        self.host, self.port = host, port
+        self.bootstrap = list(peers)
+        self.fanout = fanout
+        self.max_peers = max_peers
+        self.inv_interval = inv_interval
+        self.handshake_timeout = handshake_timeout
+        self.request_timeout = request_timeout
+        self.node_id = node_id or uuid.uuid4().hex[:16]
+        self.peers: Dict[str, Peer] = {}
+        self._seen = _LRU(seen_size)
+        self._bodies = _LRU(seen_size)  # item -> body message served on getdata
+        self._requested: Dict[Item, float] = {}  # item -> deadline of the pending getdata
+        self._orphans: Dict[str, List[Dict[str, Any]]] = {}  # predecessor hash -> block messages
+        self.counters = dict.fromkeys(
+            (
+                "bytes_sent",
+                "bytes_received",
+                "messages_sent",
+                "messages_received",
+                "announced",
+                "requested",
+                "received",
+                "duplicates",
+                "orphans",
+                "rejected",
+            ),
+            0,
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._unsubscribe = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    async def start(self) -> None:
+        """Listen, subscribe to the node's events and dial the bootstrap peers."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._accept, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._unsubscribe = self.node.events.subscribe(self._on_event)
+        for host, port in self.bootstrap:
+            await self.connect(host, port)
+
+    async def close(self) -> None:
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._server is not None:
+            self._server.close()
+        for peer in list(self.peers.values()):
+            self._drop(peer)
+        if self._server is not None:
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_background(self) -> "Gossip":
+        """Run on a private event loop in a daemon thread; returns once listening."""
+        ready = threading.Event()
+        errors: List[BaseException] = []
+
+        def _run() -> None:
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self.start())
+            except BaseException as exc:  # noqa: BLE001 – reported to the caller
+                errors.append(exc)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.close())
+            loop.close()
+
+        self._thread = threading.Thread(target=_run, name="pasta-gossip", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def stop_background(self) -> None:
+        if self._thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def connect_threadsafe(self, host: str, port: int, timeout: float = 10.0) -> Optional[Peer]:
+        """:meth:`connect` from another thread (background mode)."""
+        return asyncio.run_coroutine_threadsafe(self.connect(host, port), self._loop).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(
+            self.counters,
+            node_id=self.node_id,
+            port=self.port,
+            peers=[p.to_dict() for p in self.peers.values()],
+            seen=len(self._seen),
+            pending_orphans=sum(len(v) for v in self._orphans.values()),
+        )
+
+    # ------------------------------------------------------------------
+    # Connections and handshake
+    # ------------------------------------------------------------------
+    async def connect(self, host: str, port: int) -> Optional[Peer]:
+        """Dial *host*:*port*; ``None`` when unreachable or refused."""
+        if len(self.peers) >= self.max_peers:
+            return None
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.handshake_timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        return await self._handshake(reader, writer, outbound=True)
+
+    async def _accept(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await self._handshake(reader, writer, outbound=False)
+
+    def _genesis(self) -> Optional[str]:
+        chain = self.node.blockchain
+        return chain.row(0)["block_hash"] if chain.base == 0 and len(chain) else None
+
+    async def _handshake(self, reader, writer, outbound: bool) -> Optional[Peer]:
+        genesis = self._genesis()
+        hello = {"t": "hello", "version": PROTOCOL_VERSION, "node_id": self.node_id, "genesis": genesis, "port": self.port}
+        try:
+            self._write(writer, hello)
+            theirs = await asyncio.wait_for(self._read(reader), self.handshake_timeout)
+        except (OSError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            writer.close()
+            return None
+        node_id = theirs.get("node_id")
+        if (
+            theirs.get("t") != "hello"
+            or theirs.get("version") != PROTOCOL_VERSION
+            or (None not in (genesis, theirs.get("genesis")) and genesis != theirs["genesis"])
+            or node_id in (None, self.node_id)
+            or node_id in self.peers
+            or len(self.peers) >= self.max_peers
+        ):
+            writer.close()
+            return None
+        host = writer.get_extra_info("peername", ("?", None))[0]
+        peer = Peer(node_id, host, theirs.get("port"), outbound, reader, writer)
+        self.peers[node_id] = peer
+        peer.task = asyncio.ensure_future(self._serve(peer))
+        return peer
+
+    def _drop(self, peer: Peer) -> None:
+        if self.peers.get(peer.node_id) is peer:
+            del self.peers[peer.node_id]
+        if peer.flush is not None:
+            peer.flush.cancel()
+        peer.writer.close()
+        if peer.task is not None and peer.task is not asyncio.current_task():
+            peer.task.cancel()
+
+    # ------------------------------------------------------------------
+    # Framing
+    # ------------------------------------------------------------------
+    async def _read(self, reader: asyncio.StreamReader) -> Dict[str, Any]:
+        (size,) = _LEN.unpack(await reader.readexactly(_LEN.size))
+        if size > MAX_FRAME:
+            raise ValueError(f"frame of {size} bytes")
+        msg = json.loads(await reader.readexactly(size))
+        self.counters["bytes_received"] += _LEN.size + size
+        self.counters["messages_received"] += 1
+        if not isinstance(msg, dict):
+            raise ValueError("frame is not an object")
+        return msg
+
+    def _write(self, writer: asyncio.StreamWriter, msg: Dict[str, Any]) -> None:
+        data = json.dumps(msg, separators=(",", ":")).encode()
+        writer.write(_LEN.pack(len(data)) + data)
+        self.counters["bytes_sent"] += _LEN.size + len(data)
+        self.counters["messages_sent"] += 1
+
+    async def _serve(self, peer: Peer) -> None:
+        try:
+            while True:
+                msg = await self._read(peer.reader)
+                self._dispatch(peer, msg)
+                if peer.writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await peer.writer.drain()
+        except (OSError, ValueError, KeyError, TypeError, asyncio.IncompleteReadError):
+            pass
+        except asyncio.CancelledError:
+            raise
+        finally:
+            self._drop(peer)
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+    def _dispatch(self, peer: Peer, msg: Dict[str, Any]) -> None:
+        kind = msg["t"]
+        if kind == "inv":
+            self._on_inv(peer, [tuple(item) for item in msg["items"]])
+        elif kind == "getdata":
+            for item in msg["items"]:
+                body = self._bodies.get(tuple(item))
+                if body is not None:
+                    self._write(peer.writer, body)
+        elif kind in (TX, BLOCK):
+            self._on_body(peer, msg)
+
+    def _on_inv(self, peer: Peer, items: List[Item]) -> None:
+        now = self._loop.time()
+        want = []
+        for item in items:
+            peer.known.put(item)
+            if item in self._seen:
+                self.counters["duplicates"] += 1
+            elif self._requested.get(item, 0.0) <= now:  # not asked for, or the request timed out
+                self._requested[item] = now + self.request_timeout
+                want.append(item)
+        if want:
+            self.counters["requested"] += len(want)
+            self._write(peer.writer, {"t": "getdata", "items": want})
+
+    def _on_body(self, peer: Peer, msg: Dict[str, Any]) -> None:
+        item = (msg["t"], msg["id"])
+        self._requested.pop(item, None)
+        peer.known.put(item)
+        if not self._seen.put(item):
+            self.counters["duplicates"] += 1
+            return
+        self.counters["received"] += 1
+        if item[0] == TX:
+            status = self.node.receive_transaction(msg["tx_id"], msg["tx"])
+        else:
+            status = self.node.receive_block(msg["block"], msg.get("tx_id"))
+            if status == ORPHAN:
+                self.counters["orphans"] += 1
+                self._orphans.setdefault(msg["block"]["predecessor_hash"], []).append(msg)
+        if status == REJECTED:
+            self.counters["rejected"] += 1
+        # accepted bodies come back through _on_event and are relayed from there
+
+    def _on_event(self, event: ev.Event) -> None:
+        # Called with the node lock held, possibly on another thread
+        if event.kind in (ev.TX_CREATED, ev.TX_ADVANCED_B, ev.BLOCK_APPENDED) and self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._relay, event)
+            except RuntimeError:  # loop already closed
+                pass
+
+    def _relay(self, event: ev.Event) -> None:
+        data = event.data
+        tx_id = data.get("tx_id")
+        if event.kind == ev.BLOCK_APPENDED:
+            block = data["block"]
+            item: Item = (BLOCK, block["block_hash"])
+            body = {"t": BLOCK, "id": item[1], "tx_id": tx_id, "block": block}
+            if tx_id is not None:  # its mempool entry is gone: never fetch it again
+                self._seen.put((TX, f"{tx_id}:A"))
+                self._seen.put((TX, f"{tx_id}:B"))
+            for orphan in self._orphans.pop(item[1], ()):
+                self.node.receive_block(orphan["block"], orphan.get("tx_id"))
+        else:
+            tx = data["tx"]
+            item = (TX, f"{tx_id}:{tx['state']}")
+            body = {"t": TX, "id": item[1], "tx_id": tx_id, "tx": tx}
+        self._seen.put(item)
+        self._bodies.put(item, body)
+        self._announce(item)
+
+    def _announce(self, item: Item) -> None:
+        targets = [p for p in self.peers.values() if item not in p.known]
+        if len(targets) > self.fanout:
+            targets = random.sample(targets, self.fanout)
+        for peer in targets:
+            peer.known.put(item)
+            peer.pending_inv.append(item)
+            if peer.flush is None:
+                peer.flush = self._loop.call_later(self.inv_interval, self._flush, peer)
+
+    def _flush(self, peer: Peer) -> None:
+        peer.flush = None
+        items, peer.pending_inv = peer.pending_inv, []
+        if items and self.peers.get(peer.node_id) is peer:
+            self.counters["announced"] += len(items)
+            self._write(peer.writer, {"t": "inv", "items": items})
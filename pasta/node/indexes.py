@@ -0,0 +1,137 @@
+"""Secondary indexes over the chain and the mempool.
+
+Without them the only way to find a block is its position in the chain.
+:class:`ChainIndex` keeps, for confirmed blocks (by height):
+
+* ``block_hash`` → height
+* address (sender or receiver) → heights
+* ``predecessor_hash`` → child heights
+* ``validated_block_id`` → heights of the blocks that validated it
+
+and the same address / predecessor / validated-block maps for pending
+mempool entries.  Lookups cost O(1) plus O(k) for the k results.
+
+Confirmed blocks are indexed incrementally by :meth:`ChainIndex.catch_up`,
+so a node re-opened on a large persistent chain starts immediately and only
+pays for the scan on its first query.  All methods expect the caller to
+hold the node lock.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from pasta.node.store import BlockStore
+
+__all__ = ["ChainIndex"]
+
+_Key = Union[bytes, str]
+
+
+def _key(value: str) -> _Key:
+    # 64-char hex hashes are stored as 32 raw bytes to halve the key size
+    if len(value) == 64:
+        try:
+            return bytes.fromhex(value)
+        except ValueError:
+            pass
+    return value
+
+
+class ChainIndex:
+    """Hash, address, predecessor and validation indexes."""
+
+    def __init__(self) -> None:
+        self.indexed = 0  # heights below this are in the confirmed maps
+        self._by_hash: Dict[_Key, int] = {}
+        self._by_address: Dict[str, array] = {}
+        self._children: Dict[_Key, array] = {}
+        self._validators: Dict[_Key, array] = {}
+
+        # pending side holds the live mempool dicts themselves
+        self._pending_address: Dict[str, List[Dict]] = {}
+        self._pending_children: Dict[_Key, List[Dict]] = {}
+        self._pending_validators: Dict[_Key, List[Dict]] = {}
+
+    # ------------------------------------------------------------------
+    # Confirmed blocks
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _push(table: Dict[Any, array], key: Any, height: int) -> None:
+        heights = table.get(key)
+        if heights is None:
+            heights = table[key] = array("I")
+        heights.append(height)
+
+    def add_block(self, height: int, block: Dict[str, Any]) -> None:
+        if block.get("block_hash"):
+            self._by_hash.setdefault(_key(block["block_hash"]), height)
+        for addr in {block["sender_address"], block["receiver_address"]}:
+            self._push(self._by_address, addr, height)
+        if block.get("predecessor_hash"):
+            self._push(self._children, _key(block["predecessor_hash"]), height)
+        if block.get("validated_block_id"):
+            self._push(self._validators, _key(block["validated_block_id"]), height)
+
+    def catch_up(self, store: BlockStore) -> None:
+        """Index every block appended to *store* since the last call."""
+        for height in range(max(self.indexed, store.base), len(store)):
+            self.add_block(height, store.row(height))
+        self.indexed = len(store)
+
+    def prune(self, base: int) -> None:
+        """Forget confirmed blocks below *base*; retained ones are re-indexed on the next catch-up."""
+        self._by_hash.clear()
+        self._by_address.clear()
+        self._children.clear()
+        self._validators.clear()
+        self.indexed = base
+
+    def height_of(self, block_hash: str) -> Optional[int]:
+        return self._by_hash.get(_key(block_hash))
+
+    def heights_for_address(self, address: str) -> List[int]:
+        return list(self._by_address.get(address, ()))
+
+    def child_heights(self, block_hash: str) -> List[int]:
+        return list(self._children.get(_key(block_hash), ()))
+
+    def validator_heights(self, block_hash: str) -> List[int]:
+        return list(self._validators.get(_key(block_hash), ()))
+
+    # ------------------------------------------------------------------
+    # Pending (mempool) entries
+    # ------------------------------------------------------------------
+    def _pending_keys(self, tx: Dict[str, Any]) -> Iterable[tuple]:
+        for addr in {tx["sender_address"], tx["receiver_address"]}:
+            yield self._pending_address, addr
+        if tx.get("predecessor_hash"):
+            yield self._pending_children, _key(tx["predecessor_hash"])
+        if tx.get("validated_block_id"):
+            yield self._pending_validators, _key(tx["validated_block_id"])
+
+    def add_pending(self, tx: Dict[str, Any]) -> None:
+        for table, key in self._pending_keys(tx):
+            table.setdefault(key, []).append(tx)
+
+    def remove_pending(self, tx: Dict[str, Any]) -> None:
+        for table, key in self._pending_keys(tx):
+            entries = table.get(key)
+            if not entries:
+                continue
+            entries[:] = [e for e in entries if e is not tx]
+            if not entries:
+                del table[key]
+
+    def replace_pending(self, old: Dict[str, Any], new: Dict[str, Any]) -> None:
+        self.remove_pending(old)
+        self.add_pending(new)
+
+    def pending_for_address(self, address: str) -> List[Dict]:
+        return list(self._pending_address.get(address, ()))
+
+    def pending_children(self, block_hash: str) -> List[Dict]:
+        return list(self._pending_children.get(_key(block_hash), ()))
+
+    def pending_validators(self, block_hash: str) -> List[Dict]:
+        return list(self._pending_validators.get(_key(block_hash), ()))
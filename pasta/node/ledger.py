@@ -0,0 +1,87 @@
+"""Running account-state table.
+
+Balances used to be recomputed by walking the whole chain for every query.
+:class:`Ledger` instead keeps ``address -> balance`` and is advanced block
+by block as the node confirms transactions, so a balance lookup is a single
+dict access.
+
+Accounting rule for a confirmed block::
+
+    receiver += amount
+    sender   -= amount - mint_amount     # minted coins are not paid by the sender
+
+so ``mint_amount > 0`` grows the supply and ``mint_amount < 0`` (burn)
+charges the sender extra.  :meth:`Ledger.preview` computes the four
+``*_balance_before/after`` fields a block will carry; :meth:`Ledger.apply`
+commits them.  All methods expect the caller to hold the node lock.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping
+
+from pasta.node.store import BlockStore
+
+__all__ = ["Ledger"]
+
+_BALANCE_FIELDS = (
+    "sender_balance_before",
+    "sender_balance_after",
+    "receiver_balance_before",
+    "receiver_balance_after",
+)
+
+
+class Ledger:
+    """address → balance, kept in step with the confirmed chain."""
+
+    def __init__(self) -> None:
+        self.applied = 0  # number of chain blocks reflected in the balances
+        self._balances: Dict[str, float] = {}
+
+    def balance(self, address: str) -> float:
+        return self._balances.get(address, 0.0)
+
+    def __len__(self) -> int:
+        return len(self._balances)
+
+    def snapshot(self) -> Dict[str, float]:
+        return dict(self._balances)
+
+    # ------------------------------------------------------------------
+    def preview(self, tx: Mapping[str, Any]) -> Dict[str, float]:
+        """Balance fields *tx* would carry if it were confirmed right now."""
+        sender, receiver = tx["sender_address"], tx["receiver_address"]
+        amount = tx["amount"]
+        sender_before = self.balance(sender)
+        sender_after = sender_before - (amount - tx.get("mint_amount", 0.0))
+        if sender == receiver:
+            receiver_before, receiver_after = sender_before, sender_after + amount
+            sender_after = receiver_after
+        else:
+            receiver_before = self.balance(receiver)
+            receiver_after = receiver_before + amount
+        return dict(zip(_BALANCE_FIELDS, (sender_before, sender_after, receiver_before, receiver_after)))
+
+    def is_current(self, tx: Mapping[str, Any]) -> bool:
+        """True when *tx*'s ``*_before`` fields still match the table."""
+        return (
+            self.balance(tx["sender_address"]) == tx["sender_balance_before"]
+            and self.balance(tx["receiver_address"]) == tx["receiver_balance_before"]
+        )
+
+    def apply(self, tx: Mapping[str, Any]) -> None:
+        """Commit the next chain block (balances recomputed, not trusted)."""
+        fields = self.preview(tx)
+        self._balances[tx["sender_address"]] = fields["sender_balance_after"]
+        self._balances[tx["receiver_address"]] = fields["receiver_balance_after"]
+        self.applied += 1
+
+    def load(self, balances: Mapping[str, float], applied: int) -> None:
+        """Start from a checkpoint's account state taken after *applied* blocks."""
+        self._balances = dict(balances)
+        self.applied = applied
+
+    def catch_up(self, store: BlockStore) -> None:
+        """Apply every block appended to *store* since the last call."""
+        for height in range(self.applied, len(store)):
+            self.apply(store.row(height))
@@ -0,0 +1,291 @@
+"""Automatic State-B pairing and confirmation.
+
+Without the matcher a human picks ``my_index``/``target_index`` for every
+``advance_b``.  :class:`ValidatorMatcher` runs on the node and keeps a chain
+of validations going:
+
+* every State-A transaction, **oldest first**, is paired with an eligible
+  State-B target – same or lower ``level`` and no lower
+  ``required_difficulty`` – preferring the newest such target, and
+  ``advance_b`` mines the proof;
+* State-B transactions are then confirmed with ``advance_c`` oldest first,
+  except the newest one, which stays in the mempool as the target for the
+  next pairing (the genesis bootstrap transaction seeds the chain).  A
+  transaction is therefore confirmed once a later one has validated past it;
+* branches that have drained (see :mod:`pasta.node.branches`) are merged
+  back with ``Node.aggregate``, and a balance checkpoint is mined whenever
+  ``Node.checkpoint_due()`` (see :mod:`pasta.node.checkpoint`).
+
+Confirmations extend their branch's tip, so at most one confirmation or
+aggregation per branch is in flight – more would only mine conflicting
+blocks – while different branches are worked on in parallel.
+
+A target is *leased* while a pairing against it is mining and is not
+confirmed until the lease is released, so the matcher never causes its own
+commit conflicts.  When both kinds of work are waiting the free worker
+slots are split between them, so a burst of new transactions cannot starve
+confirmations (and vice versa); strict age order within each kind keeps old
+transactions from starving.
+
+PoW jobs run on a thread pool of ``workers`` threads (each PoW may itself fan
+out to processes, see ``PASTA_POW_WORKERS``).  The scheduling thread sleeps
+on the node's event feed and on job completions – an idle matcher costs no
+CPU.  End-to-end latency (``tx-created`` → ``block-appended``) is recorded
+for every confirmation and summarised as percentiles by :meth:`stats`.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from pasta.node import events as ev
+from pasta.node.branches import MAIN
+
+__all__ = ["ValidatorMatcher", "percentiles"]
+
+
+def percentiles(values: List[float], points=(50, 90, 95, 99)) -> Dict[str, float]:
+    """Nearest-rank percentiles of *values* (empty dict when there are none)."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    n = len(ordered)
+    return {f"p{p}": ordered[min(n - 1, max(0, -(-p * n // 100) - 1))] for p in points}
+
+
+class ValidatorMatcher:
+    """Pairs State-A transactions with targets and confirms them, on *node*."""
+
+    def __init__(self, node, validator_address: str, workers: int = 1, history: int = 10_000) -> None:
+        self.node = node
+        self.validator_address = validator_address
+        self.workers = workers
+        self.paired = 0
+        self.confirmed = 0
+        self.aggregated = 0
+        self.checkpoints = 0
+        self.conflicts = 0
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.RLock()  # done-callbacks may run inside _schedule
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._unsubscribe = None
+
+        self._busy: Set[str] = set()  # tx IDs with a job in flight
+        self._leases: Dict[str, int] = {}  # target ID -> pairings mining against it
+        self._committing: Dict[int, str] = {}  # branch ID -> job extending its tip
+        self._created: Dict[str, float] = {}  # tx ID -> tx-created event time
+        self._latencies: Deque[float] = deque(maxlen=history)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pasta-matcher-pow")
+        self._unsubscribe = self.node.events.subscribe(self._on_event)
+        self._thread = threading.Thread(target=self._run, name="pasta-matcher", daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self) -> None:
+        """Stop scheduling; jobs already mining are allowed to finish."""
+        if not self.running:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self._unsubscribe()
+        self._pool.shutdown(wait=True)
+        self._thread = None
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+    def _on_event(self, event: ev.Event) -> None:
+        # Called with the node lock held: record and wake up, nothing more
+        tx_id = event.data.get("tx_id")
+        if event.kind == ev.TX_CREATED and tx_id:
+            self._created[tx_id] = event.timestamp
+        elif event.kind == ev.BLOCK_APPENDED and tx_id:
+            created = self._created.pop(tx_id, None)
+            if created is not None:
+                self._latencies.append(event.timestamp - created)
+        elif event.kind == ev.MEMPOOL_REMOVED and tx_id:
+            self._created.pop(tx_id, None)
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if not self._stop.is_set():
+                self._schedule()
+
+    def _plan(self, slots: int) -> Tuple[List[Tuple[str, str]], List[Tuple[str, int]], List[Tuple[int, int]], bool]:
+        """Pick up to *slots* pairings, confirmations and aggregations (node lock held).
+
+        Returns ``(tx, target)`` pairs, ``(tx, branch)`` confirmations,
+        ``(child, parent)`` branch aggregations and whether to checkpoint.
+        """
+        mempool, branches = self.node.mempool, self.node.branches
+        waiting_a = [i for i in mempool.by_state("A") if i not in self._busy]
+        state_b = mempool.by_state("B")
+        targets = [i for i in state_b if i not in self._busy]
+        # Keep the newest State-B entry as the next target; leased ones wait
+        confirmable = [i for i in state_b[:-1] if i not in self._busy and i not in self._leases]
+
+        # Split the slots when both kinds of work wait so neither starves
+        share = max(1, slots // 2) if waiting_a and confirmable else slots
+        pairs: List[Tuple[str, str]] = []
+        for tx_id in waiting_a:
+            if len(pairs) >= share:
+                break
+            target = self._pick_target(mempool.get(tx_id), targets)
+            if target is not None:
+                pairs.append((tx_id, target))
+        leased = {target for _, target in pairs}
+        left = slots - len(pairs)
+
+        # One job per branch tip: a due checkpoint, aggregations (they free a
+        # branch), then the oldest confirmable entry of every idle branch
+        claimed = set(self._committing)
+        checkpoint = left > 0 and MAIN not in claimed and self.node.checkpoint_due()
+        if checkpoint:
+            claimed.add(MAIN)
+            left -= 1
+        merges: List[Tuple[int, int]] = []
+        for child in branches.drained():
+            if left > len(merges) and child.parent not in claimed and child.branch_id not in claimed:
+                claimed.update((child.parent, child.branch_id))
+                merges.append((child.branch_id, child.parent))
+        confirms: List[Tuple[str, int]] = []
+        for tx_id in confirmable:
+            if len(confirms) + len(merges) >= left:
+                break
+            branch = branches.branch_for_tx(tx_id)
+            branch_id = MAIN if branch is None else branch.branch_id
+            if tx_id not in leased and branch_id not in claimed:
+                claimed.add(branch_id)
+                confirms.append((tx_id, branch_id))
+        return pairs, confirms, merges, checkpoint
+
+    def _pick_target(self, tx: Dict[str, Any], targets: List[str]) -> Optional[str]:
+        mempool = self.node.mempool
+        for target_id in reversed(targets):  # newest first: the oldest get confirmed
+            target = mempool.get(target_id)
+            if (
+                target is not None
+                and target.get("level", 0) <= tx.get("level", 0)
+                and target.get("required_difficulty", 0) >= tx.get("required_difficulty", 0)
+            ):
+                return target_id
+        return None
+
+    def _schedule(self) -> None:
+        with self._lock:
+            slots = self.workers * 2 - len(self._busy)  # keep every worker fed
+            if slots <= 0:
+                return
+            with self.node._lock:
+                pairs, confirms, merges, checkpoint = self._plan(slots)
+            for tx_id, target_id in pairs:
+                self._busy.add(tx_id)
+                self._leases[target_id] = self._leases.get(target_id, 0) + 1
+                fut = self._pool.submit(self.node.advance_b, tx_id, target_id)
+                fut.add_done_callback(lambda f, t=tx_id, g=target_id: self._done_b(f, t, g))
+            for tx_id, branch_id in confirms:
+                self._busy.add(tx_id)
+                self._committing[branch_id] = tx_id
+                fut = self._pool.submit(self.node.advance_c, tx_id, self.validator_address)
+                fut.add_done_callback(lambda f, t=tx_id, b=branch_id: self._done_c(f, t, b))
+            for child_id, parent_id in merges:
+                job = f"aggregate-{child_id}"
+                self._busy.add(job)
+                self._committing[child_id] = self._committing[parent_id] = job
+                fut = self._pool.submit(self.node.aggregate, child_id, self.validator_address)
+                fut.add_done_callback(lambda f, j=job, c=child_id, p=parent_id: self._done_merge(f, j, c, p))
+            if checkpoint:
+                self._busy.add("checkpoint")
+                self._committing[MAIN] = "checkpoint"
+                fut = self._pool.submit(self.node.checkpoint, self.validator_address)
+                fut.add_done_callback(self._done_checkpoint)
+
+    def _finish(self, fut: Future, tx_id: str) -> bool:
+        self._busy.discard(tx_id)
+        ok = fut.exception() is None and fut.result() is not None
+        if not ok:
+            self.conflicts += 1  # retried on the next round
+        return ok
+
+    def _done_b(self, fut: Future, tx_id: str, target_id: str) -> None:
+        with self._lock:
+            left = self._leases.get(target_id, 1) - 1
+            if left:
+                self._leases[target_id] = left
+            else:
+                self._leases.pop(target_id, None)
+            if self._finish(fut, tx_id):
+                self.paired += 1
+        self._wake.set()
+
+    def _done_c(self, fut: Future, tx_id: str, branch_id: int) -> None:
+        with self._lock:
+            self._committing.pop(branch_id, None)
+            if self._finish(fut, tx_id):
+                self.confirmed += 1
+        self._wake.set()
+
+    def _done_merge(self, fut: Future, job: str, child_id: int, parent_id: int) -> None:
+        with self._lock:
+            self._committing.pop(child_id, None)
+            self._committing.pop(parent_id, None)
+            if self._finish(fut, job):
+                self.aggregated += 1
+        self._wake.set()
+
+    def _done_checkpoint(self, fut: Future) -> None:
+        with self._lock:
+            self._committing.pop(MAIN, None)
+            if self._finish(fut, "checkpoint"):
+                self.checkpoints += 1
+        self._wake.set()
+
+    # ------------------------------------------------------------------
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = list(self._latencies)
+            return {
+                "running": self.running,
+                "validator": self.validator_address,
+                "workers": self.workers,
+                "in_flight": len(self._busy),
+                "paired": self.paired,
+                "confirmed": self.confirmed,
+                "aggregated": self.aggregated,
+                "checkpoints": self.checkpoints,
+                "conflicts": self.conflicts,
+                "latency_seconds": percentiles(latencies),
+                "samples": len(latencies),
+            }
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until no job is in flight and nothing is left to schedule (tests/benchmarks)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            with self._lock, self.node._lock:
+                if not self._busy and not any(self._plan(1)):
+                    return True
+            time.sleep(0.01)
+        return False
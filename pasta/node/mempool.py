@@ -0,0 +1,189 @@
+"""Mempool keyed by stable transaction IDs.
+
+The mempool used to be a plain list addressed by position: confirming an
+entry (``list.pop``) cost O(n) and silently shifted every later index a
+client was holding.  :class:`Mempool` keeps ``tx_id -> entry`` in insertion
+order instead.  An ID is assigned when the entry is added and survives its
+State A → B transition, so clients can hold on to it until the entry is
+confirmed or evicted.
+
+Secondary indexes:
+
+* state (``"A"``/``"B"``) and level → IDs, in insertion order;
+* one heap per state ordered by ``(priority, age)`` so the next entry ready
+  for validation (:meth:`Mempool.peek`) is found in O(log n) – removed or
+  re-stated entries are dropped lazily when they reach the top.
+
+Positional access (``mempool[i]``) is kept for the legacy index-based API
+and costs O(n).
+
+Size limit: with ``max_size`` set, :meth:`Mempool.add` evicts the
+lowest-priority, oldest State-A entries to make room.  State-B entries
+already carry proof-of-work and are never evicted; when nothing can be
+evicted :class:`MempoolFull` is raised.
+
+All methods expect the caller to hold the node lock.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+__all__ = ["Mempool", "MempoolFull"]
+
+Ref = Union[int, str]  # legacy position or stable tx ID
+EVICTABLE_STATE = "A"
+
+
+class MempoolFull(Exception):
+    """Raised by :meth:`Mempool.add` when no entry can be evicted to make room."""
+
+
+def default_priority(entry: Dict[str, Any]) -> float:
+    """Lower sorts first; by default entries are served oldest first."""
+    return 0.0
+
+
+class Mempool:
+    """Insertion-ordered ``tx_id -> entry`` map with state/level/priority indexes."""
+
+    def __init__(
+        self, max_size: Optional[int] = None, priority: Callable[[Dict[str, Any]], float] = default_priority
+    ) -> None:
+        self.max_size = max_size
+        self.priority = priority
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._ids: Dict[int, str] = {}  # id(entry) -> tx_id
+        self._age: Dict[str, int] = {}  # tx_id -> insertion sequence
+        self._by_state: Dict[str, Dict[str, None]] = {}
+        self._by_level: Dict[int, Dict[str, None]] = {}
+        self._heaps: Dict[str, List[Tuple[float, int, str]]] = {}
+        self._seq = itertools.count()
+
+    # ------------------------------------------------------------------
+    # Sequence-style access (legacy index API)
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(list(self._entries.values()))
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+    def __getitem__(self, index):
+        values = list(self._entries.values())
+        return values[index]
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        return list(self._entries.items())
+
+    def ids(self) -> List[str]:
+        return list(self._entries)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def get(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        return self._entries.get(tx_id)
+
+    def id_of(self, entry: Dict[str, Any]) -> Optional[str]:
+        """ID of the live *entry* object (identity, not equality)."""
+        tx_id = self._ids.get(id(entry))
+        return tx_id if tx_id is not None and self._entries.get(tx_id) is entry else None
+
+    def resolve(self, ref: Ref) -> Optional[str]:
+        """Turn a tx ID or a legacy position into a tx ID (``None`` if unknown)."""
+        if isinstance(ref, str):
+            return ref if ref in self._entries else None
+        if isinstance(ref, bool) or not isinstance(ref, int):
+            return None
+        if ref < 0:
+            ref += len(self._entries)
+        if not 0 <= ref < len(self._entries):
+            return None
+        if ref == len(self._entries) - 1:
+            return next(reversed(self._entries))
+        return next(itertools.islice(self._entries, ref, None))
+
+    def by_state(self, state: str) -> List[str]:
+        return list(self._by_state.get(state, ()))
+
+    def by_level(self, level: int) -> List[str]:
+        return list(self._by_level.get(level, ()))
+
+    def peek(self, state: str = "B") -> Optional[str]:
+        """Highest-priority (then oldest) entry in *state*, in O(log n) amortised."""
+        heap = self._heaps.get(state)
+        while heap:
+            _, age, tx_id = heap[0]
+            entry = self._entries.get(tx_id)
+            if entry is not None and self._age.get(tx_id) == age and entry.get("state") == state:
+                return tx_id
+            heapq.heappop(heap)  # stale: removed, replaced or moved to another state
+        return None
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+    def _index(self, tx_id: str, entry: Dict[str, Any]) -> None:
+        state, level = entry.get("state"), entry.get("level")
+        self._by_state.setdefault(state, {})[tx_id] = None
+        self._by_level.setdefault(level, {})[tx_id] = None
+        heap = self._heaps.setdefault(state, [])
+        heapq.heappush(heap, (self.priority(entry), self._age[tx_id], tx_id))
+        if len(heap) > 2 * len(self._by_state[state]) + 64:
+            self._compact(state)
+        self._ids[id(entry)] = tx_id
+
+    def _compact(self, state: str) -> None:
+        live = self._by_state.get(state, {})
+        # one (latest) item per live ID
+        latest = {item[2]: item for item in self._heaps[state] if item[2] in live and self._age[item[2]] == item[1]}
+        heap = list(latest.values())
+        heapq.heapify(heap)
+        self._heaps[state] = heap
+
+    def _unindex(self, tx_id: str, entry: Dict[str, Any]) -> None:
+        for table, key in ((self._by_state, entry.get("state")), (self._by_level, entry.get("level"))):
+            ids = table.get(key)
+            if ids is not None:
+                ids.pop(tx_id, None)
+                if not ids:
+                    del table[key]
+        self._ids.pop(id(entry), None)
+
+    def add(self, entry: Dict[str, Any], tx_id: Optional[str] = None) -> Tuple[str, List[Tuple[str, Dict]]]:
+        """Insert *entry*; returns ``(tx_id, evicted)`` with the ``(id, entry)`` pairs evicted."""
+        evicted: List[Tuple[str, Dict]] = []
+        if self.max_size is not None:
+            excess = len(self._entries) + 1 - self.max_size
+            if excess > len(self._by_state.get(EVICTABLE_STATE, ())):
+                raise MempoolFull(f"mempool holds {len(self._entries)} entries and too few can be evicted")
+            for _ in range(max(0, excess)):
+                victim = self.peek(EVICTABLE_STATE)
+                evicted.append((victim, self.remove(victim)))
+        tx_id = tx_id or uuid.uuid4().hex
+        self._insert(tx_id, entry)
+        return tx_id, evicted
+
+    def _insert(self, tx_id: str, entry: Dict[str, Any]) -> None:
+        self._entries[tx_id] = entry
+        self._age[tx_id] = next(self._seq)
+        self._index(tx_id, entry)
+
+    def replace(self, tx_id: str, entry: Dict[str, Any]) -> None:
+        """Swap in a new entry object under the same ID (keeps its age)."""
+        old = self._entries[tx_id]
+        self._unindex(tx_id, old)
+        self._entries[tx_id] = entry
+        self._index(tx_id, entry)
+
+    def remove(self, tx_id: str) -> Dict[str, Any]:
+        entry = self._entries.pop(tx_id)
+        self._unindex(tx_id, entry)
+        del self._age[tx_id]
+        return entry
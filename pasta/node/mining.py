@@ -0,0 +1,147 @@
+"""Background scheduler for State-B/C proof-of-work jobs.
+
+A job is created from a snapshot of the mempool entries it works on, taken
+under the node lock.  The PoW itself then runs on a worker thread **without**
+the lock (``pasta.validation.engine`` may fan it out to a process pool) and
+only the final compare-and-commit step re-acquires it.  If the mempool changed
+underneath the job in the meantime the commit is refused and the job fails
+with a ``conflict`` error instead of writing a stale proof.
+
+Submission is bounded: when ``max_queue`` jobs are already waiting
+:class:`JobQueueFull` is raised so the REST layer can answer ``503``.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from pasta.validation.engine import MiningCancelled
+
+__all__ = ["JobQueueFull", "MiningJob", "MiningScheduler"]
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobQueueFull(Exception):
+    """Raised by :meth:`MiningScheduler.submit` when the queue is at capacity."""
+
+
+@dataclass
+class MiningJob:
+    job_id: str
+    kind: str  # "advance_b" | "advance_c"
+    status: str = QUEUED
+    result: Optional[Dict] = None
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    # Internal: snapshot + the callable that mines and commits it
+    _run: Optional[Callable[[threading.Event], Optional[Dict]]] = field(default=None, repr=False)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class MiningScheduler:
+    """Bounded job queue drained by ``workers`` background threads."""
+
+    def __init__(self, workers: int = 1, max_queue: int = 64, history: int = 1_000) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.history = history  # finished jobs kept around for polling
+
+        self._queue: "queue.Queue[MiningJob]" = queue.Queue(maxsize=max_queue)
+        self._jobs: "OrderedDict[str, MiningJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: list = []
+
+    # ------------------------------------------------------------------
+    def _ensure_workers(self) -> None:
+        if self._threads:
+            return
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"pasta-miner-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, kind: str, run: Callable[[threading.Event], Optional[Dict]]) -> MiningJob:
+        """Queue *run* (which receives the job's cancel event) and return its job."""
+        job = MiningJob(job_id=uuid.uuid4().hex, kind=kind, _run=run)
+        with self._lock:
+            self._ensure_workers()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFull(f"{self.max_queue} mining jobs already queued") from None
+            self._jobs[job.job_id] = job
+            self._trim()
+        return job
+
+    def get(self, job_id: str) -> Optional[MiningJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[MiningJob]:
+        """Request cancellation; queued jobs never start, running ones abort."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == QUEUED:
+                job.status = CANCELLED
+                job.finished = time.time()
+            job._cancel.set()
+            return job
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # ------------------------------------------------------------------
+    def _trim(self) -> None:
+        finished = [jid for jid, j in self._jobs.items() if j.status in (DONE, FAILED, CANCELLED)]
+        for jid in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[jid]
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                with self._lock:
+                    if job.status == CANCELLED:
+                        continue
+                    job.status = RUNNING
+                    job.started = time.time()
+                try:
+                    result = job._run(job._cancel)
+                except MiningCancelled:
+                    status, result, error = CANCELLED, None, None
+                except Exception as exc:  # surface any engine failure through the job
+                    status, result, error = FAILED, None, str(exc)
+                else:
+                    if result is None:
+                        status, error = FAILED, "conflict: mempool changed while mining"
+                    else:
+                        status, error = DONE, None
+                with self._lock:
+                    job.status, job.result, job.error = status, result, error
+                    job.finished = time.time()
+                    job._run = None  # drop the snapshot
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,117 @@
+"""JSON rendering for the REST API: a fast encoder and cached block bytes.
+
+``dumps`` uses `orjson <https://github.com/ijl/orjson>`_ when it is
+installed (about 10x the stdlib encoder on block rows) and falls back to a
+compact ``json.dumps``.  :func:`json_provider` plugs the same encoder into
+Flask, so every ``jsonify`` and ``request.get_json`` of the node app goes
+through it; unlike Flask's default provider keys are not sorted.
+
+Confirmed blocks never change, so their JSON is rendered once:
+:class:`BlockJSONCache` keeps the encoded row of the most recently served
+heights (LRU) and the chain routes splice those bytes into their responses
+instead of decoding and re-encoding the stored block per request.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, List
+
+from pasta.node.store import BlockStore
+
+try:  # optional dependency
+    import orjson
+except ImportError:  # pragma: no cover – stdlib fallback
+    orjson = None
+
+__all__ = ["DEFAULT_BLOCK_CACHE", "BlockJSONCache", "dumps", "json_provider", "loads"]
+
+DEFAULT_BLOCK_CACHE = 50_000  # encoded rows kept (about 25 MB)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+if orjson is not None:
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+else:  # pragma: no cover
+    dumps, loads = _stdlib_dumps, json.loads
+
+
+def json_provider(app, fast: bool = True):
+    """Flask ``JSONProvider`` for *app*: :func:`dumps` when *fast*, else Flask's default."""
+    from flask.json.provider import DefaultJSONProvider
+
+    if not fast or orjson is None:
+        return DefaultJSONProvider(app)
+
+    class FastJSONProvider(DefaultJSONProvider):
+        def _encode(self, obj: Any) -> bytes:
+            # Flask's fallback covers what orjson does not (Decimal, __html__, ...)
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+        def dumps(self, obj: Any, **kwargs: Any) -> str:
+            return self._encode(obj).decode()
+
+        def loads(self, s, **kwargs: Any) -> Any:
+            return loads(s)
+
+        def response(self, *args: Any, **kwargs: Any):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(self._encode(obj), mimetype=self.mimetype)
+
+    return FastJSONProvider(app)
+
+
+class BlockJSONCache:
+    """Encoded block rows by height, least recently used evicted first.
+
+    ``size=0`` disables caching (every row is encoded on each request).
+    """
+
+    def __init__(self, size: int = DEFAULT_BLOCK_CACHE, encode=dumps) -> None:
+        self.size = size
+        self._encode = encode
+        self._rows: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, store: BlockStore, height: int) -> bytes:
+        """JSON of ``store.row(height)``."""
+        with self._lock:
+            data = self._rows.get(height)
+            if data is not None:
+                self._rows.move_to_end(height)
+                self.hits += 1
+                return data
+        data = self._encode(store.row(height))
+        with self._lock:
+            self.misses += 1
+            if self.size:
+                self._rows[height] = data
+                while len(self._rows) > self.size:
+                    self._rows.popitem(last=False)
+        return data
+
+    def rows(self, store: BlockStore, start: int, stop: int) -> List[bytes]:
+        return [self.row(store, h) for h in range(start, stop)]
+
+    def with_height(self, store: BlockStore, height: int) -> bytes:
+        """JSON of ``dict(store.row(height), height=height)``."""
+        return self.row(store, height)[:-1] + b',"height":%d}' % height
+
+    def array(self, store: BlockStore, start: int, stop: int) -> bytes:
+        """JSON list of the rows ``start..stop-1``."""
+        return b"[" + b",".join(self.rows(store, start, stop)) + b"]"
+
+    def stats(self) -> dict:
+        return {"size": self.size, "cached": len(self._rows), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,124 @@
+"""Mempool + stats snapshots for warm restarts.
+
+A node created with a ``data_dir`` periodically writes ``mempool.json``
+next to its block log::
+
+    {"version": 1, "height": ..., "tip_hash": ..., "tx_counter": ...,
+     "total_amount": ..., "stats": {...}, "entries": [[tx_id, entry], ...]}
+
+Writing never blocks the node for long: under the node lock only the list
+of ``(tx_id, entry)`` references and the stats are taken – mempool entries
+are never mutated in place (advancing a transaction swaps in a new dict),
+so the references form a copy-on-write view.  Serialisation and the
+``fsync`` + atomic rename happen on the :class:`Snapshotter` thread, and
+only when the event sequence number shows that something changed.  A final
+snapshot is written by ``Node.close()``.
+
+On start-up :func:`validate_entries` re-checks the snapshot against the
+chain: entries confirmed after the snapshot was taken are dropped, and if
+the chain no longer contains the snapshot's tip, every entry whose
+predecessor is unknown is dropped too.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pasta.core.encoding import AMOUNT_SCALE
+from pasta.node.store import BlockStore
+
+__all__ = ["SNAPSHOT_FILE", "Snapshotter", "read_snapshot", "validate_entries", "write_snapshot"]
+
+SNAPSHOT_FILE = "mempool.json"
+VERSION = 1
+
+Entries = List[Tuple[str, Dict[str, Any]]]
+
+
+def write_snapshot(path: str, state: Dict[str, Any]) -> None:
+    """Atomically replace *path* with *state* (tmp file, fsync, rename)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(dict(state, version=VERSION), separators=(",", ":")))  # C encoder, one pass
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    """Load a snapshot; ``None`` when missing, unreadable or of another version."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != VERSION:
+        return None
+    return state
+
+
+def _identity(tx: Dict[str, Any]) -> tuple:
+    # Fields a transaction keeps from State A to its confirmed block (the
+    # linkage is rebased onto the branch tip on confirmation); amounts in
+    # fixed point because the block log stores them that way
+    return (
+        tx["sender_address"],
+        tx["receiver_address"],
+        round(tx["amount"] * AMOUNT_SCALE),
+        tx["timestamp"],
+        tx.get("signature"),
+    )
+
+
+def validate_entries(state: Dict[str, Any], chain: BlockStore, height_of: Callable[[str], Optional[int]]) -> Entries:
+    """Entries of *state* still pending on *chain*, in their original order."""
+    entries: Entries = [(tx_id, tx) for tx_id, tx in state["entries"]]
+    height = state["height"]
+    if chain.base <= height < len(chain) and chain.row(height)["block_hash"] == state["tip_hash"]:
+        # Same chain, possibly longer: drop what was confirmed since the snapshot
+        confirmed = {_identity(chain.row(h)) for h in range(height + 1, len(chain))}
+        return [(i, tx) for i, tx in entries if _identity(tx) not in confirmed]
+    # The snapshot's tip is gone (chain rebuilt or truncated on recovery)
+    return [(i, tx) for i, tx in entries if tx.get("predecessor_hash") and height_of(tx["predecessor_hash"]) is not None]
+
+
+class Snapshotter:
+    """Background thread writing ``capture()`` to *path* every *interval* seconds.
+
+    *capture* is called with no arguments and returns ``(version, state)``;
+    nothing is written while the version is unchanged.
+    """
+
+    def __init__(self, path: str, capture: Callable[[], Tuple[int, Dict[str, Any]]], interval: float = 5.0) -> None:
+        self.path = path
+        self.capture = capture
+        self.interval = interval
+        self.written_version: Optional[int] = None
+        self.writes = 0
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="pasta-snapshot", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def write(self, force: bool = False) -> bool:
+        """Write a snapshot if anything changed since the last one; True if written."""
+        with self._write_lock:
+            version, state = self.capture()
+            if not force and version == self.written_version:
+                return False
+            write_snapshot(self.path, state)
+            self.written_version = version
+            self.writes += 1
+            return True
+
+    def close(self) -> None:
+        """Stop the thread and write a final snapshot."""
+        self._stop.set()
+        self._thread.join()
+        self.write()
@@ -0,0 +1,395 @@
+"""Streaming transaction statistics and the mint/burn policy they drive.
+
+The experimental minting phase used to look at a single number – the
+lifetime mean ``total_amount / tx_counter``.  :class:`StreamStats` keeps,
+with O(1) work per transaction:
+
+* lifetime count / total / mean (the legacy ``average_tx_size``);
+* a :class:`RingWindow` over the last ``window`` amounts (mean, std);
+* an :class:`EWMA` with a half-life counted in transactions;
+* :class:`P2Quantile` estimators (the P² algorithm: five markers, no
+  stored samples) for the median and tail quantiles;
+* the same window per chain level, and minted / burned totals.
+
+:class:`MintPolicy` turns one of those signals (its ``basis``) into the
+``mint_amount`` of a new transaction; the signal itself becomes the
+transaction's ``average_tx_size``.  The default policy reproduces the
+original rule exactly: zero-value transactions mint ``target - lifetime
+mean`` during the first 100 000 transactions, nothing is burnt.
+
+Minting feeds back into the averages, so a replay is inherently sequential.
+:func:`backtest` runs a policy over the requests recorded in a chain
+(:func:`chain_requests`) through the same code path the node uses – a few
+microseconds per transaction – and :func:`compare` does so for several
+policies at once.
+"""
+from __future__ import annotations
+
+import math
+import threading
+from array import array
+from bisect import bisect_right, insort
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+__all__ = [
+    "EWMA",
+    "MintPolicy",
+    "P2Quantile",
+    "RingWindow",
+    "StreamStats",
+    "backtest",
+    "chain_requests",
+    "compare",
+]
+
+DEFAULT_WINDOW = 1_000
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+SYSTEM_ADDRESSES = frozenset({"GENESIS", "AGGREGATION", "CHECKPOINT"})  # blocks that are not user transfers
+
+
+# ---------------------------------------------------------------------------
+# Estimators
+# ---------------------------------------------------------------------------
+class RingWindow:
+    """The last *size* values in a fixed ``array('d')`` ring with running sums."""
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("window size must be positive")
+        self.size = size
+        self._buf = array("d", bytes(8 * size))
+        self._len = 0
+        self._pos = 0
+        self._sum = 0.0
+        self._sq = 0.0
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def push(self, x: float) -> None:
+        buf, pos = self._buf, self._pos
+        if self._len == self.size:
+            old = buf[pos]
+            self._sum -= old
+            self._sq -= old * old
+        else:
+            self._len += 1
+        buf[pos] = x
+        self._sum += x
+        self._sq += x * x
+        self._pos = (pos + 1) % self.size
+        self._pushes += 1
+        if self._pushes >= self.size:  # re-sum once per lap: bounded drift, amortised O(1)
+            self._pushes = 0
+            values = self.values()
+            self._sum = math.fsum(values)
+            self._sq = math.fsum(v * v for v in values)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._len if self._len else 0.0
+
+    @property
+    def std(self) -> float:
+        if self._len < 2:
+            return 0.0
+        mean = self._sum / self._len
+        return math.sqrt(max(0.0, self._sq / self._len - mean * mean))
+
+    def values(self) -> List[float]:
+        """Oldest first."""
+        if self._len < self.size:
+            return self._buf[: self._len].tolist()
+        return self._buf[self._pos :].tolist() + self._buf[: self._pos].tolist()
+
+
+class EWMA:
+    """Exponentially weighted moving average; *halflife* in observations."""
+
+    def __init__(self, halflife: float) -> None:
+        if halflife <= 0:
+            raise ValueError("halflife must be positive")
+        self.halflife = halflife
+        self.alpha = 1.0 - 0.5 ** (1.0 / halflife)
+        self.value = 0.0
+        self.count = 0
+
+    def update(self, x: float) -> None:
+        self.value = x if not self.count else self.value + self.alpha * (x - self.value)
+        self.count += 1
+
+
+class P2Quantile:
+    """P² estimate of the *p*-quantile (Jain & Chlamtac, 1985) in constant space."""
+
+    def __init__(self, p: float) -> None:
+        if not 0.0 < p < 1.0:
+            raise ValueError("quantile must be in (0, 1)")
+        self.p = p
+        self.count = 0
+        self._q: List[float] = []  # marker heights
+        self._n = [0, 1, 2, 3, 4]  # marker positions
+        self._np = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]  # desired positions
+        self._dn = (0.0, p / 2, p, (1 + p) / 2, 1.0)
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        q = self._q
+        if len(q) < 5:
+            insort(q, x)
+            return
+        if x < q[0]:
+            q[0], k = x, 0
+        elif x >= q[4]:
+            q[4], k = x, 3
+        else:
+            k = bisect_right(q, x) - 1
+        n, np_ = self._n, self._np
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            np_[i] += self._dn[i]
+        for i in (1, 2, 3):
+            d = np_[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                qp = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:  # parabola overshoots: linear step
+                    qp = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                q[i] = qp
+                n[i] += s
+
+    @property
+    def value(self) -> float:
+        q = self._q
+        if not q:
+            return 0.0
+        if self.count <= 5:  # exact while the markers still hold every sample
+            return q[min(len(q) - 1, int(round(self.p * (len(q) - 1))))]
+        return q[2]
+
+    def state(self) -> Dict[str, Any]:
+        return {"p": self.p, "count": self.count, "q": list(self._q), "n": list(self._n), "np": list(self._np)}
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> "P2Quantile":
+        est = cls(state["p"])
+        est.count, est._q, est._n, est._np = state["count"], list(state["q"]), list(state["n"]), list(state["np"])
+        return est
+
+
+def _quantile_name(p: float) -> str:
+    return "median" if p == 0.5 else f"p{p * 100:g}"
+
+
+class _Level:
+    __slots__ = ("count", "total", "window")
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.window = RingWindow(window)
+
+
+# ---------------------------------------------------------------------------
+# Aggregate
+# ---------------------------------------------------------------------------
+class StreamStats:
+    """Every statistic the mint policy may use, updated once per transaction.
+
+    The node records each new transaction while holding its own lock (the
+    mint decision and the update must be atomic); the internal lock only
+    lets ``GET /stats`` read a consistent view without the node lock.
+    """
+
+    def __init__(
+        self,
+        window: int = DEFAULT_WINDOW,
+        halflife: Optional[float] = None,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> None:
+        self.window_size = window
+        self.count = 0
+        self.total = 0.0
+        self.minted = 0.0
+        self.burned = 0.0
+        self.window = RingWindow(window)
+        self.ewma = EWMA(halflife or window / 2)
+        self.quantiles = {_quantile_name(p): P2Quantile(p) for p in quantiles}
+        self.levels: Dict[int, _Level] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def record(self, amount: float, level: int = 0, mint: float = 0.0) -> None:
+        """Account for one transaction of (post-mint) *amount*."""
+        with self._lock:
+            self.count += 1
+            self.total += amount
+            if mint > 0:
+                self.minted += mint
+            elif mint < 0:
+                self.burned -= mint
+            self.window.push(amount)
+            self.ewma.update(amount)
+            for est in self.quantiles.values():
+                est.add(amount)
+            lv = self.levels.get(level)
+            if lv is None:
+                lv = self.levels[level] = _Level(self.window_size)
+            lv.count += 1
+            lv.total += amount
+            lv.window.push(amount)
+
+    def value(self, basis: str) -> float:
+        """Current value of a policy signal: lifetime, window, ewma, median or pNN."""
+        with self._lock:
+            if basis == "lifetime":
+                return self.total / self.count if self.count else 0.0
+            if basis == "window":
+                return self.window.mean
+            if basis == "ewma":
+                return self.ewma.value
+            est = self.quantiles.get(basis)
+            if est is None:
+                raise ValueError(f"unknown statistic {basis!r}")
+            return est.value
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total": self.total,
+                "lifetime_mean": self.total / self.count if self.count else 0.0,
+                "window": {"size": self.window_size, "len": len(self.window), "mean": self.window.mean, "std": self.window.std},
+                "ewma": {"halflife": self.ewma.halflife, "value": self.ewma.value},
+                "quantiles": {name: est.value for name, est in self.quantiles.items()},
+                "minted": self.minted,
+                "burned": self.burned,
+                "levels": {
+                    str(level): {
+                        "count": lv.count,
+                        "mean": lv.total / lv.count,
+                        "window_mean": lv.window.mean,
+                    }
+                    for level, lv in sorted(self.levels.items())
+                },
+            }
+
+    # ------------------------------------------------------------------
+    # Persistence (mempool snapshots and checkpoints)
+    # ------------------------------------------------------------------
+    def state(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total": self.total,
+                "minted": self.minted,
+                "burned": self.burned,
+                "window": self.window.values(),
+                "ewma": [self.ewma.value, self.ewma.count],
+                "quantiles": [est.state() for est in self.quantiles.values()],
+                "levels": {str(k): [lv.count, lv.total, lv.window.values()] for k, lv in self.levels.items()},
+            }
+
+    def load(self, state: Mapping[str, Any]) -> None:
+        """Restore :meth:`state`; files without it only carry the lifetime totals."""
+        with self._lock:
+            self.count, self.total = state["count"], state["total"]
+            self.minted, self.burned = state.get("minted", 0.0), state.get("burned", 0.0)
+            self.window = RingWindow(self.window_size)
+            for x in state.get("window", ()):
+                self.window.push(x)
+            self.ewma = EWMA(self.ewma.halflife)
+            self.ewma.value, self.ewma.count = state.get("ewma", (0.0, 0))
+            for est_state in state.get("quantiles", ()):
+                est = P2Quantile.from_state(est_state)
+                if _quantile_name(est.p) in self.quantiles:
+                    self.quantiles[_quantile_name(est.p)] = est
+            self.levels = {}
+            for key, (count, total, values) in state.get("levels", {}).items():
+                lv = self.levels[int(key)] = _Level(self.window_size)
+                lv.count, lv.total = count, total
+                for x in values:
+                    lv.window.push(x)
+
+
+# ---------------------------------------------------------------------------
+# Policy
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class MintPolicy:
+    """How a new transaction's ``mint_amount`` is chosen.
+
+    Zero-value transactions mint ``target - signal`` (never negative) while
+    fewer than *mint_limit* transactions were seen; with ``burn_rate > 0``
+    a transfer made while the signal is above *target* burns that fraction
+    of its amount (``mint_amount < 0``, charged to the sender).
+    """
+
+    target: float = 10.0
+    basis: str = "lifetime"
+    mint_limit: Optional[int] = 100_000
+    burn_rate: float = 0.0
+
+    def decide(self, amount: float, stats: StreamStats) -> Tuple[float, float, float]:
+        """``(amount, mint_amount, signal)`` for a requested *amount*."""
+        signal = stats.value(self.basis)
+        if amount == 0:
+            if self.mint_limit is None or stats.count < self.mint_limit:
+                mint = max(0.0, self.target - signal)
+                return mint, mint, signal
+        elif self.burn_rate and amount > 0 and signal > self.target:
+            return amount, -self.burn_rate * amount, signal
+        return amount, 0.0, signal
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# ---------------------------------------------------------------------------
+# Replay
+# ---------------------------------------------------------------------------
+def chain_requests(blocks: Iterable[Mapping[str, Any]]) -> Iterator[Tuple[float, int]]:
+    """``(requested amount, level)`` of each user transfer in *blocks*.
+
+    A minted transaction was requested with amount 0; a burn does not
+    change the amount.  Genesis, aggregation and checkpoint blocks are skipped.
+    """
+    for block in blocks:
+        if block["sender_address"] in SYSTEM_ADDRESSES:
+            continue
+        mint = block.get("mint_amount") or 0.0
+        yield (0.0 if mint > 0 else block["amount"]), block.get("level") or 0
+
+
+def backtest(
+    requests: Iterable[Tuple[float, int]],
+    policy: MintPolicy,
+    window: int = DEFAULT_WINDOW,
+    halflife: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Replay *requests* under *policy*; the final :meth:`StreamStats.to_dict`."""
+    quantiles = [p for p in DEFAULT_QUANTILES if _quantile_name(p) == policy.basis]  # only what the signal needs
+    stats = StreamStats(window, halflife, quantiles)
+    stats.value(policy.basis)  # reject an unknown basis up front
+    decide, record = policy.decide, stats.record
+    for amount, level in requests:
+        amount, mint, _ = decide(amount, stats)
+        record(amount, level, mint)
+    return stats.to_dict()
+
+
+def compare(
+    blocks: Iterable[Mapping[str, Any]],
+    policies: Mapping[str, MintPolicy],
+    window: int = DEFAULT_WINDOW,
+    halflife: Optional[float] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Backtest every policy over the same chain (read once)."""
+    requests = list(chain_requests(blocks))
+    return {name: backtest(requests, policy, window, halflife) for name, policy in policies.items()}
@@ -0,0 +1,341 @@
+"""Persistent, append-only block storage.
+
+On-disk layout of a data directory::
+
+    seg-000000.log   segment files: [u32 length][u32 crc32][encoded block]...
+    index.loc        one native u64 per height: segment << 40 | byte offset
+    index.hash       32 raw bytes of block_hash per height
+    base             "<first indexed height> <first retained height>" (only
+                     for bootstrapped or pruned logs)
+
+Blocks are stored in the canonical encoding from :mod:`pasta.core.encoding`.
+Writes go through buffered appends and are ``fsync``-ed in batches (every
+``sync_every`` blocks or ``sync_interval`` seconds, whichever comes first),
+so a crash may lose at most one batch but never corrupts earlier blocks.
+
+Opening a directory loads only ``index.loc`` into an ``array`` – no block is
+decoded – so start-up time grows with the index size, not the chain size.
+The hash → height map is built lazily on the first lookup.  Reads ``mmap``
+the segment files and decode straight from the mapping.
+
+Recovery: trailing index entries whose record is missing or fails its CRC
+are dropped, complete records written after the last index entry are
+re-indexed, and a torn record at the tail is truncated away.
+
+Pruning (:meth:`BlockLog.prune`) raises the retained height and deletes –
+or, with ``cold_dir``, moves – every segment that only holds older blocks.
+The index files keep their entries (40 bytes per block) so heights stay
+stable; a log created with ``base=h`` (bootstrap from a checkpoint) starts
+indexing at height ``h``.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import struct
+import threading
+import time
+import zlib
+from array import array
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from pasta.core.encoding import decode_block, encode_block
+from pasta.core.models import TransactionBlock
+from pasta.node.store import BlockStore, hash_bytes as _hash_bytes
+
+__all__ = ["BlockLog"]
+
+_REC = struct.Struct(">II")  # payload length, crc32
+_OFFSET_BITS = 40
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+_LOC_FILE = "index.loc"
+_HASH_FILE = "index.hash"
+_BASE_FILE = "base"
+_NO_HASH = bytes(32)  # what _hash_bytes returns for non-hex hashes
+
+
+def _seg_name(seg: int) -> str:
+    return f"seg-{seg:06d}.log"
+
+
+class BlockLog(BlockStore):
+    """Segment-log block store with the same read API as ``ChainStore``."""
+
+    def __init__(
+        self,
+        path: str,
+        segment_size: int = 64 * 2**20,
+        sync_every: int = 256,
+        sync_interval: float = 1.0,
+        base: int = 0,
+        cold_dir: Optional[str] = None,
+    ) -> None:
+        self.path = path
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.cold_dir = cold_dir
+
+        os.makedirs(path, exist_ok=True)
+        self._offset = self.base = 0  # first indexed / first retained height
+        if not self._read_base() and not os.path.exists(os.path.join(path, _LOC_FILE)):
+            self._offset = self.base = base  # a fresh log may start above genesis
+        self._lock = threading.Lock()  # serialises writes and re-mapping
+        self._locs = array("Q")
+        self._by_hash: Optional[Dict[bytes, int]] = None
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._recover()
+
+        self._data = open(self._seg_path(self._active), "ab")
+        self._loc_f = open(os.path.join(path, _LOC_FILE), "ab")
+        self._hash_f = open(os.path.join(path, _HASH_FILE), "ab")
+        self._len = self._offset + len(self._locs)
+        if self.base and not os.path.exists(os.path.join(path, _BASE_FILE)):
+            self._write_base()
+
+    def _read_base(self) -> bool:
+        try:
+            with open(os.path.join(self.path, _BASE_FILE), "r", encoding="ascii") as f:
+                self._offset, self.base = map(int, f.read().split())
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _write_base(self) -> None:
+        path = os.path.join(self.path, _BASE_FILE)
+        with open(path + ".tmp", "w", encoding="ascii") as f:
+            f.write(f"{self._offset} {self.base}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    # ------------------------------------------------------------------
+    # Start-up / crash recovery
+    # ------------------------------------------------------------------
+    def _seg_path(self, seg: int) -> str:
+        return os.path.join(self.path, _seg_name(seg))
+
+    def _segments(self) -> List[int]:
+        segs = []
+        for name in os.listdir(self.path):
+            if name.startswith("seg-") and name.endswith(".log"):
+                segs.append(int(name[4:-4]))
+        return sorted(segs)
+
+    @staticmethod
+    def _read_record(f, offset: int) -> Optional[bytes]:
+        """Return the payload at *offset* or ``None`` if missing/torn/corrupt."""
+        f.seek(offset)
+        head = f.read(_REC.size)
+        if len(head) < _REC.size:
+            return None
+        length, crc = _REC.unpack(head)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return None
+        return payload
+
+    def _recover(self) -> None:
+        loc_path = os.path.join(self.path, _LOC_FILE)
+        hash_path = os.path.join(self.path, _HASH_FILE)
+        locs = array("Q")
+        if os.path.exists(loc_path):
+            with open(loc_path, "rb") as f:
+                raw = f.read()
+            hash_count = os.path.getsize(hash_path) // 32 if os.path.exists(hash_path) else 0
+            n = min(len(raw) // locs.itemsize, hash_count)
+            locs.frombytes(raw[: n * locs.itemsize])
+
+        # Drop trailing index entries that point at records which never made it
+        resume: Tuple[int, int] = (0, 0)
+        while locs:
+            seg, off = locs[-1] >> _OFFSET_BITS, locs[-1] & _OFFSET_MASK
+            payload = None
+            if os.path.exists(self._seg_path(seg)):
+                with open(self._seg_path(seg), "rb") as f:
+                    payload = self._read_record(f, off)
+            if payload is not None:
+                resume = (seg, off + _REC.size + len(payload))
+                break
+            locs.pop()
+
+        # Re-index complete records past the last index entry; cut a torn tail
+        hashes: List[bytes] = []
+        segs = [s for s in self._segments() if s >= resume[0]] or [resume[0]]
+        for i, seg in enumerate(segs):
+            off = resume[1] if seg == resume[0] else 0
+            path = self._seg_path(seg)
+            torn = False
+            with open(path, "ab+") as f:
+                size = f.seek(0, os.SEEK_END)
+                while off < size:
+                    payload = self._read_record(f, off)
+                    if payload is None:
+                        f.truncate(off)
+                        torn = True
+                        break
+                    locs.append(seg << _OFFSET_BITS | off)
+                    hashes.append(_hash_bytes(decode_block(payload)["block_hash"]))
+                    off += _REC.size + len(payload)
+            if torn:
+                for later in segs[i + 1 :]:
+                    os.remove(self._seg_path(later))
+                break
+
+        # Rewrite the index files to exactly len(locs) entries
+        with open(hash_path, "ab+") as f:
+            f.truncate((len(locs) - len(hashes)) * 32)
+            f.write(b"".join(hashes))
+        with open(loc_path, "wb") as f:
+            f.write(locs.tobytes())
+
+        self._locs = locs
+        self._active = seg
+        self._active_size = off
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def append(self, block: Union[TransactionBlock, Mapping[str, Any]]) -> int:
+        """Append *block*; durable after the next batch :meth:`sync`."""
+        payload = encode_block(block)
+        record = _REC.pack(len(payload), zlib.crc32(payload)) + payload
+        block_hash = block.block_hash if isinstance(block, TransactionBlock) else block.get("block_hash")
+        with self._lock:
+            if self._active_size and self._active_size + len(record) > self.segment_size:
+                self._data.close()
+                self._active += 1
+                self._active_size = 0
+                self._data = open(self._seg_path(self._active), "ab")
+            loc = self._active << _OFFSET_BITS | self._active_size
+            self._data.write(record)
+            self._active_size += len(record)
+
+            hb = _hash_bytes(block_hash)
+            self._loc_f.write(array("Q", [loc]).tobytes())
+            self._hash_f.write(hb)
+            height = self._offset + len(self._locs)
+            self._locs.append(loc)
+            if self._by_hash is not None:
+                self._by_hash.setdefault(hb, height)
+
+            self._tip = block if isinstance(block, TransactionBlock) else None
+            self._len = height + 1
+
+            self._unsynced += 1
+            if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self._sync_locked()
+            return height
+
+    def _sync_locked(self) -> None:
+        # Data before index: recovery tolerates index entries without data
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        for f in (self._loc_f, self._hash_f):
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force every appended block to disk."""
+        with self._lock:
+            self._sync_locked()
+
+    def prune(self, height: int) -> int:
+        """Retain heights from *height* on; older segments go to ``cold_dir`` or are deleted."""
+        with self._lock:
+            height = min(height, self._len)
+            if height <= self.base:
+                return self.base
+            self.base = height
+            self._write_base()  # first, so a crash never exposes a half-moved range
+            keep = self._locs[height - self._offset] >> _OFFSET_BITS if height < self._len else self._active
+            for seg in self._segments():
+                if seg >= keep or seg == self._active:
+                    continue
+                self._maps.pop(seg, None)  # readers still holding the map keep it alive
+                if self.cold_dir is not None:
+                    os.makedirs(self.cold_dir, exist_ok=True)
+                    shutil.move(self._seg_path(seg), os.path.join(self.cold_dir, _seg_name(seg)))
+                else:
+                    os.remove(self._seg_path(seg))
+            return self.base
+
+    def close(self) -> None:
+        with self._lock:
+            if self._data.closed:
+                return
+            self._sync_locked()
+            for f in (self._data, self._loc_f, self._hash_f):
+                f.close()
+            self._maps.clear()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def _mapping(self, seg: int, end: int) -> mmap.mmap:
+        m = self._maps.get(seg)
+        if m is not None and len(m) >= end:
+            return m
+        with self._lock:
+            m = self._maps.get(seg)
+            if m is None or len(m) < end:
+                if seg == self._active:
+                    self._data.flush()  # make buffered appends visible to the map
+                with open(self._seg_path(seg), "rb") as f:
+                    m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                # Old maps are simply dropped: a reader may still hold them
+                self._maps[seg] = m
+        return m
+
+    def row(self, height: int) -> Dict[str, Any]:
+        if height < self.base:
+            raise IndexError(f"block {height} was pruned (chain starts at {self.base})")
+        with self._payload(height) as payload:
+            return decode_block(payload)
+
+    def _payload(self, height: int) -> memoryview:
+        loc = self._locs[height - self._offset]
+        seg, off = loc >> _OFFSET_BITS, loc & _OFFSET_MASK
+        m = self._mapping(seg, off + _REC.size)
+        length, _ = _REC.unpack_from(m, off)
+        start = off + _REC.size
+        return memoryview(self._mapping(seg, start + length))[start : start + length]
+
+    def records(self, start: int, stop: int) -> List[bytes]:
+        """Stored encodings, copied straight from the segments (nothing decoded)."""
+        if start < self.base:
+            raise IndexError(f"block {start} was pruned (chain starts at {self.base})")
+        return [bytes(self._payload(h)) for h in range(start, min(stop, self._len))]
+
+    def hashes(self, start: int, stop: int) -> bytes:
+        """Read from ``index.hash``."""
+        if start < self.base:
+            raise IndexError(f"block {start} was pruned (chain starts at {self.base})")
+        stop = min(stop, self._len)
+        if start >= stop:
+            return b""
+        with self._lock:
+            self._hash_f.flush()
+        with open(os.path.join(self.path, _HASH_FILE), "rb") as f:
+            f.seek((start - self._offset) * 32)
+            return f.read((stop - start) * 32)
+
+    def height_of(self, block_hash: str) -> Optional[int]:
+        """Height of *block_hash*; builds the hash map on first use."""
+        if self._by_hash is None:
+            with self._lock:
+                if self._by_hash is None:
+                    self._hash_f.flush()
+                    with open(os.path.join(self.path, _HASH_FILE), "rb") as f:
+                        raw = f.read(len(self._locs) * 32)
+                    by_hash: Dict[bytes, int] = {}
+                    for i in range(len(raw) // 32):
+                        by_hash.setdefault(raw[i * 32 : i * 32 + 32], self._offset + i)
+                    self._by_hash = by_hash
+        hb = _hash_bytes(block_hash)
+        return None if hb == _NO_HASH else self._by_hash.get(hb)
@@ -0,0 +1,347 @@
+"""Compact, columnar in-memory chain store.
+
+Keeping every block as a ``TransactionBlock.__dict__`` costs well over a
+kilobyte per block (a 22-key dict plus one str object per field).  The
+:class:`ChainStore` instead keeps one column per field:
+
+* addresses and the state marker are interned – each distinct string is
+  stored once and rows hold a 4-byte id;
+* timestamps, levels, difficulties and nonces live in ``array`` columns;
+* amounts and balances live in ``array('d')`` columns (exact float values);
+* hex hashes are packed as 32 raw bytes in a ``bytearray``; the rare
+  non-hex value (``"GENESIS"``, ``None``…) is kept in a small side table.
+
+Rows are turned back into plain dicts only when somebody reads them, so
+``Node.get_blockchain()`` can return a lazy :class:`ChainView` instead of
+copying the whole chain.  The store is append-only; the node appends under
+its lock while readers may index rows below a view's length without it.
+
+Heights are absolute.  Rows below :attr:`BlockStore.base` are gone – pruned
+behind a balance checkpoint, or never held by a node bootstrapped from one
+(see :mod:`pasta.node.checkpoint`) – and reading them raises ``IndexError``.
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from dataclasses import MISSING, fields
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Union
+
+from pasta.core.encoding import encode_block
+from pasta.core.models import TransactionBlock
+
+__all__ = ["BlockStore", "ChainStore", "ChainView", "hash_bytes"]
+
+FIELD_NAMES = tuple(f.name for f in fields(TransactionBlock))
+_DEFAULTS = {f.name: f.default for f in fields(TransactionBlock) if f.default is not MISSING}
+
+_ADDRESSES = ("sender_address", "receiver_address", "validator_address", "state")
+_HASHES = ("predecessor_id", "predecessor_hash", "validated_block_id", "validated_block_hash", "block_hash")
+_FLOATS = (
+    "amount",
+    "sender_balance_before",
+    "sender_balance_after",
+    "receiver_balance_before",
+    "receiver_balance_after",
+    "mint_amount",
+    "average_tx_size",
+)
+_INTS = {"timestamp": "q", "level": "i", "required_difficulty": "i", "storage_requirement": "q"}
+_OBJECTS = ("signature", "signed_amount", "signed_timestamp")  # unique per row: plain lists
+_HEX = frozenset("0123456789abcdef")
+_NO_HASH = bytes(32)
+
+
+def hash_bytes(block_hash: Optional[str]) -> bytes:
+    """32 raw bytes of a hex block hash; zeros for anything else."""
+    try:
+        raw = bytes.fromhex(block_hash or "")
+    except ValueError:
+        return _NO_HASH
+    return raw if len(raw) == 32 else _NO_HASH
+
+
+class _Interner:
+    """Bidirectional string <-> small int table; id 0 is ``None``."""
+
+    __slots__ = ("_ids", "_values")
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._values: List[Optional[str]] = [None]
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = self._ids[value] = len(self._values)
+            self._values.append(value)
+        return idx
+
+    def lookup(self, idx: int) -> Optional[str]:
+        return self._values[idx]
+
+    def id_of(self, value: str) -> Optional[int]:
+        return self._ids.get(value)
+
+    def __len__(self) -> int:
+        return len(self._values) - 1
+
+
+class _HashColumn:
+    """32 raw bytes per row; non-hex values go to an exceptions dict."""
+
+    __slots__ = ("_buf", "_other")
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._other: Dict[int, Optional[str]] = {}
+
+    @staticmethod
+    def pack(value: Optional[str]) -> Optional[bytes]:
+        """Raw bytes of a hex hash, ``None`` for values kept in the exceptions dict."""
+        if isinstance(value, str) and len(value) == 64 and _HEX.issuperset(value):
+            return bytes.fromhex(value)
+        return None
+
+    def append(self, row: int, value: Optional[str], raw: Optional[bytes]) -> None:
+        if raw is not None:
+            self._buf += raw
+        else:
+            self._buf += bytes(32)
+            self._other[row] = value
+
+    def get(self, row: int) -> Optional[str]:
+        if row in self._other:
+            return self._other[row]
+        return self._buf[row * 32 : row * 32 + 32].hex()
+
+    def tail(self, n: int) -> "_HashColumn":
+        """New column without the first *n* rows."""
+        col = _HashColumn()
+        col._buf = self._buf[n * 32 :]
+        col._other = {row - n: value for row, value in self._other.items() if row >= n}
+        return col
+
+    def nbytes(self) -> int:
+        return len(self._buf)
+
+
+class BlockStore:
+    """Shared read API of every chain backend.
+
+    Subclasses keep ``self._len`` (one past the tip height) and ``self.base``
+    current and implement :meth:`append`, :meth:`row` and :meth:`prune`;
+    list-style indexing, views and tip caching come from here.
+    """
+
+    _len = 0
+    base = 0  # first height still held
+    _tip: Optional[TransactionBlock] = None
+
+    def append(self, block: Union[TransactionBlock, Mapping[str, Any]]) -> int:  # pragma: no cover – abstract
+        raise NotImplementedError
+
+    def row(self, height: int) -> Dict[str, Any]:  # pragma: no cover – abstract
+        raise NotImplementedError
+
+    def prune(self, height: int) -> int:  # pragma: no cover – abstract
+        """Drop every row below *height*; returns the new :attr:`base`."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        return self._len
+
+    def hashes(self, start: int, stop: int) -> bytes:
+        """Packed 32-byte block hashes of heights ``start..stop-1`` (sync headers)."""
+        return b"".join(hash_bytes(self.row(h)["block_hash"]) for h in range(start, stop))
+
+    def records(self, start: int, stop: int) -> List[bytes]:
+        """Canonical encodings (``pasta.core.encoding``) of heights ``start..stop-1``."""
+        return [encode_block(self.row(h)) for h in range(start, stop)]
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.view())
+
+    def block(self, height: int) -> TransactionBlock:
+        """Return block *height* as a ``TransactionBlock``."""
+        if height < 0:
+            height += self._len
+        if height == self._len - 1:
+            return self.tip()
+        return TransactionBlock(**self.row(height))
+
+    def tip(self) -> TransactionBlock:
+        """Most recently appended block (shared object – treat as read-only)."""
+        if self._tip is None:
+            if not self._len:
+                raise IndexError("chain is empty")
+            self._tip = TransactionBlock(**self.row(self._len - 1))
+        return self._tip
+
+    def view(self) -> "ChainView":
+        """Lazy, fixed-length snapshot of the retained chain (``base`` onwards)."""
+        return ChainView(self, self.base, self._len)
+
+    def close(self) -> None:
+        """Release resources held by the backend (no-op in memory)."""
+
+
+class ChainStore(BlockStore):
+    """Append-only columnar block store with list-of-dict style access."""
+
+    def __init__(self, base: int = 0) -> None:
+        self.base = base
+        self._len = base
+        self._strings = _Interner()
+        self._addr = {name: array("I") for name in _ADDRESSES}
+        self._hashes = {name: _HashColumn() for name in _HASHES}
+        self._floats = {name: array("d") for name in _FLOATS}
+        self._ints = {name: array(code) for name, code in _INTS.items()}
+        self._nonce = array("q")  # -1 = None
+        self._objects: Dict[str, List[Optional[str]]] = {name: [] for name in _OBJECTS}
+        self._tip: Optional[TransactionBlock] = None
+        # (base, readers) swapped as one object so lock-free readers never
+        # pair a new base with the old columns
+        self._columns = (base, self._build_readers())
+
+    def _build_readers(self) -> List[Any]:
+        """One ``(field, row -> value)`` reader per field, in dataclass order."""
+        lookup = self._strings.lookup
+        nonce = self._nonce
+        readers = []
+        for name in FIELD_NAMES:
+            if name in self._addr:
+                readers.append((name, lambda h, c=self._addr[name]: lookup(c[h])))
+            elif name in self._hashes:
+                readers.append((name, self._hashes[name].get))
+            elif name in self._floats:
+                readers.append((name, self._floats[name].__getitem__))
+            elif name in self._ints:
+                readers.append((name, self._ints[name].__getitem__))
+            elif name == "nonce":
+                readers.append((name, lambda h: None if nonce[h] < 0 else nonce[h]))
+            else:
+                readers.append((name, self._objects[name].__getitem__))
+        return readers
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def append(self, block: Union[TransactionBlock, Mapping[str, Any]]) -> int:
+        """Append *block* and return its height."""
+        if isinstance(block, TransactionBlock):
+            f = vars(block)
+        else:
+            f = {**_DEFAULTS, **block}
+        row = self._len - self.base
+        # Convert every value before touching a column: a field of the wrong
+        # type raises here instead of leaving a half-written row behind
+        addrs = [(col, self._strings.intern(f[name])) for name, col in self._addr.items()]
+        hashes = [(col, f[name], _HashColumn.pack(f[name])) for name, col in self._hashes.items()]
+        numbers = [(col, array(col.typecode, [f[name]])) for name, col in (*self._floats.items(), *self._ints.items())]
+        numbers.append((self._nonce, array("q", [-1 if f["nonce"] is None else f["nonce"]])))
+        objects = [(col, f[name]) for name, col in self._objects.items()]
+        for col, value in addrs + objects:
+            col.append(value)
+        for col, value, raw in hashes:
+            col.append(row, value, raw)
+        for col, value in numbers:
+            col.extend(value)
+        self._tip = block if isinstance(block, TransactionBlock) else None
+        self._len += 1  # publish the row last: readers use len() as the bound
+        return self._len - 1
+
+    def prune(self, height: int) -> int:
+        """Drop rows below *height* (caller holds the node lock, no concurrent appends)."""
+        n = min(height, self._len) - self.base
+        if n <= 0:
+            return self.base
+        # Fresh columns: readers holding the old ones keep valid data
+        self._addr = {name: col[n:] for name, col in self._addr.items()}
+        self._hashes = {name: col.tail(n) for name, col in self._hashes.items()}
+        self._floats = {name: col[n:] for name, col in self._floats.items()}
+        self._ints = {name: col[n:] for name, col in self._ints.items()}
+        self._nonce = self._nonce[n:]
+        self._objects = {name: col[n:] for name, col in self._objects.items()}
+        self.base += n
+        self._columns = (self.base, self._build_readers())
+        return self.base
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+    def row(self, height: int) -> Dict[str, Any]:
+        """Materialise block *height* (no negative indices) as a fresh dict."""
+        base, readers = self._columns
+        if height < base:
+            raise IndexError(f"block {height} was pruned (chain starts at {base})")
+        row = height - base
+        return {name: read(row) for name, read in readers}
+
+    def hashes(self, start: int, stop: int) -> bytes:
+        base, column = self.base, self._hashes["block_hash"]
+        if start < base:
+            raise IndexError(f"block {start} was pruned (chain starts at {base})")
+        stop = min(stop, self._len)
+        raw = bytes(column._buf[(start - base) * 32 : (stop - base) * 32])
+        if any(start <= row + base < stop for row in column._other):  # rare non-hex hashes
+            return super().hashes(start, stop)
+        return raw
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the columns (excluding interned strings)."""
+        total = sum(c.nbytes() for c in self._hashes.values())
+        total += sum(len(c) * c.itemsize for c in self._addr.values())
+        total += sum(len(c) * c.itemsize for c in self._floats.values())
+        total += sum(len(c) * c.itemsize for c in self._ints.values())
+        total += len(self._nonce) * self._nonce.itemsize + sum(len(c) * 8 for c in self._objects.values())
+        return total
+
+
+class ChainView(Sequence):
+    """Read-only sequence of block dicts over ``store[start:stop]``."""
+
+    __slots__ = ("_store", "_start", "_stop")
+
+    def __init__(self, store: BlockStore, start: int, stop: int) -> None:
+        self._store = store
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @property
+    def first_height(self) -> int:
+        """Height of ``view[0]`` (non-zero once the chain was pruned)."""
+        return self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return ChainView(self._store, self._start + start, self._start + max(start, stop))
+            return [self._store.row(self._start + i) for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("chain index out of range")
+        return self._store.row(self._start + index)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        row = self._store.row
+        for height in range(self._start, self._stop):
+            yield row(height)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, tuple, ChainView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"<ChainView heights {self._start}..{self._stop - 1}>"
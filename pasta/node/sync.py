@@ -0,0 +1,353 @@
+"""Header-first chain sync from one or more peers.
+
+A new or lagging node catches up in three overlapping stages:
+
+1. **Headers** – ``GET /sync/headers?from_height=&limit=`` returns the
+   packed 32-byte hashes of a height range (heights are implicit, 32 bytes
+   per block instead of a JSON row).  It is taken from the peer with the
+   highest tip and starts at our own tip, whose hash must match – peers on
+   another chain are refused, there are no reorgs.  With a ``data_dir`` it
+   is saved to ``sync.headers`` as it arrives.  A tip is only a claim: when
+   a peer's headers cannot be synced against (bad chunk, another chain, or
+   a range for which no peer serves matching bodies) that peer is dropped
+   (``stats["dropped_peers"]``) and the run continues from the committed
+   height with headers from the next peer.
+2. **Bodies** – the missing heights are cut into ranges of ``batch``
+   blocks fetched from ``GET /sync/blocks`` in parallel: round-robin over
+   the peers whose tip covers a range, one pooled keep-alive
+   ``requests.Session`` per download thread, and a failed range is retried
+   on the next peer.  Bodies travel in the canonical binary encoding
+   (``[u32 length][record]...``), which a ``BlockLog`` serves without
+   decoding.
+3. **Verification and commit** – each range is checked as soon as it
+   arrives, in its download thread or, with ``verify_workers > 1``, in a
+   process pool.  Every body must decode to well-typed fields, match its
+   header hash and carry a valid proof of work at the difficulty its level
+   requires.  It must also link to an earlier block: normally the
+   previous header; a branch block's link is checked against the chain at
+   commit.  Ranges are committed strictly in height order under the node
+   lock, at most ``window`` ranges ahead of the commit point.  Balances
+   are recomputed by the ledger, not trusted.
+
+Resuming: blocks are committed in order, so the node's own chain length is
+the resume point; with a ``data_dir`` the saved header list is reused too,
+and an interrupted sync (``stop`` event, crash, lost peer) picks up with the
+first missing body.
+"""
+from __future__ import annotations
+
+import os
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from pasta.core.encoding import check_fields, decode_block
+from pasta.core.models import TransactionBlock
+from pasta.node import events as ev
+from pasta.node.checkpoint import expected_difficulty
+from pasta.node.store import hash_bytes
+from pasta.validation import engine as ve
+
+__all__ = [
+    "HEADERS_FILE",
+    "MAX_SYNC_BLOCKS",
+    "MAX_SYNC_HEADERS",
+    "SYNC_MIMETYPE",
+    "ChainSync",
+    "SyncError",
+    "pack_records",
+    "unpack_records",
+    "verify_range",
+]
+
+SYNC_MIMETYPE = "application/octet-stream"
+MAX_SYNC_HEADERS = 100_000  # hashes per /sync/headers response (3.2 MB)
+MAX_SYNC_BLOCKS = 5_000  # bodies per /sync/blocks response
+HEADERS_FILE = "sync.headers"
+
+_LEN = struct.Struct(">I")
+_FROM = struct.Struct(">Q")
+
+
+class SyncError(Exception):
+    """A peer served data that does not verify, or no peer could serve a range."""
+
+
+def pack_records(records: Sequence[bytes]) -> bytes:
+    return b"".join(_LEN.pack(len(r)) + r for r in records)
+
+
+def unpack_records(data: bytes) -> List[memoryview]:
+    view, out, pos = memoryview(data), [], 0
+    while pos < len(view):
+        (size,) = _LEN.unpack_from(view, pos)
+        pos += _LEN.size
+        if pos + size > len(view):
+            raise SyncError("truncated block record")
+        out.append(view[pos : pos + size])
+        pos += size
+    return out
+
+
+def verify_range(start: int, payload: bytes, hashes: bytes, previous: bytes) -> Tuple[List[TransactionBlock], Dict[int, str]]:
+    """Decode and check the bodies of heights ``start..`` against their *hashes*.
+
+    *previous* is the header hash right before *start*.  Returns the blocks
+    and ``{height: predecessor_hash}`` for the links that point further
+    back than the previous block (checked against the chain at commit).
+    """
+    records = unpack_records(payload)
+    if len(records) * 32 != len(hashes):
+        raise SyncError(f"expected {len(hashes) // 32} blocks from {start}, got {len(records)}")
+    blocks, deferred = [], {}
+    for i, record in enumerate(records):
+        try:
+            block = TransactionBlock(**check_fields(decode_block(record)))
+        except (ValueError, struct.error) as exc:  # UnicodeDecodeError is a ValueError
+            raise SyncError(f"block {start + i} is malformed: {exc}") from None
+        header = hashes[i * 32 : i * 32 + 32]
+        if hash_bytes(block.block_hash) != header:
+            raise SyncError(f"block {start + i} does not match its header")
+        if block.required_difficulty != expected_difficulty(block):
+            raise SyncError(f"block {start + i} is not mined at the difficulty of level {block.level}")
+        if not ve.verify_pow(block):
+            raise SyncError(f"block {start + i} has an invalid proof of work")
+        if hash_bytes(block.predecessor_hash) != previous:
+            deferred[start + i] = block.predecessor_hash
+        previous = header
+        blocks.append(block)
+    return blocks, deferred
+
+
+class ChainSync:
+    """Bring *node* up to the longest chain among *peers* (base URLs)."""
+
+    def __init__(
+        self,
+        node,
+        peers: Sequence[str],
+        batch: int = 1_000,
+        workers: int = 4,
+        verify_workers: int = 1,
+        window: Optional[int] = None,
+        retries: int = 3,
+        timeout: float = 30.0,
+        session_factory: Callable[[], requests.Session] = requests.Session,
+    ) -> None:
+        if not peers:
+            raise ValueError("no peers to sync from")
+        self.node = node
+        self.peers = [p.rstrip("/") for p in peers]
+        self.batch = min(batch, MAX_SYNC_BLOCKS)
+        self.workers = workers
+        self.verify_workers = verify_workers
+        self.window = window or 2 * workers
+        self.retries = retries
+        self.timeout = timeout
+        self._session_factory = session_factory
+        self._local = threading.local()
+        self._tips: Dict[str, int] = {}
+        self._headers_from = 0
+        self._headers = bytearray()
+        data_dir = getattr(node.blockchain, "path", None)
+        self.headers_path = None if data_dir is None else os.path.join(data_dir, HEADERS_FILE)
+        self.stats: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._session_factory()
+        return session
+
+    def _get(self, peer: str, route: str, start: int, limit: int) -> requests.Response:
+        resp = self._session().get(
+            f"{peer}{route}", params={"from_height": start, "limit": limit}, timeout=self.timeout
+        )
+        if resp.status_code != 200:
+            raise SyncError(f"{peer}{route} answered {resp.status_code}: {resp.text[:200]}")
+        self.stats["bytes"] = self.stats.get("bytes", 0) + len(resp.content)
+        return resp
+
+    def _probe(self) -> None:
+        for peer in self.peers:
+            try:
+                resp = self._get(peer, "/sync/headers", len(self.node.blockchain) - 1, 0)
+            except (requests.RequestException, SyncError):
+                continue
+            try:
+                self._tips[peer] = int(resp.headers["X-Tip-Height"])
+            except (KeyError, ValueError):
+                continue  # not a sync peer
+
+    def _drop(self, peer: str, reason: Any) -> None:
+        """Stop using *peer* for this run (its headers could not be synced against)."""
+        self._tips.pop(peer, None)
+        self.stats["dropped_peers"].append(f"{peer}: {reason}")
+
+    # ------------------------------------------------------------------
+    # Stage 1: headers
+    # ------------------------------------------------------------------
+    def _header(self, height: int) -> bytes:
+        i = (height - self._headers_from) * 32
+        return bytes(self._headers[i : i + 32])
+
+    def _load_headers(self, anchor: int) -> None:
+        """Reuse a saved header list that contains our tip *anchor*."""
+        self._headers_from, self._headers = anchor, bytearray()
+        if self.headers_path is None or not os.path.exists(self.headers_path):
+            return
+        with open(self.headers_path, "rb") as f:
+            raw = f.read()
+        if len(raw) < _FROM.size:
+            return
+        (start,) = _FROM.unpack_from(raw)
+        hashes = raw[_FROM.size :]
+        hashes = hashes[: len(hashes) // 32 * 32]  # drop a torn tail
+        if start <= anchor < start + len(hashes) // 32:
+            self._headers_from, self._headers = anchor, bytearray(hashes[(anchor - start) * 32 :])
+
+    def _save_headers(self, fresh: bool, chunk: bytes) -> None:
+        if self.headers_path is None:
+            return
+        with open(self.headers_path, "wb" if fresh else "ab") as f:
+            if fresh:
+                f.write(_FROM.pack(self._headers_from))
+                f.write(self._headers[: len(self._headers) - len(chunk)])
+            f.write(chunk)
+
+    def _fetch_headers(self, best: str, anchor: int, target: int) -> None:
+        reused = len(self._headers) // 32
+        fresh = True
+        while self._headers_from + len(self._headers) // 32 <= target:
+            start = self._headers_from + len(self._headers) // 32
+            try:
+                chunk = self._get(best, "/sync/headers", start, min(MAX_SYNC_HEADERS, target + 1 - start)).content
+            except requests.RequestException as exc:
+                raise SyncError(f"{best} did not serve headers from {start}: {exc}") from None
+            if not chunk or len(chunk) % 32:
+                raise SyncError(f"{best} served {len(chunk)} header bytes from {start}")
+            self._headers += chunk
+            self._save_headers(fresh, chunk)
+            fresh = False
+        self.stats["headers_reused"] = reused
+        if self._header(anchor) != hash_bytes(self.node.blockchain.row(anchor)["block_hash"]):
+            raise SyncError(f"{best} follows another chain (block {anchor} differs)")
+
+    # ------------------------------------------------------------------
+    # Stage 2 + 3: bodies, verification, ordered commit
+    # ------------------------------------------------------------------
+    def _fetch_range(self, start: int, stop: int, index: int, pool: Optional[ProcessPoolExecutor]):
+        eligible = [p for p in self.peers if self._tips.get(p, -1) >= stop - 1]
+        if not eligible:
+            raise SyncError(f"no peer serves blocks {start}..{stop - 1}")
+        hashes = bytes(self._headers[(start - self._headers_from) * 32 : (stop - self._headers_from) * 32])
+        previous = self._header(start - 1)
+        errors = []
+        for attempt in range(self.retries):
+            peer = eligible[(index + attempt) % len(eligible)]
+            try:
+                payload = self._get(peer, "/sync/blocks", start, stop - start).content
+                if pool is not None:
+                    return pool.submit(verify_range, start, payload, hashes, previous).result()
+                return verify_range(start, payload, hashes, previous)
+            except (requests.RequestException, SyncError) as exc:
+                errors.append(f"{peer}: {exc}")
+                self.stats["retries"] = self.stats.get("retries", 0) + 1
+        raise SyncError(f"blocks {start}..{stop - 1} failed: " + "; ".join(errors))
+
+    def _commit(self, start: int, blocks: List[TransactionBlock], deferred: Dict[int, str]) -> None:
+        node, chain = self.node, self.node.blockchain
+        with node._lock:
+            have = len(chain) - start  # blocks that arrived meanwhile (e.g. by gossip)
+            if have > 0:
+                if chain.hashes(start, start + have) != b"".join(hash_bytes(b.block_hash) for b in blocks[:have]):
+                    raise SyncError(f"the local chain diverged at height {start}")
+                blocks = blocks[have:]
+            elif have < 0:
+                raise SyncError(f"the local chain is shorter than {start}")
+            for block in blocks:
+                height = len(chain)
+                pred = deferred.get(height)
+                if pred is not None:
+                    at = node._locate(pred)
+                    if at is None or at >= height:
+                        raise SyncError(f"block {height} links to an unknown predecessor")
+                node._append_block(block)
+            if blocks:
+                node.events.publish(ev.CHAIN_SYNCED, {"from_height": len(chain) - len(blocks), "to_height": len(chain) - 1})
+
+    def run(self, stop: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Sync until caught up (or *stop* is set); returns timing and volume stats.
+
+        Headers come from the peer with the highest tip.  When they cannot
+        be synced against (a bad chunk, another chain at our tip, or a range
+        no peer serves matching bodies for) that peer is dropped and the run
+        continues from the committed height with the next one.
+        """
+        started = time.perf_counter()
+        self.stats = {"blocks": 0, "bytes": 0, "retries": 0, "interrupted": False, "dropped_peers": []}
+        self._probe()
+        if not self._tips:
+            raise SyncError("no peer reachable")
+        chain = self.node.blockchain
+        self.stats["from_height"] = len(chain)
+        while True:
+            if not self._tips:
+                raise SyncError("no peer left to sync from: " + "; ".join(self.stats["dropped_peers"]))
+            anchor = len(chain) - 1
+            source = max(self._tips, key=self._tips.get)
+            target = self._tips[source]
+            self.stats["target_height"] = target
+            if target <= anchor:
+                break
+            try:
+                self._load_headers(anchor)
+                self._fetch_headers(source, anchor, target)
+                self.stats["headers_seconds"] = time.perf_counter() - started
+                self._download(anchor, target, stop)
+            except SyncError as exc:
+                self._drop(source, exc)
+                if self.headers_path is not None and os.path.exists(self.headers_path):
+                    os.remove(self.headers_path)  # saved from the dropped peer
+                continue
+            break
+        if not self.stats["interrupted"] and self.headers_path is not None and os.path.exists(self.headers_path):
+            os.remove(self.headers_path)  # caught up: the next sync starts from fresh headers
+        elapsed = time.perf_counter() - started
+        self.stats.update(seconds=elapsed, blocks_per_second=self.stats["blocks"] / elapsed if elapsed else 0.0)
+        return self.stats
+
+    def _download(self, anchor: int, target: int, stop: Optional[threading.Event]) -> None:
+        ranges = deque((s, min(s + self.batch, target + 1)) for s in range(anchor + 1, target + 1, self.batch))
+        pool = ProcessPoolExecutor(self.verify_workers) if self.verify_workers > 1 else None
+        pending: Deque[Tuple[int, Future]] = deque()
+        index = 0
+        try:
+            with ThreadPoolExecutor(self.workers, thread_name_prefix="pasta-sync") as downloads:
+                try:
+                    while ranges or pending:
+                        while ranges and len(pending) < self.window and not (stop and stop.is_set()):
+                            s, e = ranges.popleft()
+                            pending.append((s, downloads.submit(self._fetch_range, s, e, index, pool)))
+                            index += 1
+                        if stop is not None and stop.is_set():
+                            self.stats["interrupted"] = True
+                            break
+                        s, future = pending.popleft()
+                        blocks, deferred = future.result()
+                        self._commit(s, blocks, deferred)
+                        self.stats["blocks"] += len(blocks)
+                finally:
+                    for _, f in pending:
+                        f.cancel()
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
@@ -5,64 +5,165 @@ spec at a very high level so front-end users can see state changes.
 from __future__ import annotations
 
 import hashlib
+import os
+import threading
 import time
-from dataclasses import asdict
-from typing import Dict, Tuple, Optional
+from dataclasses import replace
+from typing import Any, Dict, Tuple, Optional, Union
 
+from pasta.core.encoding import hashed_payload
 from pasta.core.models import TransactionBlock
+from pasta.validation.hashing import NonceScanner
 
-DIFFICULTY_PREFIX = "0000"  # toy PoW difficulty
+DIFFICULTY_PREFIX = "0000"  # toy PoW difficulty of the main chain (level 0)
+MIN_DIFFICULTY = 2  # floor for higher-level branches
 
+# Number of processes used for PoW.  1 keeps the classic single-threaded loop,
+# 0 means "one per CPU core".  Override with PASTA_POW_WORKERS or set_pow_workers().
+POW_WORKERS = int(os.getenv("PASTA_POW_WORKERS", "1"))
+SCAN_BATCH = 4_096  # nonces checked per NonceScanner.scan() call
 
-def _hash_with_nonce(data: str, nonce: int) -> str:
-    return hashlib.sha256(f"{data}{nonce}".encode()).hexdigest()
 
+class MiningCancelled(Exception):
+    """Raised by :func:`mine_pow` when its *cancel* event gets set."""
 
-def mine_pow(block_dict: Dict, prefix: str = DIFFICULTY_PREFIX) -> Tuple[int, str]:
-    """Very simple PoW: find nonce so hash(data+nonce) starts with prefix."""
-    nonce = 0
-    serialized = str(sorted(block_dict.items()))
+
+def set_pow_workers(workers: int) -> None:
+    """Change the default worker count used by :func:`mine_pow`."""
+    global POW_WORKERS
+    if workers < 0:
+        raise ValueError("workers must be >= 0")
+    POW_WORKERS = workers
+
+
+def difficulty_for_level(level: int) -> int:
+    """Leading hex zeros required at *level*: one fewer per level above main."""
+    return max(MIN_DIFFICULTY, len(DIFFICULTY_PREFIX) - level)
+
+
+def pow_prefix(block: TransactionBlock) -> str:
+    """Hex-digest prefix a block's ``required_difficulty`` asks for."""
+    return "0" * block.required_difficulty if block.required_difficulty else DIFFICULTY_PREFIX
+
+
+def _serialize(block: Union[TransactionBlock, Dict[str, Any]]) -> bytes:
+    # PoW covers the same canonical payload as TransactionBlock.compute_hash
+    return hashed_payload(block)
+
+
+def _hash_with_nonce(data: bytes, nonce: int) -> str:
+    # Reference implementation of the PoW hash; the hot loop uses NonceScanner.
+    return hashlib.sha256(data + b"%d" % nonce).hexdigest()
+
+
+def verify_pow(block: TransactionBlock) -> bool:
+    """True when *block*'s nonce and hash are a valid proof at its difficulty.
+
+    Confirmations are mined before the validator address is filled in, so
+    the payload is checked without it first; checkpoint blocks are mined
+    complete and match as they are.
+    """
+    if block.nonce is None or not block.block_hash or not block.block_hash.startswith(pow_prefix(block)):
+        return False
+    return any(
+        _hash_with_nonce(_serialize(candidate), block.nonce) == block.block_hash
+        for candidate in (replace(block, validator_address=None), block)
+    )
+
+
+def mine_pow(
+    block_dict: Union[TransactionBlock, Dict[str, Any]],
+    prefix: str = DIFFICULTY_PREFIX,
+    workers: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[int, str]:
+    """Very simple PoW: find nonce so hash(data+nonce) starts with prefix.
+
+    *data* is the block's canonical hashed payload (``pasta.core.encoding``)
+    and *nonce* is appended in ASCII decimal.  Accepts a block or its dict.
+
+    With more than one worker the search is delegated to
+    :mod:`pasta.validation.parallel`, which returns the very same nonce.
+    Setting *cancel* aborts the search with :class:`MiningCancelled`.
+    """
+    if workers is None:
+        workers = POW_WORKERS
+    if workers != 1:
+        from pasta.validation.parallel import get_miner  # lazy: spawns processes
+
+        return get_miner(workers).mine(block_dict, prefix, cancel=cancel)
+
+    scanner = NonceScanner(_serialize(block_dict), prefix)
+    start = 0
     while True:
-        h = _hash_with_nonce(serialized, nonce)
-        if h.startswith(prefix):
-            return nonce, h
-        nonce += 1
+        if cancel is not None and cancel.is_set():
+            raise MiningCancelled()
+        nonce = scanner.scan(start, SCAN_BATCH)
+        if nonce is not None:
+            return nonce, scanner.hexdigest(nonce)
+        start += SCAN_BATCH
 
 
 # ------------------------------ API ---------------------------------------
 
-def build_state_a(sender: str, receiver: str, amount: float, predecessor: TransactionBlock) -> TransactionBlock:
-    """Create a new State-A transaction referencing predecessor block."""
+def build_state_a(
+    sender: str,
+    receiver: str,
+    amount: float,
+    predecessor: Union[TransactionBlock, str],
+    level: Optional[int] = None,
+) -> TransactionBlock:
+    """Create a new State-A transaction referencing predecessor block.
+
+    *predecessor* may also be just the block hash (a branch tip that may
+    have been pruned).  *level* defaults to the predecessor's; the
+    transactions of a child branch pass the branch's level (see
+    ``pasta.node.branches``).
+    """
+    if isinstance(predecessor, str):
+        predecessor_hash = predecessor
+        level = level or 0
+    else:
+        predecessor_hash = predecessor.block_hash
+        level = predecessor.level if level is None else level
     tx = TransactionBlock(
         sender_address=sender,
         receiver_address=receiver,
         amount=amount,
         timestamp=int(time.time()),
-        predecessor_id=predecessor.block_hash,
-        predecessor_hash=predecessor.block_hash,
-        level=predecessor.level,
+        predecessor_id=predecessor_hash,
+        predecessor_hash=predecessor_hash,
+        level=level,
         sender_balance_before=0,
         sender_balance_after=0,
         receiver_balance_before=0,
         receiver_balance_after=0,
         mint_amount=0,
         average_tx_size=0,
-        required_difficulty=len(DIFFICULTY_PREFIX),
+        required_difficulty=difficulty_for_level(level),
     )
     return tx
 
 
-def advance_to_state_b(my_tx: TransactionBlock, target_tx: TransactionBlock) -> None:
-    """Perform validation PoW on target_tx, embed proof into my_tx."""
-    nonce, h = mine_pow(asdict(target_tx))
+def advance_to_state_b(
+    my_tx: TransactionBlock, target_tx: TransactionBlock, cancel: Optional[threading.Event] = None
+) -> None:
+    """Perform validation PoW on target_tx, embed proof into my_tx.
+
+    The work is what *my_tx*'s own level requires.
+    """
+    nonce, h = mine_pow(target_tx, pow_prefix(my_tx), cancel=cancel)
     my_tx.validated_block_id = target_tx.block_hash or target_tx.compute_hash()
     my_tx.validated_block_hash = h
     # my_tx becomes State B (still waiting for validation)
+    my_tx.state = "B"
 
 
-def advance_to_state_c(target_tx: TransactionBlock, validator_address: str) -> None:
+def advance_to_state_c(
+    target_tx: TransactionBlock, validator_address: str, cancel: Optional[threading.Event] = None
+) -> None:
     """Final validation of target_tx: we mine PoW for target itself."""
-    nonce, h = mine_pow(asdict(target_tx))
+    nonce, h = mine_pow(target_tx, pow_prefix(target_tx), cancel=cancel)
     target_tx.validator_address = validator_address
     target_tx.nonce = nonce
     target_tx.block_hash = h
@@ -0,0 +1,63 @@
+"""Midstate-reusing SHA-256 core for the proof-of-work search.
+
+A PoW attempt hashes ``payload + ascii(nonce)``.  The block part never
+changes between attempts, so :class:`NonceScanner` absorbs it into a
+``hashlib.sha256`` object once and ``copy()``-s that midstate for every nonce,
+feeding in only the few nonce bytes.  Candidates are checked against the
+difficulty prefix on the raw digest bytes; a hex digest is only produced for
+the winner.  The resulting hashes are byte-for-byte identical to
+``hashlib.sha256(data + b"%d" % nonce).hexdigest()``.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Optional, Tuple, Union
+
+__all__ = ["NonceScanner", "digest_target"]
+
+
+def digest_target(prefix: str) -> Tuple[bytes, Optional[int]]:
+    """Translate a hex-digest prefix into ``(leading_bytes, high_nibble)``.
+
+    ``"0000"`` becomes ``(b"\\x00\\x00", None)``; an odd-length prefix such as
+    ``"000"`` additionally constrains the high nibble of the next byte.
+    """
+    try:
+        full = bytes.fromhex(prefix[: len(prefix) // 2 * 2])
+        nibble = int(prefix[-1], 16) if len(prefix) % 2 else None
+    except ValueError:
+        raise ValueError(f"difficulty prefix must be hexadecimal: {prefix!r}") from None
+    return full, nibble
+
+
+class NonceScanner:
+    """Scan nonce ranges for a hash whose hex form starts with *prefix*."""
+
+    __slots__ = ("_base", "_full", "_nlen", "_nibble")
+
+    def __init__(self, data: Union[str, bytes], prefix: str) -> None:
+        if isinstance(data, str):
+            data = data.encode()
+        self._base = hashlib.sha256(data)
+        self._full, self._nibble = digest_target(prefix)
+        self._nlen = len(self._full)
+
+    def hexdigest(self, nonce: int) -> str:
+        """Hex hash of ``data + nonce`` (same value the legacy helper returns)."""
+        h = self._base.copy()
+        h.update(b"%d" % nonce)
+        return h.hexdigest()
+
+    def scan(self, start: int, count: int) -> Optional[int]:
+        """Return the first winning nonce in ``[start, start+count)`` or ``None``."""
+        copy = self._base.copy
+        full = self._full
+        n = self._nlen
+        nibble = self._nibble
+        for nonce in range(start, start + count):
+            h = copy()
+            h.update(b"%d" % nonce)
+            d = h.digest()
+            if d[:n] == full and (nibble is None or d[n] >> 4 == nibble):
+                return nonce
+        return None
@@ -0,0 +1,175 @@
+"""Multi-core proof-of-work search.
+
+The nonce space is cut into fixed-size chunks that are handed out, in order,
+to a pool of worker processes.  A worker that finds a winning nonce publishes
+it in a shared value and every other worker abandons any chunk lying above
+it.  The coordinator only returns once all lower chunks have been searched, so
+the result is exactly the ``(nonce, hash)`` pair the serial
+:func:`pasta.validation.engine.mine_pow` would return – just found sooner.
+
+Worker processes are started with the *spawn* method so that mining can be
+triggered safely from the threaded Flask server and from frozen Windows
+builds.
+"""
+from __future__ import annotations
+
+import atexit
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Optional, Tuple
+
+from pasta.validation.engine import DIFFICULTY_PREFIX, MiningCancelled, _serialize
+from pasta.validation.hashing import NonceScanner
+
+__all__ = ["ParallelMiner", "get_miner", "mine_pow_parallel", "resolve_workers"]
+
+DEFAULT_CHUNK_SIZE = 16_384
+_CHECK_EVERY = 1_024  # nonces between two looks at the shared "best" value
+_NO_HIT = 2**63 - 1
+
+# Shared lowest-winning-nonce value, installed in every worker by _init_worker.
+_best = None
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """Map ``None``/``0`` to the number of CPU cores, otherwise return *workers*."""
+    if not workers:
+        return os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError("workers must be >= 0")
+    return workers
+
+
+def _init_worker(best) -> None:
+    global _best
+    _best = best
+
+
+def _scan_chunk(data: bytes, prefix: str, start: int, count: int) -> Tuple[Optional[int], Optional[str], int]:
+    """Search ``[start, start+count)``; return ``(nonce, hash, hashes_tried)``."""
+    best = _best
+    scanner = NonceScanner(data, prefix)
+    nonce = start
+    end = start + count
+    while nonce < end:
+        if best.value < nonce:
+            break  # somebody already won below us
+        batch = min(_CHECK_EVERY, end - nonce)
+        hit = scanner.scan(nonce, batch)
+        if hit is not None:
+            with best.get_lock():
+                if hit < best.value:
+                    best.value = hit
+            return hit, scanner.hexdigest(hit), hit - start + 1
+        nonce += batch
+    return None, None, nonce - start
+
+
+class ParallelMiner:
+    """Process-pool PoW miner with the same contract as ``engine.mine_pow``.
+
+    The pool is created lazily on first use and kept alive between calls so
+    the process start-up cost is paid once.  Calls to :meth:`mine` are
+    serialised because all workers share one "best nonce" slot.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        self.workers = resolve_workers(workers)
+        self.chunk_size = chunk_size
+        self.last_hash_count = 0  # hashes tried by the most recent mine() call
+
+        self._ctx = mp.get_context("spawn")
+        self._best = self._ctx.Value("q", _NO_HIT)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(self._best,),
+            )
+        return self._pool
+
+    def mine(
+        self, block_dict: Dict, prefix: str = DIFFICULTY_PREFIX, cancel: Optional[threading.Event] = None
+    ) -> Tuple[int, str]:
+        """Find the lowest nonce whose hash starts with *prefix*.
+
+        Setting *cancel* stops every worker and raises :class:`MiningCancelled`.
+        """
+        data = _serialize(block_dict)
+        with self._lock:
+            pool = self._ensure_pool()
+            self._best.value = _NO_HIT
+
+            pending = {}
+            next_start = 0
+            hit: Optional[Tuple[int, str]] = None
+            hashes = 0
+            window = self.workers * 2  # keep every worker busy while results come back
+            while True:
+                if cancel is not None and cancel.is_set() and hit is None:
+                    self._best.value = -1  # every chunk now starts "above" the best
+                    wait(pending)
+                    self.last_hash_count = hashes
+                    raise MiningCancelled()
+                while len(pending) < window and (hit is None or next_start < hit[0]):
+                    fut = pool.submit(_scan_chunk, data, prefix, next_start, self.chunk_size)
+                    pending[fut] = next_start
+                    next_start += self.chunk_size
+                if not pending:
+                    break
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    del pending[fut]
+                    nonce, h, tried = fut.result()
+                    hashes += tried
+                    if nonce is not None and (hit is None or nonce < hit[0]):
+                        hit = (nonce, h)
+
+            self.last_hash_count = hashes
+            return hit
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+# ---------------------------------------------------------------------------
+# Shared miners (one per worker count) so callers don't each spawn a pool
+# ---------------------------------------------------------------------------
+_miners: Dict[int, ParallelMiner] = {}
+_miners_lock = threading.Lock()
+
+
+def get_miner(workers: Optional[int] = None) -> ParallelMiner:
+    """Return the process-wide miner for *workers* processes, creating it once."""
+    n = resolve_workers(workers)
+    with _miners_lock:
+        miner = _miners.get(n)
+        if miner is None:
+            miner = _miners[n] = ParallelMiner(n)
+        return miner
+
+
+def mine_pow_parallel(
+    block_dict: Dict,
+    prefix: str = DIFFICULTY_PREFIX,
+    workers: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+) -> Tuple[int, str]:
+    """Functional shortcut for ``get_miner(workers).mine(block_dict, prefix)``."""
+    return get_miner(workers).mine(block_dict, prefix, cancel=cancel)
+
+
+@atexit.register
+def _shutdown_miners() -> None:  # pragma: no cover – interpreter teardown
+    for miner in list(_miners.values()):
+        miner.close()
@@ -9,6 +9,8 @@ setup(
         "flask",
         "flask-cors",
         "requests",
+        "httpx",
+        "orjson",
         "ecdsa",
         "base58",
         "PySide6>=6.6",
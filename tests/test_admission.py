@@ -0,0 +1,110 @@
+import json
+import time
+
+import pytest
+
+from pasta import Node
+from pasta.core.crypto import Signer, generate_keypair, transaction_message
+
+
+def _signed(signer, amount=5.0):
+    ts = time.time()
+    msg = transaction_message(signer.public_key, "BOB", amount, ts)
+    return {"sender": signer.public_key, "receiver": "BOB", "amount": amount, "timestamp": ts, "signature": signer.sign(msg)}
+
+
+def test_rest_pipeline_stages():
+    node = Node(require_signatures=True)
+    client = node.create_flask_app().test_client()
+    signer = Signer(generate_keypair()["private_key"])
+    payload = _signed(signer)
+
+    resp = client.post("/create_transaction", json=payload)
+    assert resp.status_code == 201
+    assert resp.get_json()["tx"]["signature"] == payload["signature"]
+
+    assert client.post("/create_transaction", json=payload).status_code == 409  # replay
+    assert client.post("/create_transaction", json={"sender": "A"}).status_code == 400
+    unsigned = {"sender": "A", "receiver": "B", "amount": 1}
+    assert client.post("/create_transaction", json=unsigned).get_data(as_text=True) == "Missing signature"
+    forged = dict(_signed(signer), amount=500.0)
+    assert client.post("/create_transaction", json=forged).get_data(as_text=True) == "Invalid signature"
+
+    stages = client.get("/admission").get_json()["stages"]
+    assert stages["syntax"]["rejected"] == 2
+    assert stages["dedupe"]["rejected"] == 1
+    assert stages["verify"]["received"] == 2 and stages["verify"]["rejected"] == 1
+    assert stages["insert"]["passed"] == 1
+    assert len(node.get_mempool()) == 2  # genesis-B + the admitted tx
+
+
+def test_retry_after_mempool_full_is_admitted():
+    node = Node(max_mempool=1)  # genesis-B already fills it and cannot be evicted
+    client = node.create_flask_app().test_client()
+    payload = _signed(Signer(generate_keypair()["private_key"]))
+    assert client.post("/create_transaction", json=payload).status_code == 503
+
+    node.mempool.max_size = 2
+    assert client.post("/create_transaction", json=payload).status_code == 201
+    assert client.post("/create_transaction", json=payload).status_code == 409
+
+
+def test_unsigned_allowed_unless_required():
+    node = Node()
+    client = node.create_flask_app().test_client()
+    assert client.post("/create_transaction", json={"sender": "A", "receiver": "B", "amount": 1}).status_code == 201
+    assert client.post("/create_transaction", json={"sender": "A", "receiver": "B", "amount": 1}).status_code == 201
+
+
+def test_direct_call_checks_signature():
+    node = Node()
+    signer = Signer(generate_keypair()["private_key"])
+    payload = _signed(signer)
+    with pytest.raises(ValueError):
+        node.create_transaction(signer.public_key, "BOB", 6.0, payload["signature"], payload["timestamp"])
+    tx = node.create_transaction(signer.public_key, "BOB", 5.0, payload["signature"], payload["timestamp"])
+    assert tx["signature"] == payload["signature"]
+
+
+def test_batch_reports_per_item_results():
+    node = Node(require_signatures=True)
+    signer = Signer(generate_keypair()["private_key"])
+    good = _signed(signer, 1.0)
+    batch = [good, {"sender": "A"}, good, dict(_signed(signer, 2.0), amount=9.0), _signed(signer, 3.0)]
+    results = node.create_transactions(batch)
+    assert [r["status"] for r in results] == [201, 400, 409, 400, 201]
+    assert results[3]["error"] == "Invalid signature"
+    assert node.get_mempool_tx(results[4]["tx_id"])["amount"] == results[4]["tx"]["amount"]
+    assert node.admission.metrics()["stages"]["verify"]["batches"] == 1
+    assert node.tx_counter == 2
+
+
+def test_batch_route_accepts_json_and_ndjson():
+    node = Node()
+    client = node.create_flask_app().test_client()
+    txs = [{"sender": "S", "receiver": f"R{i}", "amount": i} for i in range(3)]
+    body = client.post("/transactions/batch", json=txs).get_json()
+    assert body["accepted"] == 3 and [r["tx"]["receiver_address"] for r in body["results"]] == ["R0", "R1", "R2"]
+
+    lines = "\n".join(json.dumps(tx) for tx in txs) + "\nnot json\n"
+    resp = client.post("/transactions/batch", data=lines, content_type="application/x-ndjson")
+    assert [json.loads(line)["status"] for line in resp.data.splitlines()] == [201, 201, 201, 400]
+    assert client.post("/transactions/batch", json={"transactions": "nope"}).status_code == 400
+    assert len(node.get_mempool()) == 7
+
+
+def test_entries_keep_the_signed_amount_and_timestamp():
+    node = Node(require_signatures=True)
+    signer = Signer(generate_keypair()["private_key"])
+    payload = _signed(signer, amount=5)  # signed as "5", not "5.0"
+    result = node.create_transactions([payload])[0]
+    assert result["status"] == 201
+    tx = node.get_mempool_tx(result["tx_id"])
+    assert (tx["signed_amount"], tx["signed_timestamp"]) == ("5", str(payload["timestamp"]))
+    assert tx["timestamp"] == int(tx["timestamp"])  # arrival time, not the signed one
+    msg = transaction_message(tx["sender_address"], tx["receiver_address"], tx["signed_amount"], tx["signed_timestamp"])
+    assert node.verifier.verify(tx["sender_address"], msg, tx["signature"])
+
+    block = node.advance_c(result["tx_id"], "V")
+    row = node.blockchain.row(len(node.blockchain) - 1)
+    assert row["signed_amount"] == "5" and row["block_hash"] == block["block_hash"]
@@ -0,0 +1,58 @@
+from pasta import Node
+from pasta.node.branches import AGGREGATION, BranchTable
+
+
+def _split_node(**kwargs):
+    """Node whose main branch splits once it holds three pending entries (genesis tx + 2)."""
+    node = Node(split_threshold=3, max_branches=2, **kwargs)
+    ids = [node.get_mempool_tx(-1)["tx_id"] for i in range(3) if node.create_transaction(f"S{i}", f"R{i}", 1.0)]
+    return node, ids
+
+
+def test_saturated_mempool_opens_higher_level_branch():
+    node, ids = _split_node()
+    main, child = node.get_branches()
+    assert (main["pending"], child["pending"]) == (3, 1)
+    assert child["level"] == 1 and child["parent"] == 0 and child["fork_hash"] == main["tip_hash"]
+    tx = node.get_mempool_tx(ids[2])
+    assert tx["level"] == 1 and tx["required_difficulty"] == 3  # shorter block time up a level
+    kinds = [e.kind for e in node.events.since(0)[0]]
+    assert kinds[-2:] == ["branch-opened", "tx-created"]  # split by the second tx, used by the third
+
+
+def test_branch_confirmations_and_aggregation():
+    node, ids = _split_node()
+    block = node.advance_c(ids[2], "V")
+    assert block["block_hash"].startswith("000") and block["level"] == 1
+    child = node.get_branches()[1]
+    assert child["tip_hash"] == block["block_hash"] and child["pending"] == 0
+
+    assert node.aggregate(0, "V") is None  # main is not a child branch
+    agg = node.aggregate(1, "V")
+    assert agg["sender_address"] == AGGREGATION and agg["validated_block_id"] == block["block_hash"]
+    main, child = node.get_branches()
+    assert main["tip_hash"] == agg["block_hash"] and child["merged_by"] == agg["block_hash"] and not child["open"]
+
+    # Rebuilt from the chain alone
+    table = BranchTable(node._locate)
+    table.catch_up(node.blockchain)
+    assert [b.to_dict() for b in table.branches()] == [dict(b, pending=0) for b in node.get_branches()]
+
+
+def test_racing_blocks_conflict_only_on_the_same_branch():
+    node, ids = _split_node()
+    first, second, other = (node._snapshot_c(i) for i in ids)
+    assert node._run_c(first, "V") is not None
+    assert node._run_c(second, "V") is None  # main's tip moved while it mined
+    assert node._run_c(other, "V") is not None  # the child's tip did not
+    assert node.advance_c(ids[1], "V") is not None  # rebased onto the new tip
+
+
+def test_branches_survive_restart(tmp_path):
+    node, ids = _split_node(data_dir=str(tmp_path))
+    node.advance_c(ids[2], "V")
+    before = node.get_branches()
+    node.close()
+    node = Node(data_dir=str(tmp_path), split_threshold=3, max_branches=2)
+    assert node.get_branches() == before
+    node.close()
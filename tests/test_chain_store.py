@@ -0,0 +1,46 @@
+from dataclasses import asdict
+
+import pytest
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node.store import ChainStore
+
+
+def test_store_roundtrip_and_view():
+    store = ChainStore()
+    genesis = TransactionBlock.create_genesis()
+    store.append(genesis)
+    child = TransactionBlock(**asdict(genesis))
+    child.predecessor_hash = genesis.block_hash
+    child.amount = 2.5
+    child.nonce = 9
+    child.block_hash = child.compute_hash()
+    store.append(asdict(child))
+
+    view = store.view()
+    store.append(genesis)  # views are fixed-length snapshots
+    assert len(view) == 2 and len(store) == 3
+    assert view[0] == asdict(genesis)
+    assert view[-1] == asdict(child)
+    assert list(view[1:]) == [asdict(child)]
+    assert store.tip() is genesis
+
+
+def test_node_chain_is_lazy_view():
+    node = Node()
+    node.advance_c(0, "VALIDATOR")
+    chain = node.get_blockchain()
+    assert len(chain) == 2
+    assert chain[1]["validator_address"] == "VALIDATOR"
+
+
+def test_bad_field_leaves_no_partial_row():
+    store = ChainStore()
+    genesis = TransactionBlock.create_genesis()
+    store.append(genesis)
+    bad = dict(asdict(genesis), sender_address="BAD", timestamp=1.5)
+    with pytest.raises(TypeError):
+        store.append(bad)
+    store.append(dict(asdict(genesis), sender_address="GOOD"))
+    assert len(store) == 2 and store.row(1)["sender_address"] == "GOOD"
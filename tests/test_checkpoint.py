@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from pasta import Node
+from pasta.node.checkpoint import CHECKPOINT, verify_checkpoint
+
+
+def _confirm(node, n, start=0):
+    for i in range(start, start + n):
+        node.create_transaction(f"S{i}", f"R{i}", 0)  # minted, so balances move
+        assert node.advance_c(node.get_mempool_tx(-1)["tx_id"], "V") is not None
+
+
+def test_checkpoint_and_prune():
+    node = Node()
+    _confirm(node, 3)
+    block = node.checkpoint("V")
+    assert block["sender_address"] == CHECKPOINT and block["block_hash"].startswith("0000")
+    state = node.last_checkpoint
+    verify_checkpoint(state)
+    assert state["height"] == 4 and state["balances"]["R1"] == node.get_balance("R1")["balance"]
+
+    assert node.prune() == 4
+    chain = node.get_blockchain()
+    assert chain.first_height == 4 and chain[0]["sender_address"] == CHECKPOINT
+    with pytest.raises(IndexError):
+        node.blockchain.row(3)
+    _confirm(node, 1, start=3)  # keeps working on top of the pruned chain
+    assert node.get_balance("R3")["balance"] > 0
+    page = node.create_flask_app().test_client().get("/blockchain?from_height=0&limit=10").get_json()
+    assert (page["from_height"], page["tip_height"], len(page["blocks"])) == (4, 5, 2)
+
+
+def test_bootstrap_from_checkpoint():
+    node = Node()
+    _confirm(node, 2)
+    node.checkpoint("V")
+    state = node.create_flask_app().test_client().get("/checkpoint").get_json()
+
+    fresh = Node(bootstrap=state)
+    assert len(fresh.blockchain) == len(node.blockchain) and fresh.blockchain.base == state["height"]
+    assert fresh.get_balance("R0") == node.get_balance("R0")
+    assert fresh.tx_counter == node.tx_counter
+    _confirm(fresh, 1, start=2)
+
+    state["balances"]["R0"] += 1
+    with pytest.raises(ValueError):
+        Node(bootstrap=state)
+
+
+def test_pruned_log_restarts_from_checkpoint(tmp_path):
+    data, cold = str(tmp_path / "chain"), str(tmp_path / "cold")
+    node = Node(data_dir=data, prune_history=True, cold_dir=cold, checkpoint_interval=3)
+    node.blockchain.segment_size = 512  # roll segments quickly
+    _confirm(node, 3)
+    assert node.checkpoint_due()
+    node.checkpoint("V")
+    balances = {a: node.get_balance(a)["balance"] for a in ("R0", "R1", "R2")}
+    base = node.blockchain.base
+    node.close()
+    assert base == 4 and os.listdir(cold)
+
+    node = Node(data_dir=data)
+    assert node.blockchain.base == base and not node.checkpoint_due()
+    assert {a: node.get_balance(a)["balance"] for a in balances} == balances
+    _confirm(node, 1, start=3)
+    node.close()
+
+
+def test_chain_listing_survives_a_prune_after_its_snapshot(monkeypatch):
+    for url in ("/blockchain", "/blockchain?from_height=0&limit=10", "/blockchain?stream=1"):
+        node = Node()
+        _confirm(node, 3)
+        node.checkpoint("V")
+        snapshot = node.get_blockchain
+
+        def pruned_right_after():
+            view = snapshot()
+            node.prune()  # e.g. the checkpoint thread, before the rows are read
+            return view
+
+        monkeypatch.setattr(node, "get_blockchain", pruned_right_after)
+        resp = node.create_flask_app().test_client().get(url)
+        assert resp.status_code == 200 and resp.get_data().count(b'"sender_address":"CHECKPOINT"') == 1
+        assert b'"S0"' not in resp.get_data()  # starts at the new base
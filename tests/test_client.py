@@ -0,0 +1,142 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from werkzeug.serving import make_server
+
+from pasta import Node
+from pasta.client import AsyncNodeClient, ClientError, NodeClient, RetryPolicy, async_fan_out, fan_out
+from pasta.core.crypto import Signer, generate_keypair, transaction_message
+
+FAST = RetryPolicy(retries=2, backoff=0.001)
+
+
+def _serve(app):
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+@pytest.fixture
+def node_url():
+    node = Node()
+    server, url = _serve(node.create_flask_app())
+    yield node, url
+    server.shutdown()
+
+
+def test_sync_client_calls_and_batches(node_url):
+    node, url = node_url
+    with NodeClient(url, retry=FAST) as client:
+        tx = client.create_transaction({"sender": "S", "receiver": "R", "amount": 2.0})["tx"]
+        results = client.create_transactions([{"sender": "S", "receiver": f"R{i}", "amount": 1} for i in range(3)])
+        assert [r["status"] for r in results] == [201] * 3
+        block = client.advance_c(node.get_mempool(with_ids=True)[1]["tx_id"], "V")["tx"]
+        assert client.block(block["block_hash"])["height"] == 1
+        assert [b["block_hash"] for b in client.iter_blocks(page=1)] == [r["block_hash"] for r in node.blockchain]
+        balances = client.pipeline([("balance", "R"), ("balance", "nobody")])
+        assert balances[0]["balance"] == tx["amount"] and balances[1]["balance"] == 0
+        with pytest.raises(ClientError) as err:
+            client.block("missing")
+        assert err.value.status == 404 and client.counters["retries"] == 0
+
+
+def test_retries_reads_and_503_but_not_other_failed_writes():
+    calls = []
+
+    def flaky(environ, start_response):
+        calls.append(environ["REQUEST_METHOD"])
+        status = "503 Service Unavailable" if len(calls) % 3 else "500 Internal Server Error"
+        start_response(status, [("Content-Type", "text/plain")])
+        return [b"busy"]
+
+    server, url = _serve(flaky)
+    try:
+        client = NodeClient(url, retry=FAST)
+        with pytest.raises(ClientError) as err:
+            client.stats()  # 503, 503, 500: the 500 ends the retries
+        assert err.value.status == 500 and client.counters["retries"] == 2
+        calls.clear()
+        with pytest.raises(ClientError):
+            client.advance_c(0, "V")
+        assert len(calls) == 3  # 503 twice (retried), then 500
+    finally:
+        server.shutdown()
+
+    with pytest.raises(ClientError) as err:
+        NodeClient(url, retry=FAST).stats()  # server gone: connection refused
+    assert err.value.status is None
+
+
+def test_async_client_and_fan_out(node_url):
+    node, url = node_url
+    node.create_transaction("S", "R", 3.0)
+
+    async def run():
+        async with AsyncNodeClient(url, retry=FAST, concurrency=4) as client:
+            balances = await asyncio.gather(*(client.balance(a) for a in ["S", "R"] * 10))
+            assert {b["address"] for b in balances} == {"S", "R"}
+            results = await client.create_transactions([{"sender": "S", "receiver": "R", "amount": 1}] * 2)
+            assert [r["status"] for r in results] == [201, 201]
+            page = await client.blockchain(from_height=0, limit=1)
+            assert page["blocks"][0]["block_hash"] == node.blockchain.row(0)["block_hash"]
+            dead = AsyncNodeClient("http://127.0.0.1:9", retry=FAST)
+            out = await async_fan_out([client, dead], "stats")
+            assert out[url]["count"] == 3 and isinstance(out[dead.base_url], ClientError)
+
+    asyncio.run(run())
+    out = fan_out([NodeClient(url), NodeClient("http://127.0.0.1:9", retry=FAST)], "mempool")
+    assert len(out[url]) == 4 and isinstance(out["http://127.0.0.1:9"], ClientError)
+
+
+def test_409_after_a_retry_counts_only_if_the_node_has_the_tx():
+    signer = Signer(generate_keypair()["private_key"])
+
+    def _signed(amount):
+        ts = time.time()
+        msg = transaction_message(signer.public_key, "BOB", amount, ts)
+        return {"sender": signer.public_key, "receiver": "BOB", "amount": amount, "timestamp": ts, "signature": signer.sign(msg)}
+
+    node = Node(require_signatures=True)
+    app, posts = node.create_flask_app(), []
+
+    def lossy(environ, start_response):  # the first POST is admitted but its answer is lost
+        if environ["PATH_INFO"] == "/create_transaction":
+            posts.append(1)
+            if len(posts) == 1:
+                app(environ, lambda *a: None).close()
+                start_response("503 Service Unavailable", [("Content-Type", "text/plain")])
+                return [b"admission timed out"]
+        return app(environ, start_response)
+
+    server, url = _serve(lossy)
+    try:
+        payload = _signed(1.0)
+        tx = NodeClient(url, retry=FAST).create_transaction(payload)["tx"]
+        assert tx["signature"] == payload["signature"] and len(posts) == 2
+
+        with pytest.raises(ClientError) as err:  # a plain replay is still refused
+            NodeClient(url, retry=FAST).create_transaction(payload)
+        assert err.value.status == 409 and not err.value.retried
+
+        posts.clear()
+        other = _signed(2.0)
+        tx = asyncio.run(_async_create(url, other))["tx"]
+        assert tx["signature"] == other["signature"] and len(posts) == 2
+    finally:
+        server.shutdown()
+
+
+async def _async_create(url, payload):
+    async with AsyncNodeClient(url, retry=FAST) as client:
+        return await client.create_transaction(payload)
+
+
+def test_async_client_survives_a_new_event_loop(node_url):
+    _, url = node_url
+    client = AsyncNodeClient(url, retry=FAST, concurrency=2)
+    for _ in range(2):  # each asyncio.run is a new loop: the pool is reopened on it
+        stats = asyncio.run(client.pipeline([("stats",)] * 4))
+        assert len(stats) == 4
+    asyncio.run(client.close())
@@ -0,0 +1,42 @@
+from pasta.core.encoding import decode_block, encode_block, hashed_payload
+from pasta.core.models import TransactionBlock
+
+
+def test_roundtrip_and_compactness():
+    block = TransactionBlock.create_genesis()
+    block.amount = 12.34567891
+    block.signature = "sig"
+    block.nonce = 42
+    decoded = TransactionBlock(**decode_block(encode_block(block)))
+    assert decoded.compute_hash() == block.compute_hash()
+    assert decoded.nonce == 42 and decoded.signature == "sig" and decoded.validator_address is None
+    assert len(block.to_bytes()) < len(str(sorted(vars(block).items())))
+
+
+def test_hash_cache_invalidation():
+    block = TransactionBlock.create_genesis()
+    h = block.compute_hash()
+    block.nonce = 7  # proof fields are not hashed
+    block.block_hash = "x"
+    assert block.compute_hash() == h
+    block.amount = 1.5
+    assert block.compute_hash() != h
+    assert "_hash_cache" not in vars(block)
+
+
+def test_amounts_are_fixed_point():
+    a = TransactionBlock.create_genesis()
+    b = TransactionBlock(**vars(a))
+    a.amount, b.amount = 0.1 + 0.2, 0.3  # differ only below 1e-8
+    assert hashed_payload(a) == hashed_payload(b)
+
+
+def test_signed_fields_use_version_2_only_when_present():
+    block = TransactionBlock.create_genesis()
+    assert block.to_bytes()[0] == 1
+    h = block.compute_hash()
+    block.signed_amount, block.signed_timestamp = "5", "1700000000.25"
+    assert block.to_bytes()[0] == 2 and block.compute_hash() != h
+    decoded = decode_block(encode_block(block))
+    assert (decoded["signed_amount"], decoded["signed_timestamp"]) == ("5", "1700000000.25")
+    assert TransactionBlock(**decoded).compute_hash() == block.compute_hash()
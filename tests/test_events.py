@@ -0,0 +1,52 @@
+import threading
+
+from pasta import Node
+from pasta.node.events import BLOCK_APPENDED, MEMPOOL_REMOVED, TX_CREATED, EventBus
+
+
+def test_sequence_and_resume():
+    bus = EventBus(history=3)
+    for i in range(5):
+        bus.publish("x", {"i": i})
+    assert bus.last_seq == 5
+
+    events, complete = bus.since(3)
+    assert [e.seq for e in events] == [4, 5] and complete
+    events, complete = bus.since(0)  # seqs 1..2 were dropped from the history
+    assert [e.seq for e in events] == [3, 4, 5] and not complete
+
+
+def test_wait_wakes_on_publish_and_times_out():
+    bus = EventBus()
+    assert bus.wait(0, timeout=0.01) == ([], True)
+
+    threading.Timer(0.05, bus.publish, ("x", {})).start()
+    events, _ = bus.wait(0, timeout=5.0)
+    assert [e.seq for e in events] == [1]
+
+
+def test_node_publishes_workflow_events():
+    node = Node()
+    seen = []
+    unsubscribe = node.events.subscribe(seen.append)
+    node.create_transaction("alice", "bob", 1.0)
+    node.advance_c(0, "VALIDATOR")
+    unsubscribe()
+    node.create_transaction("alice", "bob", 2.0)
+
+    assert [e.kind for e in seen] == [TX_CREATED, BLOCK_APPENDED, MEMPOOL_REMOVED]
+    assert seen[1].data["height"] == 1
+    assert [e.seq for e in seen] == sorted(e.seq for e in seen)
+
+
+def test_sse_route_replays_since():
+    node = Node()
+    node.create_transaction("alice", "bob", 1.0)
+    node.create_transaction("alice", "bob", 2.0)
+    resp = node.create_flask_app().test_client().get("/events?since=1")
+    assert resp.mimetype == "text/event-stream"
+    chunks = resp.response
+    assert next(chunks).startswith(b"retry:")
+    first = next(chunks).decode()
+    assert first.startswith("id: 2\nevent: tx-created\n") and '"amount": 2.0' in first
+    resp.close()
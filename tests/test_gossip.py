@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node.gossip import Gossip
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "gossip did not converge"
+        await asyncio.sleep(0.01)
+
+
+def _network(n):
+    genesis = vars(TransactionBlock.create_genesis())
+    return [Node(genesis=genesis) for _ in range(n)]
+
+
+def test_transactions_and_blocks_propagate_along_a_line():
+    async def run():
+        nodes = _network(3)
+        services = [Gossip(node, inv_interval=0.001) for node in nodes]
+        for g in services:
+            await g.start()
+        await services[1].connect("127.0.0.1", services[0].port)
+        await services[2].connect("127.0.0.1", services[1].port)
+
+        tx = nodes[0].create_transaction("S", "R", 0)
+        tx_id = nodes[0].get_mempool_tx(-1)["tx_id"]
+        await _until(lambda: nodes[2].get_mempool_tx(tx_id) is not None)
+        assert nodes[2].get_mempool_tx(tx_id)["amount"] == tx["amount"]
+
+        block = nodes[0].advance_c(tx_id, "V")
+        await _until(lambda: nodes[2].get_block(block["block_hash"]) is not None)
+        assert nodes[2].get_mempool_tx(tx_id) is None
+        assert nodes[2].get_balance("R") == nodes[0].get_balance("R")
+        assert services[2].counters["rejected"] == 0 and services[1].counters["received"] == 2
+        for g in services:
+            await g.close()
+
+    asyncio.run(run())
+
+
+def test_handshake_rejects_another_network():
+    async def run():
+        other = TransactionBlock.create_genesis()
+        other.timestamp -= 1
+        other.block_hash = other.compute_hash()
+        a, b = Gossip(Node()), Gossip(Node(genesis=vars(other)))
+        await a.start()
+        await b.start()
+        assert await b.connect("127.0.0.1", a.port) is None and not a.peers
+        await a.close()
+        await b.close()
+
+    asyncio.run(run())
+
+
+def test_background_gossip_and_rest():
+    a, b = _network(2)
+    ga = a.start_gossip(inv_interval=0.001)
+    b.start_gossip(peers=[("127.0.0.1", ga.port)], inv_interval=0.001)
+    try:
+        b.create_transaction("S", "R", 2.5)
+        tx_id = b.get_mempool_tx(-1)["tx_id"]
+        deadline = time.monotonic() + 5
+        while a.get_mempool_tx(tx_id) is None:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        client = a.create_flask_app().test_client()
+        peers = client.get("/peers").get_json()
+        assert [p["node_id"] for p in peers["peers"]] == [b.gossip.node_id]
+        for body in ({"port": 1}, {"host": "h", "port": "x"}, {"host": "", "port": 1}, {"host": "h", "port": 70000}, []):
+            assert client.post("/peers", json=body).status_code == 400
+    finally:
+        a.close()
+        b.close()
+
+
+def test_relayed_blocks_and_entries_are_checked():
+    from pasta.core.crypto import Signer, generate_keypair, transaction_message
+    from pasta.node.gossip import ACCEPTED, REJECTED
+    from pasta.validation import engine as ve
+
+    src, dst = _network(2)
+    dst.require_signatures = True
+    unsigned = dict(vars(TransactionBlock(**src.create_transaction("VICTIM", "THIEF", 1000.0))))
+    assert dst.receive_transaction("t1", unsigned) == REJECTED
+    assert dst.receive_transaction("t2", dict(unsigned, amount="lots")) == REJECTED
+    assert dst.get_mempool_tx("t1") is None and dst.get_mempool_tx("t2") is None
+
+    signer = Signer(generate_keypair()["private_key"])
+    ts = time.time()
+    sig = signer.sign(transaction_message(signer.public_key, "R", 5, ts))
+    src.create_transaction(signer.public_key, "R", 5, sig, ts)
+    signed = src.get_mempool_tx(-1)
+    tx_id = signed.pop("tx_id")
+    assert dst.receive_transaction("t3", dict(signed, amount=500.0)) == REJECTED  # not what was signed
+    assert dst.receive_transaction(tx_id, signed) == ACCEPTED
+
+    block = src.advance_c(tx_id, "V")
+    assert dst.receive_block(dict(block, timestamp=1.5)) == REJECTED
+    cheap = dict(block, required_difficulty=1, validator_address=None)
+    cheap["nonce"], cheap["block_hash"] = ve.mine_pow(cheap, prefix="0", workers=1)
+    assert dst.receive_block(dict(cheap, validator_address="V")) == REJECTED
+    assert dst.receive_block(block, tx_id) == ACCEPTED
+    assert dst.blockchain.row(1)["sender_address"] == signer.public_key
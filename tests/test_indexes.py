@@ -0,0 +1,31 @@
+from pasta import Node
+
+
+def test_block_address_and_children_lookups():
+    node = Node()
+    genesis = node.get_blockchain()[0]
+    tx = node.create_transaction("ALICE", "BOB", 5)
+    block = node.advance_c(0, "VALIDATOR")  # confirm the State-B bootstrap tx
+
+    assert node.get_block(block["block_hash"])["height"] == 1
+    assert node.get_block("00" * 32) is None
+
+    children = node.get_children(genesis["block_hash"])
+    assert [b["height"] for b in children["confirmed"]] == [1]
+    assert children["pending"] == [tx]
+
+    alice = node.get_address_txs("ALICE")
+    assert alice["confirmed"] == [] and alice["pending"] == [tx]
+    assert len(node.get_address_txs("GENESIS")["confirmed"]) == 2
+
+    validators = node.get_validators(genesis["block_hash"])
+    assert [b["height"] for b in validators["confirmed"]] == [1]
+
+
+def test_index_rest_routes():
+    node = Node()
+    client = node.create_flask_app().test_client()
+    genesis_hash = node.get_blockchain()[0]["block_hash"]
+    assert client.get(f"/block/{genesis_hash}").get_json()["height"] == 0
+    assert client.get("/block/nope").status_code == 404
+    assert client.get("/address/GENESIS/txs").get_json()["confirmed"][0]["height"] == 0
@@ -0,0 +1,38 @@
+from pasta import Node
+from pasta.node.ledger import Ledger
+
+
+def _confirm_last(node):
+    """Validate the newest mempool tx with the bootstrap tx and confirm it."""
+    mp = node.get_mempool()
+    node.advance_b(len(mp) - 1, 0)
+    return node.advance_c(len(node.get_mempool()) - 1, "VALIDATOR")
+
+
+def test_confirmed_block_carries_balances():
+    node = Node()
+    node.create_transaction("ALICE", "BOB", 0)  # zero-value -> minted 10
+    block = _confirm_last(node)
+    assert block["mint_amount"] == 10.0
+    assert block["sender_balance_before"] == 0.0 and block["sender_balance_after"] == 0.0
+    assert block["receiver_balance_after"] == 10.0
+    assert node.get_balance("BOB")["balance"] == 10.0
+
+    node.create_transaction("BOB", "CAROL", 4)
+    _confirm_last(node)
+    assert node.get_balance("BOB")["balance"] == 6.0
+    assert node.get_balance("CAROL")["balance"] == 4.0
+
+
+def test_ledger_burn_and_self_transfer():
+    ledger = Ledger()
+    ledger.apply({"sender_address": "A", "receiver_address": "B", "amount": 5.0, "mint_amount": -1.0})
+    assert ledger.balance("A") == -6.0 and ledger.balance("B") == 5.0
+    fields = ledger.preview({"sender_address": "B", "receiver_address": "B", "amount": 2.0, "mint_amount": 0.5})
+    assert fields["sender_balance_after"] == fields["receiver_balance_after"] == 5.5
+
+
+def test_balance_route():
+    node = Node()
+    client = node.create_flask_app().test_client()
+    assert client.get("/balance/NOBODY").get_json() == {"address": "NOBODY", "balance": 0.0, "height": 0}
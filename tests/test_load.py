@@ -0,0 +1,25 @@
+import json
+
+from pasta.bench.load import compare, main, make_traffic, run
+
+
+def test_load_run_tracks_every_stage():
+    payloads = make_traffic(6, keys=3)
+    for mode in ("inproc", "http"):
+        res = run(payloads, mode=mode, timeout=60)
+        assert res["admitted"] == 6 and res["drained"]
+        assert res["confirmed"] == 5 and res["unconfirmed"] == 1  # the newest stays as the next target
+        assert [res["latency_ms"][s]["samples"] for s in ("A", "B", "C", "end_to_end")] == [6, 6, 5, 5]
+        assert res["lock"]["acquisitions"] > 0 and res["memory_mib"]["end"] > 0
+
+
+def test_json_output_and_comparison(tmp_path):
+    out = tmp_path / "run.json"
+    main(["--txs", "2", "--keys", "2", "--out", str(out)])
+    doc = json.loads(out.read_text())
+    assert doc["environment"]["args"]["txs"] == 2 and doc["runs"][0]["mode"] == "inproc"
+
+    slower = json.loads(out.read_text())["runs"][0]
+    slower["throughput"]["confirmed_tx_s"] /= 2
+    rows = {r["metric"]: r for r in compare(doc["runs"][0], slower)}
+    assert rows["throughput.confirmed_tx_s"]["worse"] and not rows["memory_mib.growth"]["worse"]
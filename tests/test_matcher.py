@@ -0,0 +1,28 @@
+from pasta import Node
+from pasta.node.matcher import percentiles
+
+
+def test_percentiles_nearest_rank():
+    assert percentiles([]) == {}
+    p = percentiles([float(i) for i in range(1, 101)])
+    assert p["p50"] == 50.0 and p["p99"] == 99.0
+
+
+def test_matcher_pairs_and_confirms_oldest_first():
+    node = Node()
+    client = node.create_flask_app().test_client()
+    assert client.post("/matcher/start", json={"validator": "VAL"}).get_json()["running"]
+    for i in range(3):
+        node.create_transaction(f"S{i}", "R", float(i + 1))
+    assert node.matcher.wait_idle(timeout=60)
+
+    chain = node.get_blockchain()
+    # genesis, genesis-B, then S0 and S1; S2 stays as the next target
+    assert [b["sender_address"] for b in chain] == ["GENESIS", "GENESIS", "S0", "S1"]
+    assert all(b["validator_address"] == "VAL" for b in chain[1:])
+    assert [(tx["sender_address"], tx["state"]) for tx in node.get_mempool()] == [("S2", "B")]
+
+    stats = client.post("/matcher/stop").get_json()
+    assert not stats["running"] and stats["paired"] == 3 and stats["confirmed"] == 3
+    assert stats["samples"] == 2 and stats["latency_seconds"]["p50"] > 0
+    node.close()
@@ -0,0 +1,62 @@
+import pytest
+
+from pasta import Node
+from pasta.node.mempool import Mempool, MempoolFull
+
+
+def _tx(state="A", level=0, n=0):
+    return {"state": state, "level": level, "n": n, "sender_address": "S", "receiver_address": "R"}
+
+
+def test_indexes_and_peek():
+    mp = Mempool()
+    a1, _ = mp.add(_tx(n=1))
+    b1, _ = mp.add(_tx("B", n=2))
+    a2, _ = mp.add(_tx(level=1, n=3))
+    assert mp.by_state("A") == [a1, a2] and mp.by_level(1) == [a2]
+    assert mp.peek("B") == b1 and mp.peek("A") == a1
+
+    mp.replace(a1, _tx("B", n=1))  # a1 is older than b1
+    assert mp.peek("B") == a1 and mp.peek("A") == a2
+    mp.remove(a1)
+    assert mp.peek("B") == b1
+    assert mp.resolve(0) == b1 and mp.resolve(-1) == a2 and mp.resolve(5) is None
+
+
+def test_eviction_keeps_state_b():
+    mp = Mempool(max_size=2)
+    b, _ = mp.add(_tx("B"))
+    a, _ = mp.add(_tx())
+    c, evicted = mp.add(_tx(n=9))
+    assert [e[0] for e in evicted] == [a] and mp.ids() == [b, c]
+    mp.replace(c, _tx("B", n=9))
+    with pytest.raises(MempoolFull):
+        mp.add(_tx())
+    assert len(mp) == 2
+
+
+def test_ids_survive_confirmations():
+    node = Node()
+    node.create_transaction("A", "B", 1.0)
+    node.create_transaction("A", "B", 2.0)
+    ids = [tx["tx_id"] for tx in node.get_mempool(with_ids=True)]
+    client = node.create_flask_app().test_client()
+
+    # confirm the first State-A tx: positions shift, IDs do not
+    assert client.post("/advance_c", json={"target_id": ids[1], "validator": "V"}).status_code == 200
+    assert client.get(f"/mempool/{ids[2]}").get_json()["amount"] == 2.0
+    assert client.get(f"/mempool/{ids[1]}").status_code == 404
+
+    resp = client.post("/advance_b", json={"my_id": ids[2], "target_index": 0})
+    assert resp.get_json()["tx"]["state"] == "B"
+    assert client.get("/mempool/next?state=B").get_json()["tx_id"] == ids[0]  # genesis-B is older
+    assert client.post("/advance_c", json={"target_id": 7, "validator": "V"}).status_code == 400
+
+
+def test_node_evicts_oldest_state_a():
+    node = Node(max_mempool=2)
+    first = node.create_transaction("A", "B", 1.0)
+    node.create_transaction("A", "B", 2.0)
+    assert first not in node.get_mempool()
+    assert [tx["state"] for tx in node.get_mempool()] == ["B", "A"]
+    assert node.get_address_txs("A")["pending"][0]["amount"] == 2.0
@@ -0,0 +1,56 @@
+import threading
+import time
+
+import pytest
+
+from pasta import Node
+from pasta.node.mining import JobQueueFull, MiningScheduler
+
+
+def _wait(node, job_id, timeout=30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = node.jobs.get(job_id)
+        if job.status not in ("queued", "running"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_async_advance_c_commits_block():
+    node = Node()
+    job = node.submit_advance_c(0, "VALIDATOR")
+    assert _wait(node, job.job_id).status == "done"
+    assert len(node.get_blockchain()) == 2
+    assert node.get_mempool() == []
+
+
+def test_commit_refused_when_target_changed():
+    node = Node()
+    snap = node._snapshot_c(0)
+    node.mempool[0]["signature"] = "changed"
+    assert node._run_c(snap, "VALIDATOR") is None
+    assert len(node.get_blockchain()) == 1
+
+
+def test_queue_backpressure_and_cancel():
+    sched = MiningScheduler(workers=1, max_queue=1)
+    gate = threading.Event()
+    sched.submit("advance_b", lambda cancel: gate.wait() or {})
+    time.sleep(0.05)  # let the worker pick up the blocking job
+    queued = sched.submit("advance_b", lambda cancel: {})
+    with pytest.raises(JobQueueFull):
+        sched.submit("advance_b", lambda cancel: {})
+    assert sched.cancel(queued.job_id).status == "cancelled"
+    gate.set()
+
+
+def test_job_rest_endpoints():
+    node = Node()
+    client = node.create_flask_app().test_client()
+    resp = client.post("/jobs/advance_c", json={"target_index": 0, "validator": "V"})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    _wait(node, job_id)
+    assert client.get(f"/jobs/{job_id}").get_json()["status"] == "done"
+    assert client.get("/jobs/unknown").status_code == 404
@@ -0,0 +1,55 @@
+import json
+
+from pasta import Node
+
+
+def _node_with_blocks(n):
+    node = Node()
+    tip = node.blockchain.tip()
+    for i in range(n):
+        node.blockchain.append(dict(vars(tip), amount=float(i + 1)))
+    return node
+
+
+def test_blockchain_pages_and_tail():
+    client = _node_with_blocks(9).create_flask_app().test_client()
+    assert len(client.get("/blockchain").get_json()) == 10  # unpaged: legacy list
+
+    page = client.get("/blockchain?from_height=0&limit=4").get_json()
+    assert [b["amount"] for b in page["blocks"]] == [0.0, 1.0, 2.0, 3.0]
+    assert page["next_from_height"] == 4 and page["tip_height"] == 9
+
+    last = client.get("/blockchain?from_height=8&limit=4").get_json()
+    assert len(last["blocks"]) == 2 and last["next_from_height"] is None
+
+    tail = client.get("/blockchain?since_height=7").get_json()
+    assert [b["amount"] for b in tail["blocks"]] == [8.0, 9.0]
+    assert client.get("/blockchain?since=7").get_json() == tail  # legacy spelling
+    assert len(client.get("/blockchain?since_height=-1").get_json()["blocks"]) == 10
+    assert client.get("/blockchain?limit=x").status_code == 400
+    assert client.get("/blockchain?limit=0").status_code == 400  # a page that never advances
+
+
+def test_ndjson_stream():
+    client = _node_with_blocks(3).create_flask_app().test_client()
+    resp = client.get("/blockchain?stream=1&from_height=1")
+    assert resp.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert [r["amount"] for r in rows] == [1.0, 2.0, 3.0]
+
+    resp = client.get("/mempool", headers={"Accept": "application/x-ndjson"})
+    assert len(resp.get_data(as_text=True).splitlines()) == 1
+
+
+def test_mempool_paging():
+    node = Node()
+    for i in range(3):
+        node.create_transaction("A", "B", i + 1)
+    client = node.create_flask_app().test_client()
+    page = client.get("/mempool?offset=1&limit=2").get_json()
+    assert len(page["transactions"]) == 2 and page["next_offset"] == 3
+    assert client.get("/mempool?offset=1&limit=0").status_code == 400
+
+    newest = node.get_mempool()[-1]["timestamp"]
+    assert client.get(f"/mempool?since_ts={newest}").get_json()["transactions"] == []
+    assert "since_ts must be a timestamp" in client.get("/mempool?since_ts=x").get_data(as_text=True)
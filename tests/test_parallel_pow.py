@@ -0,0 +1,15 @@
+from dataclasses import asdict
+
+from pasta.core.models import TransactionBlock
+from pasta.validation import engine as ve
+from pasta.validation.parallel import ParallelMiner
+
+
+def test_parallel_miner_matches_serial():
+    block = asdict(TransactionBlock.create_genesis())
+    miner = ParallelMiner(workers=2, chunk_size=64)
+    try:
+        assert miner.mine(block, "00") == ve.mine_pow(block, "00", workers=1)
+        assert miner.last_hash_count > 0
+    finally:
+        miner.close()
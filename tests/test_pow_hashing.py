@@ -0,0 +1,25 @@
+from dataclasses import asdict
+
+from pasta.core.models import TransactionBlock
+from pasta.validation import engine as ve
+from pasta.validation.hashing import NonceScanner, digest_target
+
+
+def test_midstate_hash_matches_legacy_scheme():
+    data = ve._serialize(asdict(TransactionBlock.create_genesis()))
+    scanner = NonceScanner(data, "0")
+    for nonce in (0, 1, 9, 10, 12345):
+        assert scanner.hexdigest(nonce) == ve._hash_with_nonce(data, nonce)
+
+
+def test_scan_finds_first_legacy_nonce():
+    data = ve._serialize(asdict(TransactionBlock.create_genesis()))
+    for prefix in ("0", "00", "000"):
+        expected = next(n for n in range(1_000_000) if ve._hash_with_nonce(data, n).startswith(prefix))
+        assert NonceScanner(data, prefix).scan(0, expected + 1) == expected
+        assert ve.mine_pow(asdict(TransactionBlock.create_genesis()), prefix, workers=1)[1].startswith(prefix)
+
+
+def test_digest_target_odd_prefix():
+    assert digest_target("0000") == (b"\x00\x00", None)
+    assert digest_target("00a") == (b"\x00", 0xA)
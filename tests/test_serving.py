@@ -0,0 +1,45 @@
+import json
+
+from werkzeug.test import Client
+
+from pasta import Node
+from pasta.network.ipc import NodeServer, ProxyApp
+
+
+def _node(n=5):
+    node = Node()
+    for i in range(n):
+        node.create_transaction("S", f"R{i}", 1.0)
+        node.advance_c(node.get_mempool_tx(-1)["tx_id"], "V")
+    return node
+
+
+def test_rendered_blocks_match_the_stdlib_responses():
+    node = _node()
+    fast = node.create_flask_app().test_client()
+    slow = node.create_flask_app(fast_json=False, block_cache=0).test_client()
+    tip = node.blockchain.tip().block_hash
+    for url in ("/blockchain", "/blockchain?from_height=2&limit=2", "/blockchain?from_height=9", f"/block/{tip}"):
+        assert fast.get(url).get_json() == slow.get(url).get_json() == fast.get(url).get_json()
+    lines = fast.get("/blockchain?stream=1&from_height=4").data.splitlines()
+    assert [json.loads(line)["block_hash"] for line in lines] == [node.blockchain.row(h)["block_hash"] for h in (4, 5)]
+    cache = fast.application.extensions["pasta_block_cache"].stats()
+    assert cache["cached"] == 6 and cache["hits"] > 0
+
+
+def test_proxy_app_forwards_to_the_node_process():
+    node = _node(2)
+    node.require_signatures = False
+    server = NodeServer(node.create_flask_app()).start()
+    try:
+        client = Client(ProxyApp(server.address, server.authkey))
+        tip = node.blockchain.tip().block_hash
+        assert client.get(f"/block/{tip}").json["height"] == 2
+        resp = client.get("/block/nope")
+        assert resp.status_code == 404 and resp.data == b"Unknown block"
+        resp = client.post("/create_transaction", json={"sender": "S", "receiver": "R", "amount": 3.0})
+        assert resp.json["tx"]["amount"] == 3.0 and len(node.mempool) == 2
+        assert len(client.get("/blockchain?stream=1").data.splitlines()) == 3
+        assert server.connections == 1  # one pooled connection served every request
+    finally:
+        server.close()
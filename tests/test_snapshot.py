@@ -0,0 +1,52 @@
+import os
+
+from pasta import Node
+from pasta.node.snapshot import SNAPSHOT_FILE, read_snapshot, validate_entries
+
+
+def test_mempool_and_stats_survive_restart(tmp_path):
+    node = Node(data_dir=str(tmp_path))
+    node.create_transaction("ALICE", "BOB", 0)  # minted
+    node.create_transaction("ALICE", "BOB", 3.5)
+    node.advance_b(2, 0)
+    before = node.get_mempool(with_ids=True)
+    stats = (node.tx_counter, node.total_amount)
+    node.close()
+
+    node = Node(data_dir=str(tmp_path))
+    assert node.get_mempool(with_ids=True) == before
+    assert (node.tx_counter, node.total_amount) == stats
+    assert node.next_ready("B")["tx_id"] == before[0]["tx_id"]
+    assert node.get_address_txs("ALICE")["pending"]  # pending index rebuilt
+    node.close()
+
+
+def test_entries_confirmed_after_snapshot_are_dropped(tmp_path):
+    node = Node(data_dir=str(tmp_path), snapshot_interval=3600)
+    node.create_transaction("ALICE", "BOB", 1.0)
+    assert node.snapshots.write()
+    assert not node.snapshots.write()  # nothing changed since
+    state = read_snapshot(os.path.join(str(tmp_path), SNAPSHOT_FILE))
+
+    node.advance_c(1, "VALIDATOR")  # confirmed after the snapshot was taken
+    kept = validate_entries(state, node.blockchain, node.blockchain.height_of)
+    assert [tx["sender_address"] for _, tx in kept] == ["GENESIS"]
+
+    state["tip_hash"] = "0" * 64  # snapshot from a chain we no longer have
+    kept = validate_entries(state, node.blockchain, node.blockchain.height_of)
+    assert len(kept) == 2  # both predecessors are still on our chain
+    node.close()
+
+
+def test_restore_drops_entries_beyond_a_smaller_max_mempool(tmp_path, caplog):
+    node = Node(data_dir=str(tmp_path))
+    for amount in (1.0, 2.0, 3.0):
+        node.create_transaction("ALICE", "BOB", amount)
+    for i in (1, 2, 3):
+        node.advance_b(i, 0)  # State B: nothing left to evict
+    node.close()
+
+    node = Node(data_dir=str(tmp_path), max_mempool=2)
+    assert len(node.get_mempool()) == 2
+    assert "dropped 2 snapshot entries" in caplog.text
+    node.close()
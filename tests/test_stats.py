@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from pasta import Node
+from pasta.node.stats import MintPolicy, P2Quantile, RingWindow, StreamStats, compare
+
+
+def test_estimators_track_exact_values():
+    rng = random.Random(7)
+    xs = [rng.lognormvariate(0, 1) for _ in range(20_000)]
+    window = RingWindow(100)
+    est = {p: P2Quantile(p) for p in (0.5, 0.9, 0.99)}
+    for x in xs:
+        window.push(x)
+        for e in est.values():
+            e.add(x)
+    assert window.values() == xs[-100:] and window.mean == pytest.approx(sum(xs[-100:]) / 100)
+    ordered = sorted(xs)
+    for p, e in est.items():
+        assert e.value == pytest.approx(ordered[int(p * len(xs))], rel=0.05)
+
+
+def test_stats_state_round_trip():
+    stats = StreamStats(window=8)
+    for i in range(20):
+        stats.record(float(i), level=i % 2, mint=1.0 if i % 5 == 0 else 0.0)
+    restored = StreamStats(window=8)
+    restored.load(stats.state())
+    assert restored.to_dict() == stats.to_dict()
+    assert stats.to_dict()["levels"]["1"]["window_mean"] == 12.0  # its last 8 values: 5, 7, ..., 19
+
+
+def test_policies_drive_minting_and_rest():
+    node = Node(mint_policy=MintPolicy(basis="window", burn_rate=0.1), stats_window=2)
+    node.create_transaction("A", "B", 30)
+    tx = node.create_transaction("C", "D", 0)  # window mean 30 is above the target
+    assert (tx["mint_amount"], tx["average_tx_size"]) == (0.0, 30.0)
+    burn = node.create_transaction("E", "F", 20)
+    assert burn["mint_amount"] == -2.0 and burn["amount"] == 20
+    stats = node.create_flask_app().test_client().get("/stats").get_json()
+    assert stats["count"] == 3 and stats["burned"] == 2.0 and stats["policy"]["basis"] == "window"
+    with pytest.raises(ValueError):
+        Node(mint_policy=MintPolicy(basis="mode"))
+
+
+def test_backtest_replays_the_chain():
+    node = Node()
+    for i, amount in enumerate([0, 4, 0, 25, 0]):
+        node.create_transaction(f"S{i}", f"R{i}", amount)
+        node.advance_c(node.get_mempool_tx(-1)["tx_id"], "V")
+    res = compare(node.get_blockchain(), {"legacy": MintPolicy(), "none": MintPolicy(mint_limit=0)})
+    assert res["legacy"]["minted"] == node.stats.minted and res["legacy"]["total"] == node.total_amount
+    assert res["none"]["minted"] == 0 and res["none"]["total"] == 29
@@ -0,0 +1,67 @@
+import os
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node.storage import BlockLog
+
+
+def _blocks(n):
+    prev = TransactionBlock.create_genesis()
+    out = [prev]
+    for i in range(1, n):
+        tx = TransactionBlock(**vars(prev))
+        tx.amount = float(i)
+        tx.predecessor_hash = prev.block_hash
+        tx.block_hash = tx.compute_hash()
+        out.append(tx)
+        prev = tx
+    return out
+
+
+def test_reopen_and_lookup(tmp_path):
+    blocks = _blocks(20)
+    log = BlockLog(str(tmp_path), segment_size=1024)  # force several segments
+    for b in blocks:
+        log.append(b)
+    assert log[5]["amount"] == 5.0  # readable before sync
+    log.close()
+
+    log = BlockLog(str(tmp_path))
+    assert len(log) == 20
+    assert [r["block_hash"] for r in log] == [b.block_hash for b in blocks]
+    assert log.height_of(blocks[7].block_hash) == 7
+    log.close()
+
+
+def test_recovers_torn_tail_and_lost_index(tmp_path):
+    log = BlockLog(str(tmp_path))
+    for b in _blocks(5):
+        log.append(b)
+    log.close()
+
+    # lose the last two index entries and leave half a record at the end
+    with open(tmp_path / "index.loc", "r+b") as f:
+        f.truncate(3 * 8)
+    seg = tmp_path / "seg-000000.log"
+    with open(seg, "ab") as f:
+        f.write(b"\x00\x00\x01\x00garbage")
+    size_before = os.path.getsize(seg)
+
+    log = BlockLog(str(tmp_path))
+    assert len(log) == 5
+    assert os.path.getsize(seg) < size_before
+    assert log.append(_blocks(1)[0]) == 5
+    log.close()
+
+
+def test_node_keeps_chain_across_restart(tmp_path):
+    node = Node(data_dir=str(tmp_path))
+    node.advance_c(0, "VALIDATOR")
+    genesis = node.get_blockchain()[0]["block_hash"]
+    node.close()
+
+    node = Node(data_dir=str(tmp_path))
+    chain = node.get_blockchain()
+    assert len(chain) == 2 and chain[0]["block_hash"] == genesis
+    assert node.get_mempool()[0]["validated_block_id"] == genesis
+    node.close()
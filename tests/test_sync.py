@@ -0,0 +1,122 @@
+import os
+import threading
+
+import pytest
+from werkzeug.serving import make_server
+
+from pasta import Node
+from pasta.core.models import TransactionBlock
+from pasta.node.sync import HEADERS_FILE, ChainSync, SyncError
+
+
+def _serve(node):
+    server = make_server("127.0.0.1", 0, node.create_flask_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def _source(n, **kwargs):
+    genesis = vars(TransactionBlock.create_genesis())
+    node = Node(genesis=genesis, **kwargs)
+    for i in range(n):
+        node.create_transaction(f"S{i % 3}", f"R{i % 5}", float(i % 4))
+        node.advance_c(node.get_mempool_tx(-1)["tx_id"], "V")
+    return node, genesis
+
+
+def test_sync_matches_source_across_two_peers():
+    src, genesis = _source(12)
+    (s1, url1), (s2, url2) = _serve(src), _serve(src)
+    try:
+        dst = Node(genesis=genesis)
+        stats = dst.sync_from([url1, url2], batch=3, workers=2)
+        assert stats["blocks"] == 12 and len(dst.blockchain) == len(src.blockchain)
+        assert dst.blockchain.hashes(0, 13) == src.blockchain.hashes(0, 13)
+        assert all(dst.get_balance(f"R{i}") == src.get_balance(f"R{i}") for i in range(5))
+        assert dst.sync_from([url1])["blocks"] == 0  # already caught up
+    finally:
+        s1.shutdown()
+        s2.shutdown()
+
+
+def test_interrupted_sync_resumes_with_saved_headers(tmp_path):
+    src, genesis = _source(10)
+    server, url = _serve(src)
+    try:
+        dst = Node(genesis=genesis, data_dir=str(tmp_path))
+        stop = threading.Event()
+        sync = ChainSync(dst, [url], batch=2, workers=1, window=1)
+        dst.events.subscribe(lambda event: stop.set())
+        assert sync.run(stop)["interrupted"]
+        assert 1 < len(dst.blockchain) < 11 and os.path.exists(tmp_path / HEADERS_FILE)
+        dst.close()
+
+        dst = Node(genesis=genesis, data_dir=str(tmp_path))
+        stats = ChainSync(dst, [url], batch=2).run()
+        assert stats["headers_reused"] > 0 and len(dst.blockchain) == 11
+        assert dst.blockchain.tip().block_hash == src.blockchain.tip().block_hash
+        assert not os.path.exists(tmp_path / HEADERS_FILE)
+        dst.close()
+    finally:
+        server.shutdown()
+
+
+def test_refuses_a_peer_on_another_chain():
+    src, genesis = _source(2)
+    other = TransactionBlock.create_genesis()
+    other.timestamp = genesis["timestamp"] - 1
+    other.block_hash = other.compute_hash()
+    server, url = _serve(src)
+    try:
+        with pytest.raises(SyncError, match="another chain"):
+            Node(genesis=vars(other)).sync_from([url])
+    finally:
+        server.shutdown()
+
+
+def test_refuses_blocks_below_their_level_difficulty():
+    from pasta.validation import engine as ve
+
+    src, genesis = _source(1)
+    tip = src.blockchain.tip()
+    cheap = TransactionBlock(**dict(vars(tip), predecessor_id=tip.block_hash, predecessor_hash=tip.block_hash))
+    cheap.required_difficulty, cheap.validator_address = 1, None
+    cheap.nonce, cheap.block_hash = ve.mine_pow(cheap, prefix="0", workers=1)
+    cheap.validator_address = "V"
+    with src._lock:
+        src._append_block(cheap)  # a peer that skips the checks
+    server, url = _serve(src)
+    try:
+        dst = Node(genesis=genesis)
+        with pytest.raises(SyncError, match="difficulty of level"):
+            dst.sync_from([url], batch=1, workers=1, retries=1)
+        assert len(dst.blockchain) == 2  # the valid block before it was kept
+    finally:
+        server.shutdown()
+
+
+def test_a_lying_header_peer_is_dropped_for_the_next():
+    src, genesis = _source(6)
+    app = src.create_flask_app()
+
+    def liar(environ, start_response):  # claims a longer chain and serves bogus hashes
+        if environ["PATH_INFO"] != "/sync/headers":
+            return app(environ, start_response)
+        resp = app(environ, lambda *a: None)
+        body = b"".join(resp)
+        resp.close()
+        tip = len(src.blockchain) + 2
+        start_response("200 OK", [("Content-Type", "application/octet-stream"), ("X-Tip-Height", str(tip))])
+        return [body[:32] + bytes(32 * (tip - int(environ["QUERY_STRING"].split("from_height=")[1].split("&")[0])))]
+
+    bad = make_server("127.0.0.1", 0, liar, threaded=True)
+    threading.Thread(target=bad.serve_forever, daemon=True).start()
+    good, url = _serve(src)
+    try:
+        dst = Node(genesis=genesis)
+        stats = dst.sync_from([f"http://127.0.0.1:{bad.server_port}", url], batch=2, workers=1)
+        assert len(stats["dropped_peers"]) == 1 and "does not match its header" in stats["dropped_peers"][0]
+        assert dst.blockchain.tip().block_hash == src.blockchain.tip().block_hash
+    finally:
+        bad.shutdown()
+        good.shutdown()
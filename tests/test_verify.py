@@ -0,0 +1,53 @@
+from pasta.core.crypto import Signer, generate_keypair, sign_message, verify_message
+from pasta.core.verify import BatchVerifier
+
+
+def _checks(n):
+    pair = generate_keypair()
+    out = []
+    for i in range(n):
+        msg = f"tx-{i}"
+        out.append((pair["public_key"], msg, sign_message(pair["private_key"], msg)))
+    return out
+
+
+def test_results_in_order_and_memoised():
+    good = _checks(3)
+    bad = (good[0][0], "tampered", good[0][2])
+    garbage = ("not-a-key", "x", "not-a-signature")
+    verifier = BatchVerifier(workers=1)
+
+    checks = [good[0], bad, good[1], garbage, good[2], good[0]]
+    assert verifier.verify_many(checks) == [True, False, True, False, True, True]
+    assert len(verifier.cache) == 5  # the duplicate was verified once
+
+    hits = verifier.cache.hits
+    assert verifier.verify_many(checks) == [True, False, True, False, True, True]
+    assert verifier.cache.hits == hits + len(checks)
+
+
+def test_bytes_message():
+    (pub, msg, sig), = _checks(1)
+    assert verify_message(pub, msg.encode(), sig)
+
+
+def test_process_pool_matches_inline():
+    checks = _checks(8)
+    checks[5] = (checks[5][0], "tampered", checks[5][2])
+    verifier = BatchVerifier(workers=2, chunk_size=4, min_parallel=1)
+    try:
+        assert verifier.verify_many(checks) == [i != 5 for i in range(8)]
+    finally:
+        verifier.close()
+
+
+def test_signer_matches_sign_message():
+    pair = generate_keypair()
+    signer = Signer(pair["private_key"])
+    assert signer.public_key == pair["public_key"]
+
+    sigs = signer.sign_many(["a", b"b"])
+    assert verify_message(pair["public_key"], "a", sigs[0])
+    assert verify_message(pair["public_key"], b"b", sigs[1])
+    assert signer.verify("a", sign_message(pair["private_key"], "a"))
+    assert not signer.verify("a", sigs[1])